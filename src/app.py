@@ -3,24 +3,33 @@
 App - Classe principal do Arquiteto (refatorada)
 """
 
+import threading
 import time
 import dearpygui.dearpygui as dpg
 
 # Backend modules
 from database import Database
+from database_writer import DatabaseWriter
+from project_repository import ProjectRepository
+from project_search import ProjectSearch
 from project_manager import ProjectManager
 from workspace_manager import WorkspaceManager
 from ram_monitor import RAMMonitor
 from zen_controller import ZenController
 from backend.workflow_manager import WorkflowManager
+from backend.edit_journal import EditJournal
+from backend.autosave_worker import AutosaveWorker
 
 # UI modules
 from ui.theme_manager import ThemeManager
 from ui.texture_manager import TextureManager
 from ui.main_window import MainWindow
+from ui.node_editor_tab import NodeEditorTab
+from ui.dialogs import ProjectDialogs
 
 # Nodes
 from nodes.node_registry import NodeRegistry
+from nodes.node_types import ProjetoIniciadoNode
 from nodes.node_state_tracker import NodeStateTracker
 from nodes.workflow_serializer import WorkflowSerializer
 
@@ -41,13 +50,19 @@ class Arquiteto:
     def __init__(self):
         # ===== Backend =====
         self.db = Database()
-        self.project_manager = ProjectManager(self.db)
+        # Escritas do banco fora da thread de render (leituras vêm do cache do repositório)
+        self.db_writer = DatabaseWriter(self.db)
+        self.db_writer.start()
+        self.projects = ProjectRepository(self.db, self.db_writer)
         self.workspace_manager = WorkspaceManager()
         self.ram_monitor = RAMMonitor()
+        self.project_manager = ProjectManager(self.db, self.workspace_manager, self.ram_monitor, projects=self.projects)
         self.zen_controller = ZenController()
+        self.project_search = ProjectSearch(self.db, self.projects)
+        ProjetoIniciadoNode.project_search = self.project_search  # Sugestões no input de nome
 
         # Reset inicial
-        self.db.deactivate_all_projects()
+        self.projects.deactivate_all()
 
         # ===== Frontend =====
         self.main_window = None
@@ -56,9 +71,23 @@ class Arquiteto:
         self.tracker = NodeStateTracker()
         self.serializer = WorkflowSerializer(self.tracker)  # Passar o mesmo tracker
         self.workflow_manager = WorkflowManager()
+        # Hash, encode e escrita do auto-save fora da thread de render
+        self.autosave_worker = AutosaveWorker(self.workflow_manager)
+        self.autosave_worker.start()
+        NodeEditorTab.autosave_worker = self.autosave_worker  # Save manual pelo mesmo worker/manager
         self.last_autosave_time = time.time()
         self.autosave_interval = 30  # segundos
 
+        # ===== Journal de edições (recuperação após crash) =====
+        recoverable = EditJournal.find_recoverable()
+        if recoverable:
+            NodeEditorTab.pending_recovery = recoverable[0]  # Sessão mais recente
+            print(f"[Journal] Edições não salvas da sessão {recoverable[0][0]} serão restauradas no Map")
+        self.journal = EditJournal()
+        self.tracker.attach_journal(self.journal)
+        self.last_journal_sync = time.time()
+        self.journal_sync_interval = 2  # segundos (edições perdidas em uma queda de energia, no máximo)
+
     def setup_gui(self):
         """Configura a interface gráfica"""
         # Criar contexto DearPyGUI
@@ -67,6 +96,8 @@ class Arquiteto:
         # Registrar handler global para tecla Delete
         with dpg.handler_registry():
             dpg.add_key_press_handler(dpg.mvKey_Delete, callback=self._handle_delete_key)
+            # Ctrl+P: quick-switcher de projetos
+            dpg.add_key_press_handler(dpg.mvKey_P, callback=self._handle_quick_switcher_key)
 
         # Carregar configuração de nodes
         NodeRegistry.load_config()
@@ -104,13 +135,19 @@ class Arquiteto:
             if self.main_window:
                 self.main_window.update()
 
-            # Auto-save periódico
+            # Journal de edições + auto-save periódico
+            self._sync_journal()
             self._check_autosave()
 
             dpg.render_dearpygui_frame()
 
         # Cleanup
         dpg.destroy_context()
+        self.project_manager.shutdown()  # Telemetria ainda usa o writer
+        self.db_writer.stop()  # Grava o que ainda está na fila
+        self.autosave_worker.stop()  # Termina o auto-save em andamento
+        self._handle_autosave_results()
+        self.journal.close(keep=self.tracker.has_unsaved_changes)  # Não salvo: recuperar no próximo início
 
     def _handle_delete_key(self):
         """Handler global para tecla Delete"""
@@ -144,14 +181,44 @@ class Arquiteto:
                 print(f"Link deletado: {link_id}")
             print(f"Total de {len(selected_links)} link(s) deletado(s)")
 
+    def _handle_quick_switcher_key(self):
+        """Handler global para Ctrl+P (quick-switcher de projetos)"""
+        if not (dpg.is_key_down(dpg.mvKey_LControl) or dpg.is_key_down(dpg.mvKey_RControl)):
+            return
+
+        ProjectDialogs.show_quick_switcher(
+            search=self.project_search.search,
+            # Troca em background: não travar o render enquanto os apps abrem
+            # (switch_project serializa as trocas; só a mais recente na fila roda)
+            on_select=lambda project_id: threading.Thread(
+                target=self.project_manager.switch_project, args=(project_id,), daemon=True
+            ).start(),
+        )
+
+    def _sync_journal(self):
+        """Grava o journal em disco periodicamente (só as edições novas)"""
+        current_time = time.time()
+        if current_time - self.last_journal_sync < self.journal_sync_interval:
+            return
+        self.journal.sync()
+        self.journal.maybe_compact()
+        self.last_journal_sync = current_time
+
     def _check_autosave(self):
         """Verifica se deve fazer auto-save do workflow"""
+        # Gravações concluídas pelo worker
+        self._handle_autosave_results()
+
         current_time = time.time()
 
         # Verificar se passaram 30 segundos
         if current_time - self.last_autosave_time < self.autosave_interval:
             return
 
+        # Auto-save anterior ainda gravando: tentar de novo no próximo frame
+        if self.autosave_worker.busy:
+            return
+
         # Verificar se há mudanças não salvas
         if not self.tracker.has_unsaved_changes:
             self.last_autosave_time = current_time
@@ -163,24 +230,24 @@ class Arquiteto:
             self.last_autosave_time = current_time
             return
 
-        # Fazer auto-save
+        # Fazer auto-save: só o snapshot aqui; encode e disco no worker
         try:
-            # Serializar workflow
             workflow_data = self.serializer.serialize(current_workflow)
-
-            # Salvar
-            success = self.workflow_manager.save_workflow(
-                workflow_data, current_workflow
-            )
-
-            if success:
-                self.tracker.mark_as_saved()
-                print(f"[Auto-save] Workflow '{current_workflow}' salvo automaticamente")
-            else:
-                print(f"[Auto-save] ERRO ao salvar workflow '{current_workflow}'")
-
+            self.autosave_worker.submit(workflow_data, current_workflow, revision=self.tracker.revision)
         except Exception as e:
             print(f"[Auto-save] ERRO: {e}")
 
         # Atualizar timestamp
         self.last_autosave_time = current_time
+
+    def _handle_autosave_results(self):
+        """Marca como salvo o que o worker gravou (se nada mudou desde o snapshot)"""
+        for result in self.autosave_worker.poll():
+            if not result["success"]:
+                print(f"[Auto-save] ERRO ao salvar workflow '{result['name']}'")
+                continue
+            if result["skipped"]:
+                continue  # Um save mais novo já foi gravado
+            if result["revision"] == self.tracker.revision and result["name"] == self.tracker.get_current_workflow():
+                self.tracker.mark_as_saved()
+            print(f"[Auto-save] Workflow '{result['name']}' salvo automaticamente ({result['duration'] * 1000:.0f}ms)")
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Autosave Worker - Gravação do auto-save fora da thread de render
+A thread de render só tira o snapshot; hash, encode e escrita em disco acontecem aqui
+"""
+
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from .workflow_manager import WorkflowManager
+
+
+class AutosaveWorker:
+    """
+    Thread que grava workflows com o WorkflowManager
+
+    submit() recebe um snapshot do editor (o dict do WorkflowSerializer, que é
+    montado do zero a cada serialize(): não compartilha nada com o tracker, e
+    a partir daí pertence à thread) e volta na hora. O resultado de cada
+    gravação vai para uma fila que a thread de render esvazia com poll(), uma
+    vez por frame: callbacks do tracker/journal continuam só na thread de render.
+
+    Há no máximo uma gravação esperando: um submit() com outra ainda na fila
+    substitui o snapshot antigo (só o mais recente interessa).
+
+    O save manual (save_now) usa o mesmo worker: as gravações são serializadas
+    por um lock, e um snapshot com revisão menor que a última gravada daquele
+    workflow é descartado (um auto-save atrasado não sobrescreve um save mais novo).
+
+    Sem start() (ex: scripts), submit() grava na hora, na thread de quem chamou.
+
+    Uso:
+        worker = AutosaveWorker(workflow_manager)
+        worker.start()
+        worker.submit(serializer.serialize(name), name, revision=tracker.revision)
+        for result in worker.poll():  # A cada frame
+            if result["success"] and result["revision"] == tracker.revision:
+                tracker.mark_as_saved()
+        worker.save_now(serializer.serialize(name), name, tracker.revision)  # Save manual
+        worker.stop()  # Grava o que ainda está pendente
+    """
+
+    def __init__(self, workflow_manager: Optional[WorkflowManager] = None):
+        self.workflow_manager = workflow_manager or WorkflowManager()
+        self._results: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+        self._condition = threading.Condition()
+        self._job: Optional[Dict[str, Any]] = None  # Próxima gravação
+        self._saving = False
+        self._save_lock = threading.Lock()  # Uma gravação por vez (worker ou save_now)
+        self._saved_revisions: Dict[str, int] = {}  # {workflow: revisão gravada}
+        self._thread = None
+        self._running = False
+
+    # ===== Ciclo de vida =====
+
+    def start(self):
+        """Inicia a thread de gravação"""
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        """Grava o que está pendente e para a thread"""
+        if not self._running:
+            return
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+
+    @property
+    def busy(self) -> bool:
+        """Há gravação pendente ou em andamento"""
+        with self._condition:
+            return self._job is not None or self._saving
+
+    # ===== Gravação =====
+
+    def submit(self, workflow_data: dict, workflow_name: str, revision: int = 0):
+        """
+        Agenda a gravação de um snapshot
+
+        Args:
+            workflow_data: Snapshot do editor (passa a pertencer ao worker)
+            workflow_name: Nome do workflow (arquivo)
+            revision: Revisão do tracker no snapshot (devolvida no resultado)
+        """
+        job = {"data": workflow_data, "name": workflow_name, "revision": revision, "submitted_at": time.monotonic()}
+        if not self._running:
+            self._results.put(self._save(job))
+            return
+        with self._condition:
+            self._job = job
+            self._condition.notify()
+
+    def save_now(self, workflow_data: dict, workflow_name: str, revision: int = 0) -> bool:
+        """
+        Grava na hora, na thread de quem chamou (save manual)
+
+        Espera um auto-save em andamento terminar; um auto-save pendente mais
+        antigo que este é descartado quando chegar a vez dele.
+
+        Returns:
+            True se salvou
+        """
+        job = {"data": workflow_data, "name": workflow_name, "revision": revision, "submitted_at": time.monotonic()}
+        return self._save(job)["success"]
+
+    def poll(self) -> List[Dict[str, Any]]:
+        """
+        Gravações concluídas desde o último poll (sem bloquear)
+
+        Returns:
+            [{"name", "revision", "success", "skipped", "duration"}, ...]
+            skipped: snapshot mais antigo que o já gravado, nada foi escrito
+        """
+        results = []
+        while True:
+            try:
+                results.append(self._results.get_nowait())
+            except queue.Empty:
+                return results
+
+    # ===== Internos =====
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._job is None and self._running:
+                    self._condition.wait()
+                job, self._job = self._job, None
+                if job is None:
+                    return  # Parado e sem nada pendente
+                self._saving = True
+            try:
+                self._results.put(self._save(job))
+            finally:
+                with self._condition:
+                    self._saving = False
+
+    def _save(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        start = time.monotonic()
+        skipped = False
+        with self._save_lock:
+            if job["revision"] < self._saved_revisions.get(job["name"], -1):
+                success = skipped = True
+            else:
+                try:
+                    success = self.workflow_manager.save_workflow(job["data"], job["name"])
+                except Exception as e:
+                    print(f"[AutosaveWorker] ERRO ao salvar workflow '{job['name']}': {e}")
+                    success = False
+                if success:
+                    self._saved_revisions[job["name"]] = job["revision"]
+        return {
+            "name": job["name"],
+            "revision": job["revision"],
+            "success": success,
+            "skipped": skipped,
+            "duration": time.monotonic() - start,
+        }
+
+
+# Teste basico
+if __name__ == "__main__":
+    import contextlib
+    import io
+    import statistics
+    import tempfile
+    from datetime import datetime
+
+    # Estado do editor de um workflow grande (o que o serializer lê do tracker/DearPyGUI)
+    node_count = 3000
+    editor_nodes = [(f"node_zed_{i:08x}", "zed", (i * 10.0, i * 5.0), "uberti") for i in range(node_count)]
+    editor_links = [(10000 + i, f"node_zed_{i:08x}_output", f"node_zed_{i + 1:08x}_input") for i in range(node_count - 1)]
+
+    def snapshot(revision: int) -> dict:
+        """Como WorkflowSerializer.serialize: dicts novos a cada chamada"""
+        now = datetime.now().isoformat()
+        return {
+            "version": "1.0",
+            "name": "Benchmark",
+            "created_at": now,
+            "updated_at": now,
+            "nodes": [{"id": node_id, "type": node_type, "pos": [pos[0], pos[1] + revision], "data": {"project_name": name}}
+                      for node_id, node_type, pos, name in editor_nodes],
+            "links": [{"id": link_id, "from_attr": a, "to_attr": b} for link_id, a, b in editor_links],
+        }
+
+    def render_loop(autosave, frames: int = 240, every: int = 30) -> List[float]:
+        """Loop de 60 FPS com um auto-save a cada `every` frames; devolve a duração de cada frame"""
+        frame_times = []
+        for frame in range(frames):
+            start = time.perf_counter()
+            sum(range(2000))  # "Trabalho" do frame
+            if frame % every == every - 1:
+                autosave(frame)
+            frame_times.append((time.perf_counter() - start) * 1000)
+            time.sleep(max(0.0, 1 / 60 - (time.perf_counter() - start)))
+        return frame_times
+
+    def report(label: str, frame_times: List[float]):
+        p99 = statistics.quantiles(frame_times, n=100)[98]
+        print(f"{label:<28} frame médio {statistics.mean(frame_times):6.2f}ms  p99 {p99:6.2f}ms  pior {max(frame_times):6.2f}ms")
+
+    for file_format in ("json", "binary"):
+        manager = WorkflowManager(tempfile.mkdtemp(), file_format=file_format)
+        print(f"--- {node_count} nodes, formato {file_format}")
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            sync_times = render_loop(lambda frame: manager.save_workflow(snapshot(frame), "Benchmark"))
+        report("Síncrono (como era)", sync_times)
+
+        worker = AutosaveWorker(manager)
+        worker.start()
+        completed = []
+
+        def async_save(frame):
+            completed.extend(worker.poll())
+            worker.submit(snapshot(frame), "Benchmark", revision=frame)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            async_times = render_loop(async_save)
+            worker.stop()
+        completed.extend(worker.poll())
+        report("Snapshot + worker", async_times)
+        print(f"{'':<28} {len(completed)} gravações, {statistics.mean(r['duration'] for r in completed) * 1000:.1f}ms cada no worker")
+
+    # Save manual no meio de auto-saves: um snapshot mais antigo não sobrescreve o save manual
+    worker = AutosaveWorker(manager)
+    worker.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        threads = [threading.Thread(target=worker.submit, args=(snapshot(revision), "Concorrente", revision))
+                   for revision in range(5)]
+        for thread in threads:
+            thread.start()
+        manual_ok = worker.save_now(snapshot(10), "Concorrente", revision=10)
+        for thread in threads:
+            thread.join()
+        worker.submit(snapshot(3), "Concorrente", revision=3)  # Auto-save atrasado
+        worker.stop()
+        saved = manager.load_workflow("Concorrente")
+    results = worker.poll()
+    print(f"Save manual: {manual_ok}; arquivo com a revisão {saved['nodes'][0]['pos'][1] - editor_nodes[0][2][1]:.0f}; "
+          f"auto-saves descartados: {sum(r['skipped'] for r in results)}")
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Edit Journal - Diário das edições do editor de nodes (recuperação após crash)
+Cada mutação do NodeStateTracker vira uma linha pequena; o estado completo só é gravado na compactação
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class EditJournal:
+    """
+    Journal append-only por sessão em data/journal/:
+
+        {sessão}.journal    uma linha JSON por edição (add_node, move_node, ...)
+        {sessão}.snapshot   estado completo da última compactação
+
+    Estado atual = snapshot + linhas do journal aplicadas em ordem. O journal
+    mantém esse estado em memória (espelho do tracker), então compactar é só
+    gravar o espelho no snapshot e zerar o journal.
+
+    record() escreve a linha na hora (sobrevive a um crash do processo); sync()
+    faz o fsync (sobrevive a uma queda de energia). Movimentos seguidos do mesmo
+    node viram uma linha só (arrastar gera uma posição por frame).
+
+    Ao abrir o app, sessões de processos que não existem mais e com edições não
+    salvas (sem "saved" depois da última edição) podem ser recuperadas.
+
+    Uso:
+        journal = EditJournal()
+        tracker.attach_journal(journal)
+        ...
+        journal.sync()      # Periódico (barato: só o que mudou)
+        journal.close(keep=tracker.has_unsaved_changes)
+    """
+
+    COMPACT_THRESHOLD = 1000  # Linhas no journal antes de compactar
+
+    def __init__(self, journal_dir: Optional[Path] = None, session_id: Optional[str] = None):
+        """
+        Args:
+            journal_dir: Diretório dos journals. Se None, usa data/journal/ na raiz do projeto
+            session_id: Nome da sessão. Se None, data/hora + PID
+        """
+        self.journal_dir = Path(journal_dir) if journal_dir else self.default_dir()
+        self.journal_dir.mkdir(parents=True, exist_ok=True)
+        self.session_id = session_id or f"{datetime.now():%Y%m%d-%H%M%S}-{os.getpid()}"
+        self.journal_path = self.journal_dir / f"{self.session_id}.journal"
+        self.snapshot_path = self.journal_dir / f"{self.session_id}.snapshot"
+
+        self.state = _empty_state()
+        self.record_count = 0  # Linhas no journal desde a última compactação
+        self.bytes_written = 0
+        self._pending_moves: Dict[str, List[float]] = {}
+        self._file = open(self.journal_path, "ab")
+
+    @staticmethod
+    def default_dir() -> Path:
+        """data/journal/ relativo à raiz do projeto (pai de src/)"""
+        return Path(__file__).parent.parent.parent / "data" / "journal"
+
+    # ===== Gravação =====
+
+    def record(self, op: str, **fields):
+        """Registra uma edição (ex: record("add_node", id=..., type=..., pos=[x, y], data={}))"""
+        if op == "move_node":
+            # Arrastando: guardar só a última posição até a próxima edição/sync
+            self._pending_moves[fields["id"]] = fields["pos"]
+            return
+        self._flush_moves()
+        self._append(dict(fields, op=op))
+
+    def sync(self) -> bool:
+        """Grava movimentos pendentes e faz fsync do journal"""
+        try:
+            self._flush_moves()
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            return True
+        except Exception as e:
+            print(f"[EditJournal] ERRO ao sincronizar journal: {e}")
+            return False
+
+    def compact(self) -> bool:
+        """Grava o estado atual no snapshot e zera o journal"""
+        try:
+            self._flush_moves()
+            tmp_path = self.snapshot_path.with_name(self.snapshot_path.name + ".tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(_encode(_state_to_json(self.state)))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+
+            # Snapshot já tem tudo: recomeçar o journal
+            self._file.close()
+            self._file = open(self.journal_path, "wb")
+            self.record_count = 0
+            return True
+        except Exception as e:
+            print(f"[EditJournal] ERRO ao compactar journal: {e}")
+            return False
+
+    def maybe_compact(self) -> bool:
+        """Compacta se o journal passou de COMPACT_THRESHOLD linhas"""
+        if self.record_count < self.COMPACT_THRESHOLD:
+            return False
+        return self.compact()
+
+    def close(self, keep: bool = False):
+        """
+        Fecha a sessão
+
+        Args:
+            keep: Se True, mantém os arquivos (edições não salvas: recuperar no próximo início)
+        """
+        if keep:
+            self.sync()
+        try:
+            self._file.close()
+        except Exception:
+            pass
+        if not keep:
+            self.discard_session(self.journal_dir, self.session_id)
+
+    # ===== Estado =====
+
+    @property
+    def has_unsaved_edits(self) -> bool:
+        return self.state["unsaved"] or bool(self._pending_moves)
+
+    def to_workflow(self) -> Dict[str, Any]:
+        """Estado atual no formato do WorkflowSerializer"""
+        self._flush_moves()
+        return _state_to_workflow(self.state)
+
+    # ===== Recuperação =====
+
+    @classmethod
+    def find_recoverable(cls, journal_dir: Optional[Path] = None) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Sessões encerradas com edições não salvas (mais recente primeiro)
+
+        Sessões sem nada a recuperar são apagadas.
+
+        Returns:
+            [(session_id, workflow), ...]
+        """
+        journal_dir = Path(journal_dir) if journal_dir else cls.default_dir()
+        if not journal_dir.exists():
+            return []
+
+        sessions = {path.stem for path in journal_dir.iterdir() if path.suffix in (".journal", ".snapshot")}
+        recoverable = []
+        for session_id in sorted(sessions, reverse=True):
+            if _session_alive(session_id):
+                continue
+            state = cls.load_state(journal_dir, session_id)
+            if state is None or not state["unsaved"] or not state["nodes"]:
+                cls.discard_session(journal_dir, session_id)
+                continue
+            recoverable.append((session_id, _state_to_workflow(state)))
+        return recoverable
+
+    @staticmethod
+    def load_state(journal_dir: Path, session_id: str) -> Optional[Dict[str, Any]]:
+        """Snapshot + journal de uma sessão (para na primeira linha inválida: escrita cortada pelo crash)"""
+        journal_dir = Path(journal_dir)
+        state = _empty_state()
+        try:
+            snapshot_path = journal_dir / f"{session_id}.snapshot"
+            if snapshot_path.exists():
+                with open(snapshot_path, "rb") as f:
+                    state = _state_from_json(json.loads(f.read()))
+
+            journal_path = journal_dir / f"{session_id}.journal"
+            if journal_path.exists():
+                with open(journal_path, "rb") as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            break
+                        _apply(state, entry)
+            return state
+        except Exception as e:
+            print(f"[EditJournal] ERRO ao ler sessão {session_id}: {e}")
+            return None
+
+    @staticmethod
+    def discard_session(journal_dir: Path, session_id: str):
+        """Apaga os arquivos de uma sessão"""
+        for suffix in (".journal", ".snapshot", ".snapshot.tmp"):
+            try:
+                (Path(journal_dir) / f"{session_id}{suffix}").unlink()
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                print(f"[EditJournal] ERRO ao apagar sessão {session_id}: {e}")
+
+    # ===== Internos =====
+
+    def _append(self, entry: Dict[str, Any]):
+        _apply(self.state, entry)
+        line = _encode(entry) + b"\n"
+        try:
+            self._file.write(line)
+            self._file.flush()  # Para o SO: sobrevive a crash do processo
+            self.record_count += 1
+            self.bytes_written += len(line)
+        except Exception as e:
+            print(f"[EditJournal] ERRO ao gravar edição ({entry.get('op')}): {e}")
+
+    def _flush_moves(self):
+        moves, self._pending_moves = self._pending_moves, {}
+        for node_id, pos in moves.items():
+            self._append({"id": node_id, "pos": pos, "op": "move_node"})
+
+
+# ===== Estado (aplicação das edições) =====
+
+def _empty_state() -> Dict[str, Any]:
+    return {"name": None, "nodes": {}, "links": {}, "unsaved": False}
+
+
+def _apply(state: Dict[str, Any], entry: Dict[str, Any]):
+    """Aplica uma linha do journal ao estado (mesma lógica do NodeStateTracker)"""
+    op = entry.get("op")
+    nodes, links = state["nodes"], state["links"]
+
+    if op == "add_node":
+        nodes[entry["id"]] = {"id": entry["id"], "type": entry["type"], "pos": entry.get("pos", [0, 0]),
+                              "data": entry.get("data", {})}
+    elif op == "remove_node":
+        node_id = entry["id"]
+        if nodes.pop(node_id, None) is not None:
+            for link_id in [i for i, link in links.items()
+                            if link["from_attr"].startswith(node_id) or link["to_attr"].startswith(node_id)]:
+                del links[link_id]
+    elif op == "move_node":
+        node = nodes.get(entry["id"])
+        if node:
+            nodes[entry["id"]] = dict(node, pos=entry["pos"])
+    elif op == "set_data":
+        node = nodes.get(entry["id"])
+        if node:
+            nodes[entry["id"]] = dict(node, data=dict(node["data"], **entry["data"]))
+    elif op == "add_link":
+        links[entry["id"]] = {"id": entry["id"], "from_attr": entry["from_attr"], "to_attr": entry["to_attr"]}
+    elif op == "remove_link":
+        links.pop(entry["id"], None)
+    elif op == "clear":
+        nodes.clear()
+        links.clear()
+    elif op == "workflow":
+        state["name"] = entry.get("name")
+        return
+    elif op == "saved":
+        state["unsaved"] = False
+        return
+    elif op == "unsaved":
+        pass
+    else:
+        return
+    state["unsaved"] = True
+
+
+def _state_to_workflow(state: Dict[str, Any]) -> Dict[str, Any]:
+    now = datetime.now().isoformat()
+    return {
+        "version": "1.0",
+        "name": state["name"],
+        "created_at": now,
+        "updated_at": now,
+        "nodes": list(state["nodes"].values()),
+        "links": list(state["links"].values()),
+    }
+
+
+def _state_to_json(state: Dict[str, Any]) -> Dict[str, Any]:
+    # Links em lista: IDs do DearPyGUI são int e chaves JSON viram string
+    return {
+        "name": state["name"],
+        "unsaved": state["unsaved"],
+        "nodes": list(state["nodes"].values()),
+        "links": list(state["links"].values()),
+    }
+
+
+def _state_from_json(data: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "name": data.get("name"),
+        "unsaved": data.get("unsaved", False),
+        "nodes": {node["id"]: node for node in data.get("nodes", [])},
+        "links": {link["id"]: link for link in data.get("links", [])},
+    }
+
+
+def _encode(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _session_alive(session_id: str) -> bool:
+    """A sessão é de um processo ainda rodando? (PID no fim do nome)"""
+    try:
+        pid = int(session_id.rsplit("-", 1)[1])
+    except (IndexError, ValueError):
+        return False
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+# Teste basico
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    journal_dir = Path(tempfile.mkdtemp())
+    journal = EditJournal(journal_dir, session_id="teste-999999999")
+
+    node_count = 3000
+    for i in range(node_count):
+        journal.record("add_node", id=f"node_zed_{i:08x}", type="zed", pos=[i, i], data={})
+    for i in range(node_count - 1):
+        journal.record("add_link", id=1000 + i, from_attr=f"node_zed_{i:08x}_output", to_attr=f"node_zed_{i + 1:08x}_input")
+    journal.compact()
+
+    # Uma edição depois de compactar: I/O proporcional à edição, não ao grafo
+    before = journal.bytes_written
+    start = time.perf_counter()
+    for frame in range(60):  # Arrastar um node por 1s
+        journal.record("move_node", id="node_zed_00000010", pos=[100 + frame, 200])
+    journal.record("set_data", id="node_zed_00000010", data={"project_name": "uberti"})
+    journal.sync()
+    print(f"Arrastar + editar: {journal.bytes_written - before} bytes, {(time.perf_counter() - start) * 1000:.2f}ms "
+          f"(snapshot: {journal.snapshot_path.stat().st_size / 1024:.0f}KB)")
+
+    journal.record("remove_node", id="node_zed_00000000")
+    journal._file.close()  # "Crash": sessão não fechada
+
+    start = time.perf_counter()
+    recovered = EditJournal.find_recoverable(journal_dir)
+    session_id, workflow = recovered[0]
+    node = next(n for n in workflow["nodes"] if n["id"] == "node_zed_00000010")
+    print(f"Recuperado {session_id}: {len(workflow['nodes'])} nodes, {len(workflow['links'])} links, "
+          f"node movido para {node['pos']} com {node['data']} ({(time.perf_counter() - start) * 1000:.1f}ms)")
+    EditJournal.discard_session(journal_dir, session_id)
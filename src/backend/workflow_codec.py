@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Workflow Codec - Formato binário compacto de workflows (.arqw)
+Mesmo conteúdo do JSON do WorkflowSerializer, com IDs internados e links como pares de índices
+"""
+
+import json
+import lzma
+import struct
+import sys
+import zlib
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+
+MAGIC = b"ARQW"
+FORMAT_VERSION = 1
+
+COMPRESSION_NONE = 0
+COMPRESSION_ZLIB = 1
+COMPRESSION_LZMA = 2
+COMPRESSIONS = {"none": COMPRESSION_NONE, "zlib": COMPRESSION_ZLIB, "lzma": COMPRESSION_LZMA}
+
+# Layout do arquivo:
+#   MAGIC (4) | versão (u8) | compressão (u8) | corpo (comprimido ou não)
+# Corpo = seções com prefixo de tamanho (u32 little-endian), nesta ordem:
+#   meta     JSON do workflow com "nodes"/"links" = null (quando vão nas colunas)
+#   strings  JSON com a lista de strings internadas (IDs, tipos, sufixos de atributo)
+#   nodes    colunas: id (u32 string), tipo (u32 string), x (f64), y (f64), pos inteira (u8),
+#            seguidas do JSON com a lista de "data" de cada node
+#   links    colunas: id (i64), origem (u32 node, u32 sufixo), destino (u32 node, u32 sufixo)
+# Atributo de link "{node_id}_{sufixo}" vira (índice do node, sufixo); outro formato
+# vai inteiro como string com node = NO_NODE.
+# Se algum node/link foge do formato do serializer, a lista vai como JSON no meta.
+
+HEADER = struct.Struct("<4sBB")
+SECTION = struct.Struct("<I")
+NO_NODE = 0xFFFFFFFF
+
+NODE_KEYS = ["id", "type", "pos", "data"]
+LINK_KEYS = ["id", "from_attr", "to_attr"]
+INT64_MIN, INT64_MAX = -(2 ** 63), 2 ** 63 - 1
+FLOAT_EXACT_INT = 2 ** 53
+
+
+def is_binary_workflow(content: bytes) -> bool:
+    """True se o conteúdo começa com a assinatura do formato binário"""
+    return content[:len(MAGIC)] == MAGIC
+
+
+def encode_workflow(workflow: Dict[str, Any], compression: str = "zlib") -> bytes:
+    """
+    Codifica um workflow (dict do WorkflowSerializer) no formato binário
+
+    Args:
+        compression: "none", "zlib" ou "lzma"
+    """
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Compressão desconhecida: {compression}")
+
+    strings = _StringTable()
+    meta = dict(workflow)
+    node_section = b""
+    link_section = b""
+
+    node_index = None
+    if "nodes" in workflow:
+        encoded = _encode_nodes(workflow["nodes"], strings)
+        if encoded is not None:
+            node_section, node_index = encoded
+            meta["nodes"] = None
+
+    if "links" in workflow and node_index is not None:
+        encoded_links = _encode_links(workflow.get("links"), node_index, strings)
+        if encoded_links is not None:
+            link_section = encoded_links
+            meta["links"] = None
+
+    body = b"".join(
+        _section(part)
+        for part in (
+            _json_bytes(meta),
+            _json_bytes(strings.values),
+            node_section,
+            link_section,
+        )
+    )
+
+    kind = COMPRESSIONS[compression]
+    if kind == COMPRESSION_ZLIB:
+        body = zlib.compress(body, 6)
+    elif kind == COMPRESSION_LZMA:
+        body = lzma.compress(body, preset=6)
+    return HEADER.pack(MAGIC, FORMAT_VERSION, kind) + body
+
+
+def decode_workflow(content: bytes) -> Dict[str, Any]:
+    """Decodifica o formato binário de volta para o dict do workflow (igual ao JSON)"""
+    magic, version, kind = HEADER.unpack_from(content)
+    if magic != MAGIC:
+        raise ValueError("Não é um workflow binário (assinatura inválida)")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Versão de workflow binário não suportada: {version}")
+
+    body = memoryview(content)[HEADER.size:]
+    if kind == COMPRESSION_ZLIB:
+        body = memoryview(zlib.decompress(body))
+    elif kind == COMPRESSION_LZMA:
+        body = memoryview(lzma.decompress(body))
+    elif kind != COMPRESSION_NONE:
+        raise ValueError(f"Compressão desconhecida: {kind}")
+
+    meta_bytes, strings_bytes, node_bytes, link_bytes = _split_sections(body, 4)
+    workflow = json.loads(bytes(meta_bytes))
+    strings = json.loads(bytes(strings_bytes))
+
+    node_ids = None
+    if workflow.get("nodes", ...) is None and node_bytes:
+        workflow["nodes"], node_ids = _decode_nodes(node_bytes, strings)
+    if workflow.get("links", ...) is None and link_bytes:
+        workflow["links"] = _decode_links(link_bytes, strings, node_ids)
+    return workflow
+
+
+# ===== Nodes =====
+
+def _encode_nodes(nodes: Any, strings: "_StringTable") -> Optional[Tuple[bytes, Dict[str, int]]]:
+    """Colunas dos nodes, ou None se algum node foge do formato (vai como JSON)"""
+    if not isinstance(nodes, list):
+        return None
+
+    ids, types = array("I"), array("I")
+    xs, ys = array("d"), array("d")
+    int_pos = bytearray()
+    datas = []
+    node_index: Dict[str, int] = {}
+
+    for position, node in enumerate(nodes):
+        if not isinstance(node, dict) or list(node) != NODE_KEYS:
+            return None
+        node_id, node_type, pos = node["id"], node["type"], node["pos"]
+        if type(node_id) is not str or type(node_type) is not str or node_id in node_index:
+            return None
+        if not isinstance(pos, list) or len(pos) != 2:
+            return None
+        kinds = {type(pos[0]), type(pos[1])}
+        if kinds == {int}:
+            if any(abs(value) > FLOAT_EXACT_INT for value in pos):
+                return None
+            int_pos.append(1)
+        elif kinds == {float}:
+            int_pos.append(0)
+        else:
+            return None
+
+        node_index[node_id] = position
+        ids.append(strings.ref(node_id))
+        types.append(strings.ref(node_type))
+        xs.append(pos[0])
+        ys.append(pos[1])
+        datas.append(node["data"])
+
+    columns = b"".join(_le_bytes(column) for column in (ids, types, xs, ys)) + bytes(int_pos)
+    return SECTION.pack(len(nodes)) + columns + _json_bytes(datas), node_index
+
+
+def _decode_nodes(section: memoryview, strings: List[str]) -> Tuple[List[Dict[str, Any]], List[str]]:
+    (count,) = SECTION.unpack_from(section)
+    offset = SECTION.size
+    ids, offset = _read_column(section, offset, "I", count)
+    types, offset = _read_column(section, offset, "I", count)
+    xs, offset = _read_column(section, offset, "d", count)
+    ys, offset = _read_column(section, offset, "d", count)
+    int_pos = bytes(section[offset:offset + count])
+    datas = json.loads(bytes(section[offset + count:]))
+
+    node_ids = [strings[ref] for ref in ids]
+    nodes = [
+        {
+            "id": node_id,
+            "type": strings[type_ref],
+            "pos": [int(x), int(y)] if is_int else [x, y],
+            "data": data,
+        }
+        for node_id, type_ref, x, y, is_int, data in zip(node_ids, types, xs, ys, int_pos, datas)
+    ]
+    return nodes, node_ids
+
+
+# ===== Links =====
+
+def _encode_links(links: Any, node_index: Dict[str, int], strings: "_StringTable") -> Optional[bytes]:
+    """Colunas dos links, ou None se algum link foge do formato (vai como JSON)"""
+    if not isinstance(links, list):
+        return None
+
+    link_ids = array("q")
+    columns = [array("I") for _ in range(4)]  # origem node/sufixo, destino node/sufixo
+
+    for link in links:
+        if not isinstance(link, dict) or list(link) != LINK_KEYS:
+            return None
+        link_id = link["id"]
+        if type(link_id) is not int or not INT64_MIN <= link_id <= INT64_MAX:
+            return None
+        link_ids.append(link_id)
+
+        for column, attr in ((0, link["from_attr"]), (2, link["to_attr"])):
+            if type(attr) is not str:
+                return None
+            node_id, sep, suffix = attr.rpartition("_")
+            position = node_index.get(node_id) if sep else None
+            if position is None:
+                columns[column].append(NO_NODE)
+                columns[column + 1].append(strings.ref(attr))
+            else:
+                columns[column].append(position)
+                columns[column + 1].append(strings.ref(suffix))
+
+    return SECTION.pack(len(links)) + _le_bytes(link_ids) + b"".join(_le_bytes(column) for column in columns)
+
+
+def _decode_links(section: memoryview, strings: List[str], node_ids: Optional[List[str]]) -> List[Dict[str, Any]]:
+    (count,) = SECTION.unpack_from(section)
+    offset = SECTION.size
+    link_ids, offset = _read_column(section, offset, "q", count)
+    columns = []
+    for _ in range(4):
+        column, offset = _read_column(section, offset, "I", count)
+        columns.append(column)
+
+    prefixes = [f"{node_id}_" for node_id in node_ids or []]
+    from_attrs, to_attrs = (
+        [strings[ref] if position == NO_NODE else prefixes[position] + strings[ref] for position, ref in zip(nodes, refs)]
+        for nodes, refs in ((columns[0], columns[1]), (columns[2], columns[3]))
+    )
+    return [
+        {"id": link_id, "from_attr": from_attr, "to_attr": to_attr}
+        for link_id, from_attr, to_attr in zip(link_ids, from_attrs, to_attrs)
+    ]
+
+
+# ===== Internos =====
+
+class _StringTable:
+    """Strings internadas: cada valor distinto é gravado uma vez"""
+
+    def __init__(self):
+        self.values: List[str] = []
+        self._refs: Dict[str, int] = {}
+
+    def ref(self, value: str) -> int:
+        ref = self._refs.get(value)
+        if ref is None:
+            ref = self._refs[value] = len(self.values)
+            self.values.append(value)
+        return ref
+
+
+def _json_bytes(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _section(payload: bytes) -> bytes:
+    return SECTION.pack(len(payload)) + payload
+
+
+def _split_sections(body: memoryview, count: int) -> List[memoryview]:
+    sections = []
+    offset = 0
+    for _ in range(count):
+        (size,) = SECTION.unpack_from(body, offset)
+        offset += SECTION.size
+        sections.append(body[offset:offset + size])
+        offset += size
+    return sections
+
+
+def _le_bytes(column: array) -> bytes:
+    """Bytes da coluna em little-endian (independente da máquina)"""
+    if sys.byteorder == "big":
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+def _read_column(section: memoryview, offset: int, typecode: str, count: int) -> Tuple[array, int]:
+    column = array(typecode)
+    end = offset + column.itemsize * count
+    column.frombytes(section[offset:end])
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column, end
+
+
+# Teste basico
+if __name__ == "__main__":
+    import random
+    import time
+
+    random.seed(1)
+    node_count = 5000
+    nodes = []
+    for i in range(node_count):
+        node_type = random.choice(["projeto_iniciado", "workspace", "abrir", "zed", "claude"])
+        data = {"project_name": f"Projeto {i % 40}"} if node_type == "projeto_iniciado" else {}
+        pos = [random.randint(0, 4000), random.randint(0, 4000)] if i % 2 else [random.uniform(0, 4000), random.uniform(0, 4000)]
+        nodes.append({"id": f"node_{node_type}_{random.getrandbits(32):08x}", "type": node_type, "pos": pos, "data": data})
+    links = [
+        {"id": 10000 + i, "from_attr": f"{nodes[i]['id']}_output", "to_attr": f"{nodes[i + 1]['id']}_input"}
+        for i in range(node_count - 1)
+    ]
+    workflow = {
+        "version": "1.0",
+        "name": "Benchmark",
+        "created_at": "2025-11-16T10:30:00",
+        "updated_at": "2025-11-16T11:45:00",
+        "nodes": nodes,
+        "links": links,
+    }
+
+    def measure(func, repeat: int = 5) -> float:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        return (time.perf_counter() - start) / repeat * 1000
+
+    json_text = json.dumps(workflow, indent=2, ensure_ascii=False).encode("utf-8")
+    print(f"{node_count} nodes, {len(links)} links")
+    print(f"  {'json (indent=2)':<16} {len(json_text) / 1024:8.0f}KB  carregar: {measure(lambda: json.loads(json_text)):6.1f}ms")
+    for compression in ("none", "zlib", "lzma"):
+        encoded = encode_workflow(workflow, compression)
+        assert decode_workflow(encoded) == workflow
+        assert json.dumps(decode_workflow(encoded)) == json.dumps(workflow)
+        print(
+            f"  {'arqw ' + compression:<16} {len(encoded) / 1024:8.0f}KB  carregar: {measure(lambda: decode_workflow(encoded)):6.1f}ms"
+            f"  gravar: {measure(lambda: encode_workflow(workflow, compression)):6.1f}ms"
+        )
+
+    # Formato fora do padrão: continua sem perdas (vai como JSON no meta)
+    odd = dict(workflow, nodes=[{"id": 1, "extra": True}], links=[{"id": "x"}], custom={"a": [1, 2.5, None]})
+    assert decode_workflow(encode_workflow(odd, "none")) == odd
+    print("Round-trip sem perdas: OK")
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Workflow Index - Metadados dos workflows em um arquivo ao lado deles
+Listar custa uma varredura do diretório (stat), sem abrir os workflows
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+
+class WorkflowIndex:
+    """
+    Cache persistente de nome, datas e contagens de cada workflow
+
+    Guardado em {workflows_dir}/.index.json, por nome de arquivo:
+        {"version": 2, "workflows": {"x.json": {"mtime_ns", "size", "name",
+         "created_at", "updated_at", "node_count", "link_count", "content_hash"}}}
+
+    Uma entrada vale enquanto mtime e tamanho do arquivo forem os mesmos do
+    stat; se o arquivo mudou fora do app (ou o índice sumiu/corrompeu), só
+    aquele workflow é relido. save/delete do WorkflowManager atualizam o
+    índice com os dados que já têm em memória.
+
+    Um índice por diretório (shared()): dois WorkflowManager no mesmo
+    diretório (ex: auto-save e aba Map) usam as mesmas entradas e o mesmo lock.
+
+    Se o mesmo workflow existe nos dois formatos (ex: depois de trocar
+    WORKFLOW_FORMAT), só o arquivo mais recente é listado.
+
+    Uso:
+        index = WorkflowIndex.shared(workflows_dir, load=manager._read_file)
+        index.list()  # [{"name", "file", "created_at", "updated_at", "node_count", "link_count"}, ...]
+    """
+
+    INDEX_FILE = ".index.json"
+    VERSION = 2
+    EXTENSIONS = (".json", ".arqw")
+
+    _shared: Dict[Path, "WorkflowIndex"] = {}
+    _shared_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, workflows_dir: Path, load: Callable[[Path], dict]) -> "WorkflowIndex":
+        """Índice do diretório (criado na primeira chamada, o mesmo para todos os managers)"""
+        key = Path(workflows_dir).resolve()
+        with cls._shared_lock:
+            index = cls._shared.get(key)
+            if index is None:
+                index = cls._shared[key] = cls(workflows_dir, load)
+            return index
+
+    def __init__(self, workflows_dir: Path, load: Callable[[Path], dict]):
+        """
+        Args:
+            workflows_dir: Diretório dos workflows
+            load: Lê um workflow completo (usado só quando a entrada não vale)
+        """
+        self.workflows_dir = Path(workflows_dir)
+        self.index_path = self.workflows_dir / self.INDEX_FILE
+        self.load = load
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Metadados de todos os workflows (ordenados pelo nome do arquivo)"""
+        with self._lock:
+            entries = self._get_entries()
+            dirty = False
+            seen = set()
+            workflows = {}  # {nome sem extensão: (mtime_ns, nome do arquivo, metadados)}
+
+            for dir_entry in sorted(self._scan(), key=lambda e: e.name):
+                seen.add(dir_entry.name)
+                try:
+                    stat = dir_entry.stat()
+                except OSError:
+                    continue
+
+                entry = entries.get(dir_entry.name)
+                if entry is None or entry["mtime_ns"] != stat.st_mtime_ns or entry["size"] != stat.st_size:
+                    entry = self._read_entry(Path(dir_entry.path), stat)
+                    if entry is None:
+                        continue
+                    entries[dir_entry.name] = entry
+                    dirty = True
+
+                # Mesmo workflow nos dois formatos: fica o mais recente
+                stem = Path(dir_entry.name).stem
+                if stem not in workflows or entry["mtime_ns"] > workflows[stem][0]:
+                    workflows[stem] = (entry["mtime_ns"], dir_entry.name, self._public(dir_entry.name, entry))
+
+            for name in set(entries) - seen:
+                del entries[name]  # Apagado fora do app
+                dirty = True
+
+            if dirty:
+                self._persist()
+            return [public for _, _, public in sorted(workflows.values(), key=lambda w: w[1])]
+
+    def get(self, file_path: Path) -> Optional[Dict[str, Any]]:
+        """
+        Metadados de um workflow (como list(), mais "content_hash")
+
+        Só abre o arquivo se a entrada não vale mais (ou veio de list() e ainda
+        não tem hash). None se o arquivo não existe.
+        """
+        file_path = Path(file_path)
+        try:
+            stat = file_path.stat()
+        except OSError:
+            return None
+        with self._lock:
+            entries = self._get_entries()
+            entry = entries.get(file_path.name)
+            stale = entry is None or entry["mtime_ns"] != stat.st_mtime_ns or entry["size"] != stat.st_size
+            if stale or entry["content_hash"] is None:
+                entry = self._read_entry(file_path, stat, with_hash=True)
+                if entry is None:
+                    return None
+                entries[file_path.name] = entry
+                self._persist()
+            return dict(self._public(file_path.name, entry), content_hash=entry["content_hash"])
+
+    def update(self, file_path: Path, workflow_data: dict, digest: Optional[str] = None):
+        """
+        Registra um workflow recém gravado (dados em memória + stat do arquivo)
+
+        digest: content_hash(workflow_data) (None: calculado quando get() precisar)
+        """
+        file_path = Path(file_path)
+        try:
+            stat = file_path.stat()
+        except OSError as e:
+            print(f"[WorkflowIndex] ERRO ao atualizar índice de {file_path.name}: {e}")
+            return
+        with self._lock:
+            self._get_entries()[file_path.name] = self._entry(workflow_data, file_path, stat, digest)
+            self._persist()
+
+    def remove(self, file_path: Path):
+        """Tira um workflow apagado do índice"""
+        with self._lock:
+            if self._get_entries().pop(Path(file_path).name, None) is not None:
+                self._persist()
+
+    # ===== Internos =====
+
+    def _scan(self) -> List[os.DirEntry]:
+        with os.scandir(self.workflows_dir) as it:
+            return [
+                entry for entry in it
+                if entry.name.endswith(self.EXTENSIONS) and not entry.name.startswith(".") and entry.is_file()
+            ]
+
+    def _read_entry(self, file_path: Path, stat: os.stat_result, with_hash: bool = False) -> Optional[Dict[str, Any]]:
+        """Entrada a partir do arquivo (o hash, que custa tanto quanto o parse, só se pedido)"""
+        try:
+            data = self.load(file_path)
+        except Exception as e:
+            print(f"[WorkflowIndex] ERRO ao ler metadados de {file_path}: {e}")
+            return None
+        if data is None:
+            return None
+        return self._entry(data, file_path, stat, content_hash(data) if with_hash else None)
+
+    def _entry(self, data: dict, file_path: Path, stat: os.stat_result, digest: Optional[str] = None) -> Dict[str, Any]:
+        return {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "name": data.get("name", file_path.stem),
+            "created_at": data.get("created_at", ""),
+            "updated_at": data.get("updated_at", ""),
+            "node_count": len(data.get("nodes", [])),
+            "link_count": len(data.get("links", [])),
+            "content_hash": digest,
+        }
+
+    def _public(self, file_name: str, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Formato de list_workflows (sem mtime/size)"""
+        return {
+            "name": entry["name"],
+            "file": Path(file_name).stem,
+            "created_at": entry["created_at"],
+            "updated_at": entry["updated_at"],
+            "node_count": entry["node_count"],
+            "link_count": entry["link_count"],
+        }
+
+    def _get_entries(self) -> Dict[str, Dict[str, Any]]:
+        """Entradas em memória (lidas do disco uma vez; chamar com lock)"""
+        if self._entries is None:
+            self._entries = {}
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    index = json.load(f)
+                if index.get("version") == self.VERSION:
+                    self._entries = index.get("workflows", {})
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                print(f"[WorkflowIndex] Índice inválido, reconstruindo: {e}")
+        return self._entries
+
+    def _persist(self):
+        """Grava o índice (temporário exclusivo + rename: nunca fica pela metade)"""
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.workflows_dir, prefix=f"{self.INDEX_FILE}.")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"version": self.VERSION, "workflows": self._entries}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.index_path)
+        except Exception as e:
+            print(f"[WorkflowIndex] ERRO ao gravar índice: {e}")
+            if tmp_path:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+
+
+def content_hash(workflow_data: dict) -> str:
+    """Hash do conteúdo do workflow (sem created_at/updated_at): igual = nada mudou"""
+    content = {key: value for key, value in workflow_data.items() if key not in ("created_at", "updated_at")}
+    encoded = json.dumps(content, ensure_ascii=False, separators=(",", ":"))  # Ordem do serializer é estável
+    return hashlib.blake2b(encoded.encode("utf-8"), digest_size=16).hexdigest()
+
+
+# Teste basico
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    workflows_dir = Path(tempfile.mkdtemp())
+    nodes = [{"id": f"node_projeto_iniciado_{i:08x}", "type": "projeto_iniciado", "pos": [i, i], "data": {}} for i in range(2000)]
+    links = [{"id": i, "from_attr": f"node_{i}_output", "to_attr": f"node_{i + 1}_input"} for i in range(2000)]
+    for i in range(200):
+        with open(workflows_dir / f"workflow_{i}.json", "w", encoding="utf-8") as f:
+            json.dump({"name": f"Workflow {i}", "created_at": "", "updated_at": "", "nodes": nodes, "links": links}, f, indent=2)
+
+    def read_file(path: Path) -> dict:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    # Como era: abrir e parsear todos
+    start = time.perf_counter()
+    parsed = [read_file(path) for path in sorted(workflows_dir.glob("*.json"))]
+    print(f"json.load de todos:       {(time.perf_counter() - start) * 1000:8.1f}ms ({len(parsed)} workflows)")
+
+    index = WorkflowIndex(workflows_dir, load=read_file)
+    start = time.perf_counter()
+    index.list()
+    print(f"index.list() (sem índice): {(time.perf_counter() - start) * 1000:8.1f}ms")
+
+    index = WorkflowIndex(workflows_dir, load=read_file)  # Novo processo: índice lido do disco
+    start = time.perf_counter()
+    workflows = index.list()
+    print(f"index.list() (com índice): {(time.perf_counter() - start) * 1000:8.1f}ms")
+
+    # Arquivo alterado fora do app: só ele é relido
+    with open(workflows_dir / "workflow_7.json", "w", encoding="utf-8") as f:
+        json.dump({"name": "Alterado", "nodes": [], "links": []}, f)
+    os.remove(workflows_dir / "workflow_8.json")
+    workflows = index.list()
+    print(f"Após alterar/apagar: {len(workflows)} workflows, workflow_7 = {next(w for w in workflows if w['file'] == 'workflow_7')}")
+
+    # Mesmo workflow em .json e .arqw: listado uma vez (o mais recente)
+    with open(workflows_dir / "workflow_9.arqw", "w", encoding="utf-8") as f:
+        json.dump({"name": "Convertido", "nodes": [], "links": []}, f)
+    duplicated = [w for w in index.list() if w["file"] == "workflow_9"]
+    print(f"workflow_9 nos dois formatos: {len(duplicated)} entrada ({duplicated[0]['name']})")
+    assert WorkflowIndex.shared(workflows_dir, read_file) is WorkflowIndex.shared(workflows_dir, read_file)
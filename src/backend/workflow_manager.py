@@ -4,24 +4,43 @@ Workflow Manager - Gerenciamento de salvamento e carregamento de workflows
 """
 
 import json
+import os
+import tempfile
 from pathlib import Path
 from typing import List, Optional, Dict
 from datetime import datetime
 
+from constants import WORKFLOW_FORMAT, WORKFLOW_COMPRESSION
+from .workflow_codec import encode_workflow, decode_workflow, is_binary_workflow
+from .workflow_index import WorkflowIndex, content_hash
+
 
 class WorkflowManager:
     """
     Gerencia salvamento e carregamento de workflows em arquivos JSON
 
     Workflows são salvos em: data/workflows/{nome}.json
+    (ou {nome}.arqw no formato binário, ver workflow_codec.py)
     """
 
-    def __init__(self, workflows_dir: Optional[Path] = None):
+    # Extensão de cada formato
+    EXTENSIONS = {"json": ".json", "binary": ".arqw"}
+
+    def __init__(self, workflows_dir: Optional[Path] = None, file_format: Optional[str] = None,
+                 compression: Optional[str] = None):
         """
         Args:
             workflows_dir: Diretório para salvar workflows.
                           Se None, usa data/workflows/ relativo à raiz do projeto
+            file_format: "json" ou "binary" (None = WORKFLOW_FORMAT). Só afeta a gravação
+            compression: Compressão do formato binário (None = WORKFLOW_COMPRESSION)
         """
+        self.file_format = file_format or WORKFLOW_FORMAT
+        self.compression = compression or WORKFLOW_COMPRESSION
+        if self.file_format not in self.EXTENSIONS:
+            print(f"[WorkflowManager] AVISO: Formato '{self.file_format}' desconhecido, usando json")
+            self.file_format = "json"
+
         if workflows_dir is None:
             # Caminho relativo à raiz do projeto (pai de src/)
             project_root = Path(__file__).parent.parent.parent
@@ -33,12 +52,19 @@ class WorkflowManager:
         self.workflows_dir.mkdir(parents=True, exist_ok=True)
         print(f"[WorkflowManager] Diretório de workflows: {self.workflows_dir}")
 
+        # Metadados (nome, datas, contagens) sem abrir cada workflow
+        self.index = WorkflowIndex.shared(self.workflows_dir, load=self._read_file)
+
     def save_workflow(
         self, workflow_data: dict, workflow_name: Optional[str] = None
     ) -> bool:
         """
         Salva um workflow em arquivo JSON
 
+        A gravação é atômica (arquivo temporário + fsync + os.replace): um crash
+        no meio deixa o arquivo anterior intacto. Se o conteúdo (sem as datas)
+        é igual ao já gravado, nada é escrito.
+
         Args:
             workflow_data: Dicionário com dados do workflow (do WorkflowSerializer)
             workflow_name: Nome do arquivo (sem extensão). Se None, usa nome do workflow_data
@@ -54,26 +80,34 @@ class WorkflowManager:
             # Sanitizar nome (remover caracteres inválidos)
             safe_name = self._sanitize_filename(workflow_name)
 
-            # Caminho do arquivo
-            file_path = self.workflows_dir / f"{safe_name}.json"
+            # Caminho do arquivo (o já existente pode estar no outro formato)
+            file_path = self.workflows_dir / f"{safe_name}{self.EXTENSIONS[self.file_format]}"
+            existing_path = self._find_file(safe_name)
+
+            # Se arquivo já existe, preservar created_at original (do índice, sem reler o arquivo)
+            digest = content_hash(workflow_data)
+            previous = self.index.get(existing_path) if existing_path else None
+            if previous:
+                if previous["content_hash"] == digest and existing_path == file_path:
+                    print(f"[WorkflowManager] Workflow sem mudanças, nada gravado: {file_path}")
+                    return True
+                workflow_data["created_at"] = previous["created_at"] or workflow_data.get("created_at")
 
             # Atualizar timestamp de modificação
             workflow_data["updated_at"] = datetime.now().isoformat()
 
-            # Se arquivo já existe, preservar created_at original
-            if file_path.exists():
-                try:
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        old_data = json.load(f)
-                        workflow_data["created_at"] = old_data.get(
-                            "created_at", workflow_data.get("created_at")
-                        )
-                except Exception:
-                    pass  # Se falhar, usa created_at do novo workflow
-
-            # Salvar JSON
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(workflow_data, f, indent=2, ensure_ascii=False)
+            # Salvar
+            if self.file_format == "binary":
+                content = encode_workflow(workflow_data, self.compression)
+            else:
+                content = json.dumps(workflow_data, indent=2, ensure_ascii=False).encode("utf-8")
+            self._write_atomic(file_path, content)
+            self.index.update(file_path, workflow_data, digest)
+
+            # Convertido de formato: remover o arquivo antigo
+            if existing_path and existing_path != file_path:
+                existing_path.unlink()
+                self.index.remove(existing_path)
 
             print(f"[WorkflowManager] Workflow salvo: {file_path}")
             return True
@@ -87,10 +121,10 @@ class WorkflowManager:
 
     def load_workflow(self, workflow_name: str) -> Optional[dict]:
         """
-        Carrega um workflow de arquivo JSON
+        Carrega um workflow de arquivo JSON ou binário (detectado pela assinatura)
 
         Args:
-            workflow_name: Nome do workflow (sem extensão .json)
+            workflow_name: Nome do workflow (sem extensão)
 
         Returns:
             Dicionário com dados do workflow ou None se erro
@@ -99,17 +133,16 @@ class WorkflowManager:
             # Sanitizar nome
             safe_name = self._sanitize_filename(workflow_name)
 
-            # Caminho do arquivo
-            file_path = self.workflows_dir / f"{safe_name}.json"
+            # Caminho do arquivo (qualquer formato)
+            file_path = self._find_file(safe_name)
 
             # Verificar se existe
-            if not file_path.exists():
-                print(f"[WorkflowManager] Workflow não encontrado: {file_path}")
+            if file_path is None:
+                print(f"[WorkflowManager] Workflow não encontrado: {self.workflows_dir / safe_name}")
                 return None
 
-            # Carregar JSON
-            with open(file_path, "r", encoding="utf-8") as f:
-                workflow_data = json.load(f)
+            # Carregar
+            workflow_data = self._read_file(file_path)
 
             print(f"[WorkflowManager] Workflow carregado: {file_path}")
             return workflow_data
@@ -136,39 +169,15 @@ class WorkflowManager:
                 },
                 ...
             ]
-        """
-        workflows = []
 
+        Só os workflows alterados fora do app (mtime/tamanho diferentes
+        do índice) são abertos; os demais vêm do WorkflowIndex.
+        """
         try:
-            # Listar todos arquivos .json no diretório
-            json_files = sorted(self.workflows_dir.glob("*.json"))
-
-            for file_path in json_files:
-                try:
-                    # Carregar metadados do workflow
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        data = json.load(f)
-
-                    workflows.append(
-                        {
-                            "name": data.get("name", file_path.stem),
-                            "file": file_path.stem,
-                            "created_at": data.get("created_at", ""),
-                            "updated_at": data.get("updated_at", ""),
-                            "node_count": len(data.get("nodes", [])),
-                            "link_count": len(data.get("links", [])),
-                        }
-                    )
-                except Exception as e:
-                    print(
-                        f"[WorkflowManager] ERRO ao ler metadados de {file_path}: {e}"
-                    )
-                    continue
-
+            return self.index.list()
         except Exception as e:
             print(f"[WorkflowManager] ERRO ao listar workflows: {e}")
-
-        return workflows
+            return []
 
     def delete_workflow(self, workflow_name: str) -> bool:
         """
@@ -184,16 +193,17 @@ class WorkflowManager:
             # Sanitizar nome
             safe_name = self._sanitize_filename(workflow_name)
 
-            # Caminho do arquivo
-            file_path = self.workflows_dir / f"{safe_name}.json"
+            # Caminho do arquivo (qualquer formato)
+            file_path = self._find_file(safe_name)
 
             # Verificar se existe
-            if not file_path.exists():
-                print(f"[WorkflowManager] Workflow não encontrado: {file_path}")
+            if file_path is None:
+                print(f"[WorkflowManager] Workflow não encontrado: {self.workflows_dir / safe_name}")
                 return False
 
             # Deletar arquivo
             file_path.unlink()
+            self.index.remove(file_path)
             print(f"[WorkflowManager] Workflow deletado: {file_path}")
             return True
 
@@ -211,9 +221,55 @@ class WorkflowManager:
         Returns:
             True se existe, False caso contrário
         """
-        safe_name = self._sanitize_filename(workflow_name)
-        file_path = self.workflows_dir / f"{safe_name}.json"
-        return file_path.exists()
+        return self._find_file(self._sanitize_filename(workflow_name)) is not None
+
+    def _write_atomic(self, file_path: Path, content: bytes):
+        """Grava em um temporário no mesmo diretório, faz fsync e troca pelo arquivo final"""
+        # Temporário exclusivo (duas gravações simultâneas não se misturam); começa com ".": fora da listagem
+        fd, tmp_path = tempfile.mkstemp(dir=file_path.parent, prefix=f".{file_path.name}.")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+        # fsync do diretório: o rename também sobrevive a uma queda de energia
+        try:
+            dir_fd = os.open(self.workflows_dir, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(dir_fd)
+        except OSError:
+            pass
+        finally:
+            os.close(dir_fd)
+
+    def _find_file(self, safe_name: str) -> Optional[Path]:
+        """Arquivo existente do workflow (nos dois formatos: o mais recente, como no índice) ou None"""
+        found = []
+        for ext in self.EXTENSIONS.values():
+            file_path = self.workflows_dir / f"{safe_name}{ext}"
+            try:
+                found.append((file_path.stat().st_mtime_ns, file_path))
+            except OSError:
+                continue
+        return max(found)[1] if found else None
+
+    def _read_file(self, file_path: Path) -> dict:
+        """Lê um workflow do disco em qualquer formato (levanta exceção se inválido)"""
+        with open(file_path, "rb") as f:
+            content = f.read()
+        if is_binary_workflow(content):
+            return decode_workflow(content)
+        return json.loads(content.decode("utf-8"))
 
     def _sanitize_filename(self, name: str) -> str:
         """
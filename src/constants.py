@@ -41,6 +41,46 @@ APP_DESCRIPTIONS = {
     "alacritty": "Alacritty Terminal",
 }
 
+# Class da janela (Hyprland) de cada app - usado para encontrar a janela aberta
+APP_WINDOW_CLASSES = {
+    "zed": "zed",
+    "zen-browser": "zen",
+    "zen": "zen",
+    "terminal": "ghostty",
+    "ghostty": "ghostty",
+    "kitty": "kitty",
+    "cursor": "cursor",
+    "alacritty": "alacritty",
+    "claude-code": "ghostty",  # Claude Code roda em terminal
+}
+
+# Workspaces sempre reservados ao projeto ativo (o layout do projeto pode usar outros)
+PROJECT_WORKSPACES = [1, 2, 3]
+
+# Tempo máximo (segundos) esperando a janela de um app aparecer (sem histórico do app)
+APP_WINDOW_TIMEOUT = 15.0
+
+# Espera (segundos) antes/depois de enviar um hotkey. As duas viram o
+# orçamento aprendido quando o app tem histórico (ver launch_timing.py)
+HOTKEY_DELAY_BEFORE = 0.5
+HOTKEY_DELAY_AFTER = 0.3
+
+# Tempo máximo (segundos) esperando os apps fecharem sozinhos antes do SIGKILL
+SHUTDOWN_TIMEOUT = 5.0
+
+# Pool de instâncias pré-abertas por app (ex: {"zed": 1, "terminal": 1}). Vazio = desativado
+WARM_POOL_SIZES = {}
+
+# RAM estimada (GB) de cada instância ociosa do pool (orçamento contra o RAMMonitor)
+WARM_POOL_INSTANCE_GB = 0.5
+
+# Formato dos workflows salvos: "json" (data/workflows/x.json) ou "binary" (x.arqw, ver backend/workflow_codec.py)
+# Arquivos nos dois formatos são lidos sempre (detectados pela assinatura); salvar converte para este
+WORKFLOW_FORMAT = "json"
+
+# Compressão do formato binário: "none", "zlib" ou "lzma"
+WORKFLOW_COMPRESSION = "zlib"
+
 # ============================================================================
 # UI CONSTANTS
 # ============================================================================
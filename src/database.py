@@ -5,12 +5,222 @@ Database - Gerenciamento de projetos com SQLite
 
 import sqlite3
 import json
+import re
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator
+
+
+# ===== Migrações =====
+# Cada passo recebe a conexão (já dentro da transação) e leva o schema da
+# versão N-1 para N. Só adicionar passos novos no fim da lista, nunca alterar
+# os existentes. Os primeiros passos são idempotentes porque bancos antigos
+# (user_version = 0) já podem ter as tabelas/colunas.
+
+def _migration_initial_schema(conn: sqlite3.Connection):
+    """tabelas projects e project_processes"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS projects (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT UNIQUE NOT NULL,
+            folder_path TEXT NOT NULL,
+            zen_container TEXT,
+            workspace_1_app TEXT,
+            workspace_2_app TEXT,
+            workspace_3_app TEXT,
+            custom_commands TEXT,
+            urls TEXT,
+            last_opened TIMESTAMP,
+            is_active BOOLEAN DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # Processos abertos por cada projeto (raiz = PID da janela, + descendentes)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS project_processes (
+            project_id INTEGER NOT NULL,
+            pid INTEGER NOT NULL,
+            root_pid INTEGER NOT NULL,
+            app TEXT,
+            address TEXT,
+            create_time REAL NOT NULL,
+            started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (project_id, pid)
+        )
+    """)
+
+
+def _migration_workspace_hotkeys(conn: sqlite3.Connection):
+    """colunas workspace_N_hotkey"""
+    columns = [col[1] for col in conn.execute("PRAGMA table_info(projects)").fetchall()]
+    for ws_num in [1, 2, 3]:
+        col_name = f"workspace_{ws_num}_hotkey"
+        if col_name not in columns:
+            conn.execute(f"ALTER TABLE projects ADD COLUMN {col_name} TEXT DEFAULT ''")
+
+
+def _migration_project_workspaces(conn: sqlite3.Connection):
+    """tabela project_workspaces (layout com N workspaces)"""
+    # Um app por workspace por projeto; a PK agrupa as linhas do projeto,
+    # então o layout inteiro sai de uma única busca por faixa no índice
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS project_workspaces (
+            project_id INTEGER NOT NULL,
+            workspace_id INTEGER NOT NULL,
+            app TEXT NOT NULL,
+            hotkey TEXT NOT NULL DEFAULT '',
+            args TEXT NOT NULL DEFAULT '[]',
+            sort_order INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (project_id, workspace_id)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_project_workspaces_order
+        ON project_workspaces (project_id, sort_order, workspace_id)
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_project_workspaces_workspace
+        ON project_workspaces (workspace_id)
+    """)
+
+    # Copiar as colunas antigas workspace_{1,2,3}_app/hotkey
+    for ws_num in [1, 2, 3]:
+        conn.execute(f"""
+            INSERT OR IGNORE INTO project_workspaces (project_id, workspace_id, app, hotkey, sort_order)
+            SELECT id, {ws_num}, TRIM(workspace_{ws_num}_app), COALESCE(workspace_{ws_num}_hotkey, ''), {ws_num}
+            FROM projects
+            WHERE TRIM(COALESCE(workspace_{ws_num}_app, '')) != ''
+        """)
+
+
+def _migration_project_search(conn: sqlite3.Connection):
+    """launch_count e índice FTS5 de busca (projects_fts)"""
+    columns = [col[1] for col in conn.execute("PRAGMA table_info(projects)").fetchall()]
+    if "launch_count" not in columns:
+        conn.execute("ALTER TABLE projects ADD COLUMN launch_count INTEGER NOT NULL DEFAULT 0")
+    _create_search_index(conn)
+
+
+def _create_search_index(conn: sqlite3.Connection) -> bool:
+    """
+    Cria projects_fts + triggers e indexa os projetos existentes
+
+    Sem FTS5 no SQLite retorna False sem criar nada (a busca usa o fallback
+    em memória do ProjectSearch).
+    """
+    # Tabela FTS com conteúdo externo (o texto fica só em projects).
+    # Prefixos de 2 e 3 letras indexados: busca enquanto digita sem varrer o índice
+    try:
+        conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS projects_fts USING fts5(
+                name, folder_path, urls, custom_commands,
+                content='projects', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2',
+                prefix='2 3'
+            )
+        """)
+    except sqlite3.OperationalError as e:
+        # SQLite sem FTS5: a busca usa o fallback em memória (ProjectSearch)
+        print(f"[MIGRAÇÃO] AVISO: índice de busca não criado ({e})")
+        return False
+
+    # Triggers mantêm o índice em sincronia; UPDATE só das colunas indexadas
+    # (set_active_project não reindexa)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS projects_fts_insert AFTER INSERT ON projects BEGIN
+            INSERT INTO projects_fts (rowid, name, folder_path, urls, custom_commands)
+            VALUES (new.id, new.name, new.folder_path, new.urls, new.custom_commands);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS projects_fts_delete AFTER DELETE ON projects BEGIN
+            INSERT INTO projects_fts (projects_fts, rowid, name, folder_path, urls, custom_commands)
+            VALUES ('delete', old.id, old.name, old.folder_path, old.urls, old.custom_commands);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS projects_fts_update
+        AFTER UPDATE OF name, folder_path, urls, custom_commands ON projects BEGIN
+            INSERT INTO projects_fts (projects_fts, rowid, name, folder_path, urls, custom_commands)
+            VALUES ('delete', old.id, old.name, old.folder_path, old.urls, old.custom_commands);
+            INSERT INTO projects_fts (rowid, name, folder_path, urls, custom_commands)
+            VALUES (new.id, new.name, new.folder_path, new.urls, new.custom_commands);
+        END
+    """)
+    conn.execute("INSERT INTO projects_fts (projects_fts) VALUES ('rebuild')")
+    return True
+
+
+def _migration_launch_events(conn: sqlite3.Connection):
+    """tabela launch_events (telemetria de abertura)"""
+    # Uma linha por etapa medida (switch_project, open_project, open_app, window, hotkey)
+    # run_id agrupa as etapas de uma mesma operação
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS launch_events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            run_id TEXT,
+            step TEXT NOT NULL,
+            project_id INTEGER,
+            app TEXT,
+            workspace_id INTEGER,
+            started_at REAL NOT NULL,
+            ended_at REAL NOT NULL,
+            duration_ms REAL NOT NULL,
+            outcome TEXT NOT NULL DEFAULT 'ok',
+            ram_delta_mb REAL
+        )
+    """)
+    # Percentis por app/projeto: leitura só do índice, já ordenada por duração
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_launch_events_app
+        ON launch_events (step, app, duration_ms)
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_launch_events_project
+        ON launch_events (step, project_id, duration_ms)
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_launch_events_started ON launch_events (started_at)")
+
+
+def _migration_search_index_retry(conn: sqlite3.Connection):
+    """índice de busca (projects_fts) em bancos migrados sem FTS5"""
+    # A migração 004 passava mesmo sem FTS5 no SQLite: criar o índice agora
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'projects_fts'"
+    ).fetchone()
+    if exists is None:
+        _create_search_index(conn)
+
+
+MIGRATIONS = [
+    _migration_initial_schema,
+    _migration_workspace_hotkeys,
+    _migration_project_workspaces,
+    _migration_project_search,
+    _migration_launch_events,
+    _migration_search_index_retry,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
 
 
 class Database:
+    """
+    Acesso ao projects.db
+
+    Cada thread usa uma única conexão de longa duração (thread-local), em modo
+    WAL com synchronous=NORMAL. O sqlite3 guarda os statements preparados por
+    conexão (cached_statements), então manter a conexão aberta evita reabrir
+    o arquivo e recompilar o SQL a cada chamada.
+
+    Escritas com mais de um statement usam transaction() (um único commit).
+    """
+
+    CACHED_STATEMENTS = 256
+
     def __init__(self, db_path: str = "projects.db"):
         # Se path relativo, usar diretório data/
         if not Path(db_path).is_absolute():
@@ -19,93 +229,164 @@ class Database:
             self.db_path = str(project_root / "data" / db_path)
         else:
             self.db_path = db_path
-        self.init_database()
-        self.migrate_add_hotkeys()  # Migração: adicionar colunas de hotkeys
-
-    def init_database(self):
-        """Inicializa o banco de dados e cria tabelas"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS projects (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT UNIQUE NOT NULL,
-                folder_path TEXT NOT NULL,
-                zen_container TEXT,
-                workspace_1_app TEXT,
-                workspace_2_app TEXT,
-                workspace_3_app TEXT,
-                custom_commands TEXT,
-                urls TEXT,
-                last_opened TIMESTAMP,
-                is_active BOOLEAN DEFAULT 0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+
+        self.migrate()
+
+    def migrate(self) -> int:
+        """
+        Aplica as migrações pendentes (PRAGMA user_version = nº de migrações aplicadas)
+
+        Com o banco atualizado custa uma leitura de pragma. As migrações
+        pendentes rodam em uma única transação: se uma falhar, nada é aplicado.
+
+        Returns:
+            Versão do schema após a migração
+        """
+        conn = self.get_connection()
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            return version
+
+        with self.transaction() as conn:
+            # Reler dentro da transação (outro processo pode ter migrado antes)
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            for number, step in enumerate(MIGRATIONS[version:], start=version + 1):
+                step(conn)
+                print(f"[MIGRAÇÃO] {number:03d} {step.__doc__.strip()}")
+            conn.execute(f"PRAGMA user_version = {max(version, SCHEMA_VERSION)}")
+        return max(version, SCHEMA_VERSION)
+
+    # ===== Conexão =====
+
+    def get_connection(self) -> sqlite3.Connection:
+        """Retorna a conexão da thread atual (aberta uma vez e reutilizada)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # isolation_level=None: autocommit; transações explícitas via transaction()
+            conn = sqlite3.connect(
+                self.db_path,
+                isolation_level=None,
+                check_same_thread=False,
+                cached_statements=self.CACHED_STATEMENTS,
             )
-        """)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+
+            self._local.conn = conn
+            self._local.depth = 0
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
 
-        conn.commit()
-        conn.close()
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Agrupa vários statements em uma transação (um único commit)
+
+        Transações aninhadas viram SAVEPOINTs: um erro interno desfaz só a
+        parte interna se a exceção for tratada por quem chamou.
 
-    def migrate_add_hotkeys(self):
-        """Migração: adiciona colunas de hotkeys se não existirem"""
+        Uso:
+            with db.transaction() as conn:
+                conn.execute("UPDATE ...")
+                conn.execute("UPDATE ...")
+        """
         conn = self.get_connection()
-        cursor = conn.cursor()
+        depth = self._local.depth
+        savepoint = f"sp_{depth}"
 
+        conn.execute("BEGIN IMMEDIATE" if depth == 0 else f"SAVEPOINT {savepoint}")
+        self._local.depth = depth + 1
         try:
-            # Verifica se colunas já existem
-            cursor.execute("PRAGMA table_info(projects)")
-            columns = [col[1] for col in cursor.fetchall()]
-
-            # Adiciona colunas se não existirem
-            for ws_num in [1, 2, 3]:
-                col_name = f"workspace_{ws_num}_hotkey"
-                if col_name not in columns:
-                    cursor.execute(f"ALTER TABLE projects ADD COLUMN {col_name} TEXT DEFAULT ''")
-                    print(f"[MIGRAÇÃO] Coluna '{col_name}' adicionada ao banco")
-
-            conn.commit()
-        except Exception as e:
-            print(f"Erro na migração de hotkeys: {e}")
+            yield conn
+        except BaseException:
+            if depth == 0:
+                conn.execute("ROLLBACK")
+            else:
+                conn.execute(f"ROLLBACK TO {savepoint}")
+                conn.execute(f"RELEASE {savepoint}")
+            raise
+        else:
+            conn.execute("COMMIT" if depth == 0 else f"RELEASE {savepoint}")
         finally:
-            conn.close()
-
-    def get_connection(self):
-        """Retorna uma conexao com o banco"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+            self._local.depth = depth
+
+    def close(self):
+        """Fecha todas as conexões abertas (de todas as threads)"""
+        with self._connections_lock:
+            for conn in self._connections:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._connections.clear()
+        self._local = threading.local()
+
+    @staticmethod
+    def _decode_project(row: sqlite3.Row, layout: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """
+        Converte a linha em dict (JSON strings de volta para objetos)
+
+        O layout vem de project_workspaces ("workspaces"). As chaves antigas
+        workspace_N_app/hotkey são geradas a partir dele (as colunas de mesmo
+        nome em projects não são mais atualizadas).
+        """
+        project = dict(row)
+        if project.get("custom_commands"):
+            project["custom_commands"] = json.loads(project["custom_commands"])
+        if project.get("urls"):
+            project["urls"] = json.loads(project["urls"])
+
+        layout = layout or []
+        project["workspaces"] = layout
+        for ws_num in [1, 2, 3]:
+            project[f"workspace_{ws_num}_app"] = ""
+            project[f"workspace_{ws_num}_hotkey"] = ""
+        for entry in layout:
+            project[f"workspace_{entry['workspace_id']}_app"] = entry["app"]
+            project[f"workspace_{entry['workspace_id']}_hotkey"] = entry["hotkey"]
+        return project
+
+    @staticmethod
+    def _decode_workspace(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            "workspace_id": row["workspace_id"],
+            "app": row["app"],
+            "hotkey": row["hotkey"],
+            "args": json.loads(row["args"]) if row["args"] else [],
+            "sort_order": row["sort_order"],
+        }
+
+    # ===== Projetos =====
 
     def create_project(self, name: str, folder_path: str, **kwargs) -> Optional[int]:
-        """Cria um novo projeto"""
-        try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
+        """
+        Cria um novo projeto
 
+        Layout: workspaces=[{"workspace_id", "app", "hotkey", "args"}, ...]
+        ou as chaves antigas workspace_N_app / workspace_N_hotkey.
+        """
+        try:
             # Preparar dados opcionais
             zen_container = kwargs.get("zen_container", "")
-            workspace_1_app = kwargs.get("workspace_1_app", "")
-            workspace_2_app = kwargs.get("workspace_2_app", "")
-            workspace_3_app = kwargs.get("workspace_3_app", "")
-            workspace_1_hotkey = kwargs.get("workspace_1_hotkey", "")
-            workspace_2_hotkey = kwargs.get("workspace_2_hotkey", "")
-            workspace_3_hotkey = kwargs.get("workspace_3_hotkey", "")
             custom_commands = json.dumps(kwargs.get("custom_commands", {}))
             urls = json.dumps(kwargs.get("urls", []))
 
-            cursor.execute("""
-                INSERT INTO projects
-                (name, folder_path, zen_container, workspace_1_app,
-                 workspace_2_app, workspace_3_app, workspace_1_hotkey,
-                 workspace_2_hotkey, workspace_3_hotkey, custom_commands, urls)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (name, folder_path, zen_container, workspace_1_app,
-                  workspace_2_app, workspace_3_app, workspace_1_hotkey,
-                  workspace_2_hotkey, workspace_3_hotkey, custom_commands, urls))
+            with self.transaction() as conn:
+                cursor = conn.execute("""
+                    INSERT INTO projects (name, folder_path, zen_container, custom_commands, urls)
+                    VALUES (?, ?, ?, ?, ?)
+                """, (name, folder_path, zen_container, custom_commands, urls))
+                project_id = cursor.lastrowid
 
-            project_id = cursor.lastrowid
-            conn.commit()
-            conn.close()
+                self._write_layout(conn, project_id, kwargs.get("workspaces", []))
+                self._write_workspace_fields(conn, project_id, kwargs)
 
             return project_id
         except sqlite3.IntegrityError:
@@ -118,75 +399,70 @@ class Database:
     def get_all_projects(self) -> List[Dict[str, Any]]:
         """Retorna todos os projetos"""
         conn = self.get_connection()
-        cursor = conn.cursor()
+        rows = conn.execute(
+            "SELECT * FROM projects ORDER BY last_opened DESC, name ASC"
+        ).fetchall()
 
-        cursor.execute("SELECT * FROM projects ORDER BY last_opened DESC, name ASC")
-        rows = cursor.fetchall()
-        conn.close()
+        # Layouts de todos os projetos em uma consulta (sem N+1)
+        layouts: Dict[int, List[Dict[str, Any]]] = {}
+        for ws_row in conn.execute(
+            "SELECT * FROM project_workspaces ORDER BY project_id, sort_order, workspace_id"
+        ).fetchall():
+            layouts.setdefault(ws_row["project_id"], []).append(self._decode_workspace(ws_row))
 
-        projects = []
-        for row in rows:
-            project = dict(row)
-            # Converter JSON strings de volta para objetos
-            if project.get("custom_commands"):
-                project["custom_commands"] = json.loads(project["custom_commands"])
-            if project.get("urls"):
-                project["urls"] = json.loads(project["urls"])
-            projects.append(project)
-
-        return projects
+        return [self._decode_project(row, layouts.get(row["id"])) for row in rows]
 
     def get_project_by_id(self, project_id: int) -> Optional[Dict[str, Any]]:
         """Retorna um projeto pelo ID"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT * FROM projects WHERE id = ?", (project_id,))
-        row = cursor.fetchone()
-        conn.close()
-
-        if row:
-            project = dict(row)
-            if project.get("custom_commands"):
-                project["custom_commands"] = json.loads(project["custom_commands"])
-            if project.get("urls"):
-                project["urls"] = json.loads(project["urls"])
-            return project
-
-        return None
+        row = self.get_connection().execute(
+            "SELECT * FROM projects WHERE id = ?", (project_id,)
+        ).fetchone()
+        return self._decode_project(row, self.get_project_layout(project_id)) if row else None
 
     def get_active_project(self) -> Optional[Dict[str, Any]]:
         """Retorna o projeto ativo atual"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT * FROM projects WHERE is_active = 1 LIMIT 1")
-        row = cursor.fetchone()
-        conn.close()
-
-        if row:
-            project = dict(row)
-            if project.get("custom_commands"):
-                project["custom_commands"] = json.loads(project["custom_commands"])
-            if project.get("urls"):
-                project["urls"] = json.loads(project["urls"])
-            return project
-
-        return None
+        row = self.get_connection().execute(
+            "SELECT * FROM projects WHERE is_active = 1 LIMIT 1"
+        ).fetchone()
+        return self._decode_project(row, self.get_project_layout(row["id"])) if row else None
+
+    def get_project_layout(self, project_id: int) -> List[Dict[str, Any]]:
+        """
+        Layout do projeto (uma consulta indexada)
+
+        Returns:
+            [{"workspace_id", "app", "hotkey", "args", "sort_order"}, ...] em ordem de abertura
+        """
+        rows = self.get_connection().execute(
+            "SELECT * FROM project_workspaces WHERE project_id = ? ORDER BY sort_order, workspace_id",
+            (project_id,)
+        ).fetchall()
+        return [self._decode_workspace(row) for row in rows]
+
+    def set_project_layout(self, project_id: int, workspaces: List[Dict[str, Any]]) -> bool:
+        """Substitui o layout inteiro do projeto"""
+        try:
+            with self.transaction() as conn:
+                conn.execute("DELETE FROM project_workspaces WHERE project_id = ?", (project_id,))
+                self._write_layout(conn, project_id, workspaces)
+            return True
+        except Exception as e:
+            print(f"Erro ao salvar layout do projeto: {e}")
+            return False
 
     def update_project(self, project_id: int, **kwargs) -> bool:
-        """Atualiza um projeto"""
-        try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
+        """
+        Atualiza um projeto
 
+        workspaces=[...] substitui o layout; workspace_N_app / workspace_N_hotkey
+        alteram só o workspace N (app vazio remove o workspace do layout).
+        """
+        try:
             # Campos atualizaveis
             updates = []
             values = []
 
-            for field in ["name", "folder_path", "zen_container",
-                         "workspace_1_app", "workspace_2_app", "workspace_3_app",
-                         "workspace_1_hotkey", "workspace_2_hotkey", "workspace_3_hotkey"]:
+            for field in ["name", "folder_path", "zen_container"]:
                 if field in kwargs:
                     updates.append(f"{field} = ?")
                     values.append(kwargs[field])
@@ -199,16 +475,18 @@ class Database:
                 updates.append("urls = ?")
                 values.append(json.dumps(kwargs["urls"]))
 
-            if not updates:
+            workspace_fields = self._parse_workspace_fields(kwargs)
+            if not updates and not workspace_fields and "workspaces" not in kwargs:
                 return False
 
-            values.append(project_id)
-            query = f"UPDATE projects SET {', '.join(updates)} WHERE id = ?"
-
-            cursor.execute(query, values)
-            conn.commit()
-            conn.close()
-
+            with self.transaction() as conn:
+                if updates:
+                    values.append(project_id)
+                    conn.execute(f"UPDATE projects SET {', '.join(updates)} WHERE id = ?", values)
+                if "workspaces" in kwargs:
+                    conn.execute("DELETE FROM project_workspaces WHERE project_id = ?", (project_id,))
+                    self._write_layout(conn, project_id, kwargs["workspaces"])
+                self._write_workspace_fields(conn, project_id, kwargs)
             return True
         except Exception as e:
             print(f"Erro ao atualizar projeto: {e}")
@@ -217,57 +495,275 @@ class Database:
     def delete_project(self, project_id: int) -> bool:
         """Deleta um projeto"""
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-
-            cursor.execute("DELETE FROM projects WHERE id = ?", (project_id,))
-            conn.commit()
-            conn.close()
-
+            with self.transaction() as conn:
+                conn.execute("DELETE FROM projects WHERE id = ?", (project_id,))
+                conn.execute("DELETE FROM project_workspaces WHERE project_id = ?", (project_id,))
+                conn.execute("DELETE FROM project_processes WHERE project_id = ?", (project_id,))
             return True
         except Exception as e:
             print(f"Erro ao deletar projeto: {e}")
             return False
 
+    def _write_layout(self, conn: sqlite3.Connection, project_id: int, workspaces: List[Dict[str, Any]]):
+        """Insere as entradas do layout (entradas sem app são ignoradas)"""
+        rows = []
+        for index, entry in enumerate(workspaces):
+            app = (entry.get("app") or "").strip()
+            if not app:
+                continue
+            rows.append((
+                project_id,
+                int(entry["workspace_id"]),
+                app,
+                entry.get("hotkey") or "",
+                json.dumps(list(entry.get("args") or [])),
+                entry.get("sort_order", index),
+            ))
+        conn.executemany("""
+            INSERT OR REPLACE INTO project_workspaces (project_id, workspace_id, app, hotkey, args, sort_order)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, rows)
+
+    @staticmethod
+    def _parse_workspace_fields(kwargs: Dict[str, Any]) -> Dict[int, Dict[str, str]]:
+        """Chaves antigas workspace_N_app / workspace_N_hotkey → {N: {"app", "hotkey"}}"""
+        fields: Dict[int, Dict[str, str]] = {}
+        for key, value in kwargs.items():
+            match = re.fullmatch(r"workspace_(\d+)_(app|hotkey)", key)
+            if match:
+                fields.setdefault(int(match.group(1)), {})[match.group(2)] = value or ""
+        return fields
+
+    def _write_workspace_fields(self, conn: sqlite3.Connection, project_id: int, kwargs: Dict[str, Any]):
+        """Aplica as chaves antigas workspace_N_app / workspace_N_hotkey no layout"""
+        for ws_num, fields in sorted(self._parse_workspace_fields(kwargs).items()):
+            if "app" not in fields:
+                conn.execute(
+                    "UPDATE project_workspaces SET hotkey = ? WHERE project_id = ? AND workspace_id = ?",
+                    (fields["hotkey"], project_id, ws_num)
+                )
+            elif not fields["app"].strip():
+                conn.execute(
+                    "DELETE FROM project_workspaces WHERE project_id = ? AND workspace_id = ?",
+                    (project_id, ws_num)
+                )
+            else:
+                conn.execute("""
+                    INSERT INTO project_workspaces (project_id, workspace_id, app, hotkey, sort_order)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT (project_id, workspace_id) DO UPDATE SET
+                        app = excluded.app,
+                        hotkey = CASE WHEN ? THEN excluded.hotkey ELSE hotkey END
+                """, (project_id, ws_num, fields["app"].strip(), fields.get("hotkey", ""), ws_num,
+                      "hotkey" in fields))
+
     def set_active_project(self, project_id: int) -> bool:
         """Define um projeto como ativo (e desativa todos os outros)"""
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
+            with self.transaction() as conn:
+                # Desativar o projeto ativo (só as linhas que mudam)
+                conn.execute("UPDATE projects SET is_active = 0 WHERE is_active = 1 AND id != ?", (project_id,))
+
+                # Ativar o projeto especificado (launch_count alimenta o ranking da busca)
+                conn.execute(
+                    "UPDATE projects SET is_active = 1, last_opened = ?, launch_count = launch_count + 1 WHERE id = ?",
+                    (datetime.now().isoformat(), project_id)
+                )
+            return True
+        except Exception as e:
+            print(f"Erro ao definir projeto ativo: {e}")
+            return False
+
+    def deactivate_all_projects(self) -> bool:
+        """Desativa todos os projetos"""
+        try:
+            self.get_connection().execute("UPDATE projects SET is_active = 0 WHERE is_active = 1")
+            return True
+        except Exception as e:
+            print(f"Erro ao desativar projetos: {e}")
+            return False
 
-            # Desativar todos os projetos
-            cursor.execute("UPDATE projects SET is_active = 0")
+    # ===== Busca =====
 
-            # Ativar o projeto especificado
-            cursor.execute(
-                "UPDATE projects SET is_active = 1, last_opened = ? WHERE id = ?",
-                (datetime.now().isoformat(), project_id)
-            )
+    def has_search_index(self) -> bool:
+        """True se o índice FTS5 (projects_fts) existe"""
+        row = self.get_connection().execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'projects_fts'"
+        ).fetchone()
+        return row is not None
+
+    def search_projects(self, query: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Busca textual (FTS5) em nome, pasta, URLs e comandos
 
-            conn.commit()
-            conn.close()
+        Cada palavra da consulta vira um prefixo ("ube" encontra "uberti").
+        O nome pesa mais que a pasta, que pesa mais que URLs/comandos.
 
+        Returns:
+            [{"id", "rank"}, ...] do mais relevante ao menos relevante (rank bm25: menor = melhor)
+        """
+        terms = re.findall(r"\w+", query)
+        if not terms:
+            return []
+        match = " ".join(f'"{term}"*' for term in terms)
+
+        try:
+            rows = self.get_connection().execute("""
+                SELECT rowid AS id, bm25(projects_fts, 10.0, 4.0, 1.0, 1.0) AS rank
+                FROM projects_fts
+                WHERE projects_fts MATCH ?
+                ORDER BY rank
+                LIMIT ?
+            """, (match, limit)).fetchall()
+        except sqlite3.OperationalError as e:
+            print(f"Erro na busca de projetos: {e}")
+            return []
+        return [dict(row) for row in rows]
+
+    # ===== Processos dos projetos =====
+
+    def add_project_processes(self, project_id: int, processes: List[Dict[str, Any]]) -> bool:
+        """
+        Registra processos como pertencentes a um projeto
+
+        Args:
+            processes: [{"pid", "root_pid", "app", "address", "create_time"}, ...]
+        """
+        try:
+            with self.transaction() as conn:
+                conn.executemany("""
+                    INSERT OR REPLACE INTO project_processes
+                    (project_id, pid, root_pid, app, address, create_time)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, [
+                    (project_id, p["pid"], p["root_pid"], p.get("app", ""), p.get("address", ""), p["create_time"])
+                    for p in processes
+                ])
             return True
         except Exception as e:
-            print(f"Erro ao definir projeto ativo: {e}")
+            print(f"Erro ao registrar processos do projeto: {e}")
             return False
 
-    def deactivate_all_projects(self) -> bool:
-        """Desativa todos os projetos"""
+    def get_project_processes(self, project_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Retorna os processos registrados (de um projeto ou de todos)"""
+        conn = self.get_connection()
+
+        if project_id is None:
+            rows = conn.execute("SELECT * FROM project_processes ORDER BY project_id, root_pid, pid").fetchall()
+        else:
+            rows = conn.execute(
+                "SELECT * FROM project_processes WHERE project_id = ? ORDER BY root_pid, pid",
+                (project_id,)
+            ).fetchall()
+
+        return [dict(row) for row in rows]
+
+    def remove_project_processes(self, pids: List[int], project_id: Optional[int] = None) -> bool:
+        """Remove processos do registro (de um projeto ou de todos)"""
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
+            with self.transaction() as conn:
+                if project_id is None:
+                    conn.executemany("DELETE FROM project_processes WHERE pid = ?", [(pid,) for pid in pids])
+                else:
+                    conn.executemany(
+                        "DELETE FROM project_processes WHERE project_id = ? AND pid = ?",
+                        [(project_id, pid) for pid in pids]
+                    )
+            return True
+        except Exception as e:
+            print(f"Erro ao remover processos do projeto: {e}")
+            return False
 
-            cursor.execute("UPDATE projects SET is_active = 0")
+    # ===== Telemetria de abertura =====
 
-            conn.commit()
-            conn.close()
+    LAUNCH_EVENT_COLUMNS = ("run_id", "step", "project_id", "app", "workspace_id",
+                            "started_at", "ended_at", "duration_ms", "outcome", "ram_delta_mb")
 
+    def add_launch_events(self, events: List[Dict[str, Any]]) -> bool:
+        """Grava eventos de telemetria (uma transação para o lote)"""
+        try:
+            with self.transaction() as conn:
+                conn.executemany(f"""
+                    INSERT INTO launch_events ({', '.join(self.LAUNCH_EVENT_COLUMNS)})
+                    VALUES ({', '.join('?' * len(self.LAUNCH_EVENT_COLUMNS))})
+                """, [tuple(event.get(column) for column in self.LAUNCH_EVENT_COLUMNS) for event in events])
             return True
         except Exception as e:
-            print(f"Erro ao desativar projetos: {e}")
+            print(f"Erro ao gravar telemetria: {e}")
             return False
 
+    def get_launch_durations(self, step: str, group_by: str = "app", since: Optional[float] = None,
+                             outcome: Optional[str] = "ok") -> List[tuple]:
+        """
+        Durações de uma etapa agrupadas por app ou projeto
+
+        Args:
+            group_by: "app" ou "project_id"
+            since: Só eventos iniciados depois deste timestamp (epoch)
+            outcome: Só eventos com este resultado (None = todos)
+
+        Returns:
+            [(app ou project_id, duration_ms), ...] ordenado por grupo e duração
+        """
+        if group_by not in ("app", "project_id"):
+            raise ValueError(f"group_by inválido: {group_by}")
+
+        query = f"SELECT {group_by}, duration_ms FROM launch_events WHERE step = ? AND {group_by} IS NOT NULL"
+        params: List[Any] = [step]
+        if since is not None:
+            query += " AND started_at >= ?"
+            params.append(since)
+        if outcome is not None:
+            query += " AND outcome = ?"
+            params.append(outcome)
+        query += f" ORDER BY {group_by}, duration_ms"
+
+        return [tuple(row) for row in self.get_connection().execute(query, params).fetchall()]
+
+
+def _benchmark(iterations: int = 2000):
+    """Compara a conexão persistente com o comportamento antigo (connect por chamada)"""
+    import os
+    import tempfile
+    import time
+
+    path = os.path.join(tempfile.mkdtemp(), "benchmark.db")
+    db = Database(path)
+    ids = [db.create_project(f"Projeto {i}", f"/tmp/p{i}", workspace_1_app="zed") for i in range(20)]
+
+    def old_get_project_by_id(project_id):
+        conn = sqlite3.connect(path)
+        conn.row_factory = sqlite3.Row
+        row = conn.execute("SELECT * FROM projects WHERE id = ?", (project_id,)).fetchone()
+        conn.close()
+        return Database._decode_project(row)
+
+    def old_set_active_project(project_id):
+        conn = sqlite3.connect(path)
+        conn.execute("UPDATE projects SET is_active = 0")
+        conn.execute(
+            "UPDATE projects SET is_active = 1, last_opened = ? WHERE id = ?",
+            (datetime.now().isoformat(), project_id)
+        )
+        conn.commit()
+        conn.close()
+
+    cases = [
+        ("get_project_by_id", old_get_project_by_id, db.get_project_by_id),
+        ("set_active_project", old_set_active_project, db.set_active_project),
+    ]
+    print(f"=== Benchmark ({iterations} chamadas, latência média) ===")
+    for name, old, new in cases:
+        results = []
+        for func in (old, new):
+            start = time.perf_counter()
+            for i in range(iterations):
+                func(ids[i % len(ids)])
+            results.append((time.perf_counter() - start) / iterations * 1e6)
+        print(f"  {name:<20} antes: {results[0]:8.1f}µs   agora: {results[1]:8.1f}µs   ({results[0] / results[1]:.1f}x)")
+
+    db.close()
+
 
 # Teste basico
 if __name__ == "__main__":
@@ -291,3 +787,5 @@ if __name__ == "__main__":
     print(f"Total de projetos: {len(projects)}")
     for p in projects:
         print(f"  - {p['name']} ({p['folder_path']})")
+
+    _benchmark()
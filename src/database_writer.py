@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Database Writer - Thread única de escrita no SQLite
+Callbacks da UI enfileiram a escrita e seguem; o commit acontece fora da thread de render
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Tuple
+
+from database import Database
+
+
+class DatabaseWriter:
+    """
+    Serializa as escritas do banco em uma thread, agrupando-as em transações
+
+    Cada submit() devolve um Future com o retorno do método do Database.
+    As escritas que estiverem na fila viram um lote: uma transação só (um
+    commit), com cada escrita em um SAVEPOINT próprio, então um erro desfaz
+    apenas a escrita que falhou. Os Futures são resolvidos depois do commit,
+    e os callbacks deles (add_done_callback) rodam na thread de escrita.
+
+    A fila é limitada (MAX_QUEUE): se o disco não der conta, submit() bloqueia
+    em vez de acumular memória sem limite.
+    Sem start() (ex: scripts), submit() grava na hora, na thread de quem chamou.
+
+    Uso:
+        writer = DatabaseWriter(db)
+        writer.start()
+        future = writer.submit(db.set_active_project, project_id)
+        future.add_done_callback(lambda f: print(f.result()))
+        writer.stop()  # Grava o que ainda está na fila
+    """
+
+    MAX_QUEUE = 1000
+    BATCH_SIZE = 64
+
+    def __init__(self, db: Database, max_queue: int = MAX_QUEUE):
+        self.db = db
+        self._queue: "queue.Queue[Optional[Tuple[Future, Callable, tuple, dict]]]" = queue.Queue(max_queue)
+        self._thread = None
+        self._running = False
+        self.batches = 0  # Transações gravadas
+        self.writes = 0  # Escritas gravadas
+
+    # ===== Ciclo de vida =====
+
+    def start(self):
+        """Inicia a thread de escrita"""
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Grava o que está na fila e para a thread"""
+        if not self._running:
+            return
+        self._running = False
+        self._queue.put(None)
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Espera a fila esvaziar (True se esvaziou dentro do timeout)"""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.001)
+        return True
+
+    @property
+    def pending(self) -> int:
+        """Escritas na fila ainda não gravadas"""
+        return self._queue.unfinished_tasks
+
+    # ===== Escrita =====
+
+    def submit(self, func: Callable[..., Any], *args, **kwargs) -> Future:
+        """
+        Enfileira uma escrita (ex: submit(db.update_project, 3, name="X"))
+
+        Returns:
+            Future com o retorno de func (ou a exceção que ela levantou)
+        """
+        future: Future = Future()
+        if not self._running or threading.current_thread() is self._thread:
+            # Sem thread (ou chamado de um callback dela): gravar na hora
+            self._execute([(future, func, args, kwargs)])
+            return future
+        self._queue.put((future, func, args, kwargs))
+        return future
+
+    # ===== Internos =====
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()] + self._drain()
+            items = [item for item in batch if item is not None]
+            if items:
+                self._execute(items)
+            for _ in batch:
+                self._queue.task_done()
+            if not self._running and self._queue.empty():
+                break
+
+    def _drain(self) -> List[Optional[Tuple[Future, Callable, tuple, dict]]]:
+        """Pega o que já está na fila (até BATCH_SIZE) sem esperar"""
+        batch = []
+        while len(batch) < self.BATCH_SIZE:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _execute(self, items: List[Tuple[Future, Callable, tuple, dict]]):
+        """Grava o lote em uma transação e resolve os Futures após o commit"""
+        outcomes = []
+        try:
+            with self.db.transaction():
+                for future, func, args, kwargs in items:
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    try:
+                        with self.db.transaction():  # SAVEPOINT: um erro desfaz só esta escrita
+                            outcomes.append((future, func(*args, **kwargs), None))
+                    except Exception as e:
+                        outcomes.append((future, None, e))
+        except Exception as e:
+            # BEGIN ou COMMIT falhou: nada do lote foi gravado, inclusive as escritas não alcançadas
+            print(f"Erro ao gravar lote no banco ({len(items)} escrita(s)): {e}")
+            conn = self.db.get_connection()
+            if conn.in_transaction:
+                try:
+                    conn.execute("ROLLBACK")  # COMMIT falho deixa a transação aberta
+                except Exception:
+                    pass
+            for future, _, _, _ in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.writes += len(outcomes)
+        for future, result, error in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+
+# Teste basico
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    db = Database(os.path.join(tempfile.mkdtemp(), "writer_test.db"))
+    ids = [db.create_project(f"Projeto {i}", f"/tmp/p{i}") for i in range(50)]
+    iterations = 500
+
+    # Escrita síncrona (como um callback da UI fazia): cada chamada espera o commit
+    start = time.perf_counter()
+    for i in range(iterations):
+        db.set_active_project(ids[i % len(ids)])
+    sync_us = (time.perf_counter() - start) / iterations * 1e6
+    print(f"db.set_active_project (síncrono):    {sync_us:8.1f}µs na thread que chamou")
+
+    writer = DatabaseWriter(db)
+    writer.start()
+    start = time.perf_counter()
+    futures = [writer.submit(db.set_active_project, ids[i % len(ids)]) for i in range(iterations)]
+    submit_us = (time.perf_counter() - start) / iterations * 1e6
+    writer.flush()
+    total_ms = (time.perf_counter() - start) * 1000
+    print(f"writer.submit (thread de escrita):   {submit_us:8.1f}µs na thread que chamou")
+    print(f"  {writer.writes} escritas em {writer.batches} transação(ões), {total_ms:.0f}ms até gravar tudo")
+    assert all(f.result() for f in futures)
+
+    # Erro em uma escrita não desfaz as outras do lote
+    failing = writer.submit(lambda: db.get_connection().execute("INSERT INTO tabela_inexistente VALUES (1)"))
+    renamed = writer.submit(db.update_project, ids[0], name="Renomeado")
+    writer.flush()
+    print(f"Escrita com erro: {type(failing.exception()).__name__}; seguinte gravou: {renamed.result()} "
+          f"({db.get_project_by_id(ids[0])['name']})")
+    writer.stop()
+
+    # BEGIN falha (banco travado por outro processo): todo o lote é resolvido com o erro
+    import sqlite3
+    locker = sqlite3.connect(db.db_path, isolation_level=None)
+    locker.execute("BEGIN IMMEDIATE")
+    db.get_connection().execute("PRAGMA busy_timeout=50")
+    items = [(Future(), db.update_project, (project_id,), {"name": "Travado"}) for project_id in ids[:3]]
+    writer._execute(items)
+    locker.execute("ROLLBACK")
+    errors = [type(future.exception(timeout=0)).__name__ for future, _, _, _ in items]
+    assert all(future.done() for future, _, _, _ in items)
+    print(f"BEGIN falhou: {len(items)} Futures resolvidos ({', '.join(errors)}); "
+          f"transação aberta: {db.get_connection().in_transaction}")
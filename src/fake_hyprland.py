@@ -0,0 +1,460 @@
+#!/usr/bin/env python3
+"""
+Fake Hyprland - Servidor local que imita o socket IPC do Hyprland
+Permite testar e medir o HyprlandIPC (e os managers) sem Hyprland rodando
+"""
+
+import os
+import json
+import socket
+import tempfile
+import threading
+from pathlib import Path
+from typing import List, Dict, Optional, Any
+
+from hyprland_ipc import HyprlandIPC
+
+
+class FakeHyprlandServer:
+    """
+    Servidor fake do .socket.sock/.socket2.sock do Hyprland
+
+    Mantém uma lista de janelas em memória, responde aos mesmos comandos
+    usados pelo Arquiteto (j/clients, j/workspaces, dispatch ...) e publica
+    os eventos correspondentes (openwindow, movewindowv2, ...) no socket2.
+
+    Layout em disco igual ao real:
+        <runtime_dir>/hypr/<signature>/.socket.sock
+        <runtime_dir>/hypr/<signature>/.socket2.sock
+    """
+
+    def __init__(self, runtime_dir: Optional[str] = None, signature: str = "arquiteto_fake"):
+        """
+        Args:
+            runtime_dir: Diretório que faz o papel de $XDG_RUNTIME_DIR.
+                         Se None, usa um diretório temporário
+            signature: Valor que faz o papel de $HYPRLAND_INSTANCE_SIGNATURE
+        """
+        self._tmp_dir = None
+        if runtime_dir is None:
+            self._tmp_dir = tempfile.TemporaryDirectory(prefix="arquiteto_hypr_")
+            runtime_dir = self._tmp_dir.name
+
+        self.runtime_dir = Path(runtime_dir)
+        self.signature = signature
+        self.socket_dir = self.runtime_dir / "hypr" / signature
+
+        # Estado simulado
+        self.clients: Dict[str, Dict[str, Any]] = {}  # {address: client}
+        self.active_workspace_id = 1
+        self.active_address = ""
+        self.dispatched: List[str] = []  # Histórico de dispatches recebidos
+        self.request_count = 0
+
+        # "dispatch exec": binário → class da janela criada após exec_delay segundos
+        self.exec_windows: Dict[str, str] = {}
+        self.exec_delay = 0.05
+
+        self._special_ids: Dict[str, int] = {}
+        self._next_address = 0x55A0_0000
+        self._next_pid = 50000
+        self._lock = threading.RLock()
+        self._server = None
+        self._thread = None
+        self._event_server = None
+        self._event_thread = None
+        self._subscribers: List[socket.socket] = []
+        self._running = False
+
+    # ===== Ciclo de vida =====
+
+    def start(self):
+        """Cria o socket e começa a atender requisições em background"""
+        self.socket_dir.mkdir(parents=True, exist_ok=True)
+        socket_path = self.socket_dir / HyprlandIPC.SOCKET_NAME
+        if socket_path.exists():
+            socket_path.unlink()
+
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.bind(str(socket_path))
+        self._server.listen(16)
+        self._running = True
+
+        event_path = self.socket_dir / HyprlandIPC.EVENT_SOCKET_NAME
+        if event_path.exists():
+            event_path.unlink()
+
+        self._event_server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._event_server.bind(str(event_path))
+        self._event_server.listen(16)
+
+        self._thread = threading.Thread(target=self._serve, name="fake-hyprland", daemon=True)
+        self._thread.start()
+        self._event_thread = threading.Thread(target=self._serve_events, name="fake-hyprland-events", daemon=True)
+        self._event_thread.start()
+        return self
+
+    def stop(self):
+        """Para o servidor e remove o diretório temporário"""
+        self._running = False
+        for server in (self._server, self._event_server):
+            if server:
+                try:
+                    server.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+                server.close()
+        self._server = None
+        self._event_server = None
+
+        with self._lock:
+            for subscriber in self._subscribers:
+                subscriber.close()
+            self._subscribers.clear()
+
+        for thread in (self._thread, self._event_thread):
+            if thread:
+                thread.join(timeout=1)
+        self._thread = None
+        self._event_thread = None
+        if self._tmp_dir:
+            self._tmp_dir.cleanup()
+            self._tmp_dir = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def env(self) -> Dict[str, str]:
+        """Variáveis de ambiente que apontam hyprctl/HyprlandIPC para este servidor"""
+        return {
+            "XDG_RUNTIME_DIR": str(self.runtime_dir),
+            "HYPRLAND_INSTANCE_SIGNATURE": self.signature,
+        }
+
+    def ipc(self, timeout: float = 2.0) -> HyprlandIPC:
+        """Retorna um HyprlandIPC conectado a este servidor"""
+        return HyprlandIPC(socket_dir=str(self.socket_dir), timeout=timeout)
+
+    # ===== Manipulação do estado simulado =====
+
+    def add_client(self, window_class: str, title: str = "", workspace_id: Any = 1, pid: Optional[int] = None) -> str:
+        """
+        Adiciona uma janela fake
+
+        Returns:
+            Endereço da janela (ex: "0x55a00000")
+        """
+        with self._lock:
+            address = hex(self._next_address)
+            self._next_address += 0x10
+            if pid is None:
+                pid = self._next_pid
+                self._next_pid += 1
+
+            self.clients[address] = {
+                "address": address,
+                "mapped": True,
+                "hidden": False,
+                "at": [0, 0],
+                "size": [800, 600],
+                "workspace": self._workspace_ref(str(workspace_id)),
+                "floating": False,
+                "monitor": 0,
+                "class": window_class,
+                "title": title or window_class,
+                "initialClass": window_class,
+                "initialTitle": title or window_class,
+                "pid": pid,
+                "xwayland": False,
+                "focusHistoryID": len(self.clients),
+            }
+            ws = self.clients[address]["workspace"]
+            self.emit("openwindow", f"{address[2:]},{ws['name']},{window_class},{title or window_class}")
+            return address
+
+    def remove_client(self, address: str) -> bool:
+        """Remove uma janela fake (como se o app tivesse fechado)"""
+        with self._lock:
+            if self.clients.pop(address, None) is None:
+                return False
+            self.emit("closewindow", address[2:])
+            return True
+
+    def set_title(self, address: str, title: str):
+        """Muda o título de uma janela fake (evento windowtitlev2)"""
+        with self._lock:
+            self.clients[address]["title"] = title
+            self.emit("windowtitlev2", f"{address[2:]},{title}")
+
+    def emit(self, event: str, data: str):
+        """Publica um evento para todos os assinantes do socket2"""
+        line = f"{event}>>{data}\n".encode("utf-8")
+        with self._lock:
+            for subscriber in list(self._subscribers):
+                try:
+                    subscriber.sendall(line)
+                except OSError:
+                    self._subscribers.remove(subscriber)
+
+    def _workspace_ref(self, ws_arg: str) -> Dict[str, Any]:
+        """Converte argumento de workspace ("3", "special:arq_1") em {id, name}"""
+        ws_arg = ws_arg.strip()
+        if ws_arg.startswith("special:"):
+            if ws_arg not in self._special_ids:
+                self._special_ids[ws_arg] = -98 - len(self._special_ids)
+            return {"id": self._special_ids[ws_arg], "name": ws_arg}
+        if ws_arg.startswith("name:"):
+            ws_arg = ws_arg[len("name:"):]
+        ws_id = int(ws_arg)
+        return {"id": ws_id, "name": str(ws_id)}
+
+    # ===== Servidor =====
+
+    def _serve(self):
+        while self._running:
+            try:
+                conn, _ = self._server.accept()
+            except OSError:
+                break
+
+            with conn:
+                try:
+                    request = self._read_request(conn)
+                    reply = self.handle_request(request)
+                    conn.sendall(reply.encode("utf-8"))
+                except OSError:
+                    pass
+
+    def _serve_events(self):
+        while self._running:
+            try:
+                conn, _ = self._event_server.accept()
+            except OSError:
+                break
+            with self._lock:
+                self._subscribers.append(conn)
+
+    def _read_request(self, conn: socket.socket) -> str:
+        conn.settimeout(1.0)
+        chunks = [conn.recv(65536)]
+        # Drenar o que já chegou (requisições grandes, ex: [[BATCH]])
+        conn.setblocking(False)
+        try:
+            while True:
+                data = conn.recv(65536)
+                if not data:
+                    break
+                chunks.append(data)
+        except (BlockingIOError, OSError):
+            pass
+        return b"".join(chunks).decode("utf-8", errors="replace")
+
+    def handle_request(self, request: str) -> str:
+        """Processa uma requisição crua (mesmo formato enviado pelo hyprctl)"""
+        with self._lock:
+            self.request_count += 1
+
+            if request.startswith("[[BATCH]]"):
+                commands = request[len("[[BATCH]]"):].split(";")
+                return "\n\n\n".join(self._handle_single(cmd.strip()) for cmd in commands)
+
+            return self._handle_single(request)
+
+    def _handle_single(self, request: str) -> str:
+        # Separar flags ("j/clients" → flags "j", comando "clients")
+        flags = ""
+        head = request.split(" ", 1)[0]
+        if "/" in head:
+            flags, request = request.split("/", 1)
+
+        return self._handle_command(request.strip(), "j" in flags)
+
+    def _handle_command(self, command: str, as_json: bool) -> str:
+        name, _, args = command.partition(" ")
+
+        if name == "clients":
+            clients = list(self.clients.values())
+            return json.dumps(clients) if as_json else "\n".join(c["title"] for c in clients)
+
+        if name == "workspaces":
+            return json.dumps(self._list_workspaces())
+
+        if name == "activeworkspace":
+            ws_id = self.active_workspace_id
+            for ws in self._list_workspaces():
+                if ws["id"] == ws_id:
+                    return json.dumps(ws)
+            return json.dumps({"id": ws_id, "name": str(ws_id), "monitor": "FAKE-1", "windows": 0})
+
+        if name == "activewindow":
+            return json.dumps(self.clients.get(self.active_address, {}))
+
+        if name == "version":
+            return json.dumps({"branch": "fake", "commit": "arquiteto"})
+
+        if name == "dispatch":
+            return self._handle_dispatch(args)
+
+        return "unknown request"
+
+    def _handle_dispatch(self, args: str) -> str:
+        self.dispatched.append(args)
+        dispatcher, _, params = args.partition(" ")
+
+        try:
+            if dispatcher == "workspace":
+                ref = self._workspace_ref(params)
+                self.active_workspace_id = ref["id"]
+                self.emit("workspace", ref["name"])
+                self.emit("workspacev2", f"{ref['id']},{ref['name']}")
+                return "ok"
+
+            if dispatcher in ("movetoworkspace", "movetoworkspacesilent"):
+                ws_arg, _, target = params.partition(",")
+                client = self._find_client(target)
+                if client is None:
+                    return "No such window"
+                ref = self._workspace_ref(ws_arg)
+                client["workspace"] = ref
+                if dispatcher == "movetoworkspace":
+                    self.active_workspace_id = ref["id"]
+                address = client["address"][2:]
+                self.emit("movewindow", f"{address},{ref['name']}")
+                self.emit("movewindowv2", f"{address},{ref['id']},{ref['name']}")
+                return "ok"
+
+            if dispatcher == "closewindow":
+                client = self._find_client(params)
+                if client is None:
+                    return "No such window"
+                del self.clients[client["address"]]
+                self.emit("closewindow", client["address"][2:])
+                return "ok"
+
+            if dispatcher == "focuswindow":
+                client = self._find_client(params)
+                if client is None:
+                    return "No such window"
+                self.active_address = client["address"]
+                self.active_workspace_id = client["workspace"]["id"]
+                self.emit("activewindow", f"{client['class']},{client['title']}")
+                self.emit("activewindowv2", client["address"][2:])
+                return "ok"
+
+            if dispatcher == "exec":
+                self._handle_exec(params)
+                return "ok"
+        except (ValueError, KeyError) as e:
+            return f"Invalid argument: {e}"
+
+        return "Invalid dispatcher"
+
+    def _handle_exec(self, params: str):
+        """Simula o app abrindo uma janela (se o binário estiver em exec_windows)"""
+        workspace_id: Any = self.active_workspace_id
+
+        # Regras de exec: "[workspace 3 silent] comando"
+        params = params.strip()
+        if params.startswith("["):
+            rules, _, params = params[1:].partition("]")
+            for rule in rules.split(";"):
+                parts = rule.split()
+                if len(parts) >= 2 and parts[0] == "workspace":
+                    workspace_id = parts[1]
+
+        binary = os.path.basename(params.strip().split(" ", 1)[0].strip("'\""))
+        window_class = self.exec_windows.get(binary)
+        if window_class:
+            timer = threading.Timer(self.exec_delay, self.add_client, args=(window_class, binary, workspace_id))
+            timer.daemon = True
+            timer.start()
+
+    def _find_client(self, target: str) -> Optional[Dict[str, Any]]:
+        """Resolve alvo de janela ("address:0x..", "pid:123", "class")"""
+        target = target.strip()
+        if target.startswith("address:"):
+            return self.clients.get(target[len("address:"):])
+        if target.startswith("pid:"):
+            pid = int(target[len("pid:"):])
+            return next((c for c in self.clients.values() if c["pid"] == pid), None)
+        if not target:
+            return self.clients.get(self.active_address)
+        return next((c for c in self.clients.values() if target.lower() in c["class"].lower()), None)
+
+    def _list_workspaces(self) -> List[Dict[str, Any]]:
+        workspaces: Dict[int, Dict[str, Any]] = {}
+
+        # Workspace ativo sempre existe (mesmo vazio)
+        workspaces[self.active_workspace_id] = {
+            "id": self.active_workspace_id,
+            "name": str(self.active_workspace_id),
+            "monitor": "FAKE-1",
+            "windows": 0,
+            "hasfullscreen": False,
+            "lastwindow": "",
+            "lastwindowtitle": "",
+        }
+
+        for client in self.clients.values():
+            ref = client["workspace"]
+            ws = workspaces.setdefault(ref["id"], {
+                "id": ref["id"],
+                "name": ref["name"],
+                "monitor": "FAKE-1",
+                "windows": 0,
+                "hasfullscreen": False,
+                "lastwindow": "",
+                "lastwindowtitle": "",
+            })
+            ws["windows"] += 1
+            ws["lastwindow"] = client["address"]
+            ws["lastwindowtitle"] = client["title"]
+
+        return sorted(workspaces.values(), key=lambda ws: ws["id"])
+
+
+# Benchmark: HyprlandIPC vs subprocess hyprctl (ambos contra o servidor fake)
+if __name__ == "__main__":
+    import shutil
+    import subprocess
+    import time
+
+    iterations = 200
+
+    with FakeHyprlandServer() as server:
+        for i in range(20):
+            server.add_client(["zed", "ghostty", "zen"][i % 3], f"Janela {i}", workspace_id=(i % 3) + 1)
+
+        ipc = server.ipc()
+
+        print(f"=== Benchmark ({iterations} x j/clients, {len(server.clients)} janelas) ===")
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            ipc.clients()
+        ipc_ms = (time.perf_counter() - start) * 1000 / iterations
+        print(f"HyprlandIPC:  {ipc_ms:.3f} ms/chamada")
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            ipc.dispatch("workspace", "2")
+        print(f"dispatch:     {(time.perf_counter() - start) * 1000 / iterations:.3f} ms/chamada")
+
+        addresses = list(server.clients)
+        start = time.perf_counter()
+        for _ in range(iterations):
+            ipc.batch([f"dispatch movetoworkspacesilent 5,address:{a}" for a in addresses])
+        print(f"batch ({len(addresses)}):   {(time.perf_counter() - start) * 1000 / iterations:.3f} ms/chamada")
+
+        if shutil.which("hyprctl"):
+            env = dict(os.environ, **server.env())
+            start = time.perf_counter()
+            for _ in range(iterations):
+                subprocess.run(["hyprctl", "clients", "-j"], capture_output=True, text=True, timeout=2, env=env)
+            hyprctl_ms = (time.perf_counter() - start) * 1000 / iterations
+            print(f"hyprctl:      {hyprctl_ms:.3f} ms/chamada ({hyprctl_ms / ipc_ms:.1f}x mais lento)")
+        else:
+            print("hyprctl não instalado: comparação com subprocess ignorada")
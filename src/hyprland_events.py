@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Hyprland Events - Assinante do socket de eventos do Hyprland (.socket2.sock)
+Permite reagir a openwindow/movewindow/activewindow em vez de usar sleeps fixos
+"""
+
+import socket
+import threading
+from typing import Callable, Dict, List, Optional
+
+from hyprland_ipc import HyprlandIPC
+
+
+# Handler de evento: handler(nome_do_evento, dados)
+EventHandler = Callable[[str, str], None]
+
+
+class HyprlandEventListener:
+    """
+    Lê o stream de eventos do Hyprland em uma thread de background
+
+    Cada linha do socket tem o formato "EVENTO>>DADOS", ex:
+        openwindow>>55a0c2f0,2,dev.zed.Zed,arquiteto
+        movewindowv2>>55a0c2f0,3,3
+        activewindowv2>>55a0c2f0
+
+    Handlers são chamados na thread do listener (devem ser rápidos).
+    """
+
+    def __init__(self, ipc: Optional[HyprlandIPC] = None):
+        self.ipc = ipc if ipc else HyprlandIPC()
+        self.event_count = 0  # Incrementado a cada evento recebido
+
+        self._handlers: Dict[str, List[EventHandler]] = {}
+        self._lock = threading.Lock()
+        self._sock = None
+        self._thread = None
+        self._running = False
+
+    # ===== Assinaturas =====
+
+    def subscribe(self, event: str, handler: EventHandler):
+        """
+        Registra um handler para um evento ("*" recebe todos os eventos)
+        """
+        with self._lock:
+            self._handlers.setdefault(event, []).append(handler)
+
+    def unsubscribe(self, event: str, handler: EventHandler):
+        """Remove um handler registrado"""
+        with self._lock:
+            handlers = self._handlers.get(event, [])
+            if handler in handlers:
+                handlers.remove(handler)
+
+    # ===== Ciclo de vida =====
+
+    def start(self) -> bool:
+        """
+        Conecta ao .socket2.sock e inicia a thread de leitura
+
+        Returns:
+            True se conectado (ou já rodando), False se o socket não está disponível
+        """
+        if self._running:
+            return True
+
+        path = self.ipc.event_socket_path
+        if path is None or not path.exists():
+            return False
+
+        try:
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._sock.connect(str(path))
+        except OSError as e:
+            print(f"Erro ao conectar no socket de eventos: {e}")
+            self._sock = None
+            return False
+
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="hyprland-events", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        """Desconecta do socket de eventos"""
+        self._running = False
+        if self._sock:
+            try:
+                self._sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._sock.close()
+            self._sock = None
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1)
+        self._thread = None
+
+    def is_running(self) -> bool:
+        """Retorna True se a thread de leitura está ativa"""
+        return self._running
+
+    def _run(self):
+        buffer = b""
+        while self._running:
+            try:
+                data = self._sock.recv(8192)
+            except OSError:
+                break
+            if not data:
+                break
+
+            buffer += data
+            while b"\n" in buffer:
+                line, buffer = buffer.split(b"\n", 1)
+                self._emit(line.decode("utf-8", errors="replace"))
+
+        self._running = False
+
+    def _emit(self, line: str):
+        event, sep, data = line.partition(">>")
+        if not sep:
+            return
+
+        self.event_count += 1
+        with self._lock:
+            handlers = self._handlers.get(event, []) + self._handlers.get("*", [])
+
+        for handler in handlers:
+            try:
+                handler(event, data)
+            except Exception as e:
+                print(f"Erro no handler do evento '{event}': {e}")
+
+
+# Teste basico
+if __name__ == "__main__":
+    import time
+
+    listener = HyprlandEventListener()
+    listener.subscribe("*", lambda event, data: print(f"{event}: {data}"))
+
+    if not listener.start():
+        print("Socket de eventos não encontrado (Hyprland não está rodando?)")
+        exit(1)
+
+    print("Escutando eventos por 10s (troque de workspace/abra janelas)...")
+    time.sleep(10)
+    listener.stop()
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Hyprland IPC - Cliente nativo do socket de controle do Hyprland
+Substitui as chamadas "hyprctl" via subprocess (fork/exec a cada chamada)
+"""
+
+import os
+import json
+import socket
+from pathlib import Path
+from typing import List, Dict, Optional, Any
+
+
+class HyprlandIPCError(Exception):
+    """Erro de comunicação com o socket do Hyprland"""
+
+
+class HyprlandIPC:
+    """
+    Cliente do socket de requisições do Hyprland (.socket.sock)
+
+    Cada requisição abre uma conexão, envia o comando e lê a resposta
+    até o Hyprland fechar o socket (mesmo protocolo usado pelo hyprctl).
+
+    Exemplos de comandos:
+        "j/clients"                       → JSON com todas as janelas
+        "j/workspaces"                    → JSON com todos os workspaces
+        "dispatch workspace 2"            → "ok"
+    """
+
+    SOCKET_NAME = ".socket.sock"
+    EVENT_SOCKET_NAME = ".socket2.sock"
+
+    def __init__(self, socket_dir: Optional[str] = None, timeout: float = 2.0):
+        """
+        Args:
+            socket_dir: Diretório da instância do Hyprland.
+                        Se None, usa $XDG_RUNTIME_DIR/hypr/$HYPRLAND_INSTANCE_SIGNATURE
+            timeout: Timeout (segundos) de cada requisição
+        """
+        self.socket_dir = Path(socket_dir) if socket_dir else self.find_socket_dir()
+        self.timeout = timeout
+
+    @staticmethod
+    def find_socket_dir() -> Optional[Path]:
+        """Encontra o diretório de sockets da instância atual do Hyprland"""
+        signature = os.environ.get("HYPRLAND_INSTANCE_SIGNATURE")
+        if not signature:
+            return None
+
+        runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+        if runtime_dir:
+            candidate = Path(runtime_dir) / "hypr" / signature
+            if candidate.exists():
+                return candidate
+
+        # Versões antigas do Hyprland usavam /tmp/hypr
+        return Path("/tmp/hypr") / signature
+
+    @property
+    def socket_path(self) -> Optional[Path]:
+        """Caminho do socket de requisições (.socket.sock)"""
+        if self.socket_dir is None:
+            return None
+        return self.socket_dir / self.SOCKET_NAME
+
+    @property
+    def event_socket_path(self) -> Optional[Path]:
+        """Caminho do socket de eventos (.socket2.sock)"""
+        if self.socket_dir is None:
+            return None
+        return self.socket_dir / self.EVENT_SOCKET_NAME
+
+    def is_available(self) -> bool:
+        """Verifica se o socket do Hyprland existe"""
+        path = self.socket_path
+        return path is not None and path.exists()
+
+    # ===== Requisições =====
+
+    def request(self, command: str) -> str:
+        """
+        Envia um comando cru ao Hyprland e retorna a resposta em texto
+
+        Raises:
+            HyprlandIPCError: Se o socket não existir ou a comunicação falhar
+        """
+        path = self.socket_path
+        if path is None:
+            raise HyprlandIPCError("HYPRLAND_INSTANCE_SIGNATURE não definido (Hyprland não está rodando?)")
+
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(self.timeout)
+                sock.connect(str(path))
+                sock.sendall(command.encode("utf-8"))
+
+                chunks = []
+                while True:
+                    data = sock.recv(8192)
+                    if not data:
+                        break
+                    chunks.append(data)
+        except OSError as e:
+            raise HyprlandIPCError(f"Falha no socket {path}: {e}") from e
+
+        return b"".join(chunks).decode("utf-8", errors="replace")
+
+    def request_json(self, command: str) -> Any:
+        """
+        Envia um comando com a flag JSON ("j/") e decodifica a resposta
+
+        Args:
+            command: Comando sem flag (ex: "clients", "workspaces")
+        """
+        reply = self.request(f"j/{command}")
+        try:
+            return json.loads(reply)
+        except json.JSONDecodeError as e:
+            raise HyprlandIPCError(f"Resposta inválida para '{command}': {reply[:200]}") from e
+
+    def dispatch(self, dispatcher: str, args: str = "") -> bool:
+        """
+        Executa um dispatcher (equivalente a "hyprctl dispatch <dispatcher> <args>")
+
+        Returns:
+            True se o Hyprland respondeu "ok"
+        """
+        command = f"dispatch {dispatcher} {args}".strip()
+        return self.request(command).strip() == "ok"
+
+    def batch(self, commands: List[str]) -> List[str]:
+        """
+        Envia vários comandos em uma única requisição ([[BATCH]])
+
+        Args:
+            commands: Comandos crus (ex: ["dispatch workspace 1", "j/clients"])
+
+        Returns:
+            Lista com a resposta de cada comando (na mesma ordem)
+        """
+        if not commands:
+            return []
+
+        reply = self.request("[[BATCH]]" + ";".join(commands))
+
+        # Hyprland separa as respostas do batch com "\n\n\n"
+        parts = reply.split("\n\n\n")
+        while len(parts) > len(commands) and not parts[-1].strip():
+            parts.pop()
+        if len(parts) == len(commands):
+            return [part.strip() for part in parts]
+
+        # Versões antigas concatenam sem separador ("okokok")
+        if reply.strip() == "ok" * len(commands):
+            return ["ok"] * len(commands)
+
+        return [reply.strip()] + [""] * (len(commands) - 1)
+
+    # ===== Atalhos para consultas comuns =====
+
+    def clients(self) -> List[Dict[str, Any]]:
+        """Retorna todas as janelas (j/clients)"""
+        return self.request_json("clients")
+
+    def workspaces(self) -> List[Dict[str, Any]]:
+        """Retorna todos os workspaces (j/workspaces)"""
+        return self.request_json("workspaces")
+
+    def active_workspace(self) -> Dict[str, Any]:
+        """Retorna o workspace ativo (j/activeworkspace)"""
+        return self.request_json("activeworkspace")
+
+    def active_window(self) -> Dict[str, Any]:
+        """Retorna a janela ativa (j/activewindow)"""
+        return self.request_json("activewindow")
+
+
+class DispatchBatch:
+    """
+    Acumula dispatches e envia todos em um único round trip ([[BATCH]])
+
+    Uso:
+        with workspace_manager.batch() as batch:
+            batch.add("movetoworkspacesilent", "5,address:0x1234")
+            batch.add("closewindow", "address:0x5678")
+        print(batch.results)  # [True, False]
+    """
+
+    def __init__(self, ipc: HyprlandIPC):
+        self.ipc = ipc
+        self.commands: List[str] = []
+        self.results: List[bool] = []
+
+    def add(self, dispatcher: str, args: str = "") -> "DispatchBatch":
+        """Adiciona um dispatch ao batch (não envia)"""
+        if ";" in args:
+            # O Hyprland separa os comandos do batch por ";"
+            raise ValueError(f"Argumento com ';' não pode ir em batch: {args}")
+        self.commands.append(f"dispatch {dispatcher} {args}".strip())
+        return self
+
+    def __len__(self) -> int:
+        return len(self.commands)
+
+    def send(self) -> List[bool]:
+        """
+        Envia todos os dispatches acumulados
+
+        Returns:
+            Lista com o resultado de cada dispatch (True = "ok")
+
+        Raises:
+            HyprlandIPCError: Se a comunicação com o socket falhar
+        """
+        if not self.commands:
+            self.results = []
+            return self.results
+
+        replies = self.ipc.batch(self.commands)
+        self.results = [reply == "ok" for reply in replies]
+        self.commands = []
+        return self.results
+
+    def __enter__(self) -> "DispatchBatch":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            return False
+
+        count = len(self.commands)
+        try:
+            self.send()
+        except HyprlandIPCError as e:
+            print(f"Erro ao enviar batch de {count} dispatch(es): {e}")
+            self.results = [False] * count
+        return False
+
+
+# Teste basico
+if __name__ == "__main__":
+    ipc = HyprlandIPC()
+
+    if not ipc.is_available():
+        print("Hyprland não encontrado. Use 'python fake_hyprland.py' para testar sem Hyprland.")
+        exit(1)
+
+    print(f"Socket: {ipc.socket_path}")
+
+    active = ipc.active_workspace()
+    print(f"Workspace ativo: {active.get('id')}")
+
+    clients = ipc.clients()
+    print(f"Total de janelas: {len(clients)}")
+    for client in clients:
+        print(f"  - WS{client.get('workspace', {}).get('id')}: {client.get('class')} ({client.get('title')})")
@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""
+Hyprland State - Modelo em memória de janelas/workspaces do Hyprland
+Semeado uma vez via IPC e mantido atualizado pelo stream de eventos (socket2)
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from hyprland_ipc import HyprlandIPC
+from hyprland_events import HyprlandEventListener
+
+
+# Callback de mudança: callback(nome_do_evento, dados) - chamado DEPOIS do estado ser atualizado
+ChangeCallback = Callable[[str, str], None]
+
+
+def normalize_address(address: str) -> str:
+    """Eventos mandam endereço sem "0x", o JSON do j/clients manda com"""
+    address = address.strip()
+    return address if address.startswith("0x") else f"0x{address}"
+
+
+class HyprlandState:
+    """
+    Cache de janelas e workspaces indexado por address, pid, class e workspace
+
+    Leituras não fazem IPC: são lookups em dicionários (O(1)) ou varreduras
+    apenas das chaves do índice (O(k)). As janelas guardadas são substituídas
+    (nunca alteradas in-place), então quem recebeu um dict tem um snapshot estável.
+
+    O evento openwindow não traz o PID: a janela entra no cache na hora com os
+    campos do evento e pid -1, e a primeira leitura depois disso busca os PIDs
+    pendentes com um único j/clients (fora da thread do listener).
+    """
+
+    def __init__(self, ipc: HyprlandIPC, listener: HyprlandEventListener):
+        self.ipc = ipc
+        self.listener = listener
+
+        self.windows: Dict[str, Dict[str, Any]] = {}  # {address: client}
+        self.workspaces: Dict[int, Dict[str, Any]] = {}  # {id: workspace}
+        self.active_address = ""
+        self.active_workspace_id: Optional[int] = None
+        self.seeded = False
+        self.version = 0  # Incrementado a cada mudança aplicada
+        self.title_changed_at: Dict[str, float] = {}  # {address: time.monotonic() da última troca de título}
+
+        self._by_pid: Dict[int, Set[str]] = {}
+        self._by_class: Dict[str, Set[str]] = {}
+        self._by_workspace: Dict[int, Set[str]] = {}
+        self._pending_pids: Set[str] = set()  # Janelas abertas por evento, ainda sem PID
+        self._callbacks: List[ChangeCallback] = []
+        self._attached = False
+        self._lock = threading.RLock()
+
+    # ===== Sincronização =====
+
+    def attach(self) -> bool:
+        """Assina o stream de eventos e semeia o estado (idempotente)"""
+        if not self._attached:
+            self.listener.subscribe("*", self._on_event)
+            self._attached = True
+        return self.resync()
+
+    def resync(self) -> bool:
+        """Recarrega todo o estado via IPC (j/clients, j/workspaces, ...)"""
+        try:
+            clients = self.ipc.clients()
+            workspaces = self.ipc.workspaces()
+            active_ws = self.ipc.active_workspace()
+            active_window = self.ipc.active_window()
+        except Exception as e:
+            print(f"Erro ao sincronizar estado do Hyprland: {e}")
+            return False
+
+        with self._lock:
+            self.windows.clear()
+            self._by_pid.clear()
+            self._by_class.clear()
+            self._by_workspace.clear()
+            self._pending_pids.clear()
+            for client in clients:
+                if client.get("address"):
+                    self._put(client)
+            self.title_changed_at = {a: t for a, t in self.title_changed_at.items() if a in self.windows}
+
+            self.workspaces = {ws["id"]: ws for ws in workspaces if "id" in ws}
+            self.active_workspace_id = active_ws.get("id")
+            self.active_address = active_window.get("address", "") if active_window else ""
+            self.seeded = True
+            self.version += 1
+
+        self._notify("resync", "")
+        return True
+
+    def check_consistency(self, resync: bool = True) -> bool:
+        """
+        Compara o cache com o estado real do Hyprland
+
+        Args:
+            resync: Se True, ressincroniza quando houver divergência
+
+        Returns:
+            True se o cache estava consistente
+        """
+        try:
+            live = {
+                c["address"]: (c.get("workspace", {}).get("id"), c.get("pid"))
+                for c in self.ipc.clients()
+            }
+        except Exception as e:
+            print(f"Erro ao verificar consistência do estado: {e}")
+            return False
+
+        self._fill_pending_pids()
+        with self._lock:
+            cached = {
+                address: (c.get("workspace", {}).get("id"), c.get("pid"))
+                for address, c in self.windows.items()
+            }
+
+        consistent = live == cached
+        if not consistent:
+            missing = len(live.keys() - cached.keys())
+            stale = len(cached.keys() - live.keys())
+            print(f"[HyprlandState] Divergência: {missing} janela(s) faltando, {stale} obsoleta(s)")
+            if resync:
+                self.resync()
+        return consistent
+
+    # ===== Notificações =====
+
+    def subscribe(self, callback: ChangeCallback):
+        """Registra callback chamado após cada mudança no estado"""
+        with self._lock:
+            self._callbacks.append(callback)
+
+    def unsubscribe(self, callback: ChangeCallback):
+        """Remove callback registrado"""
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def _notify(self, event: str, data: str):
+        with self._lock:
+            callbacks = list(self._callbacks)
+        for callback in callbacks:
+            try:
+                callback(event, data)
+            except Exception as e:
+                print(f"Erro em callback de estado ({event}): {e}")
+
+    # ===== Consultas (sem IPC) =====
+
+    def get_window(self, address: str) -> Optional[Dict[str, Any]]:
+        """Retorna a janela pelo endereço (O(1))"""
+        address = normalize_address(address)
+        if address in self._pending_pids:
+            self._fill_pending_pids()
+        return self.windows.get(address)
+
+    def all_windows(self) -> List[Dict[str, Any]]:
+        """Retorna todas as janelas"""
+        self._fill_pending_pids()
+        with self._lock:
+            return list(self.windows.values())
+
+    def windows_by_pid(self, pid: int) -> List[Dict[str, Any]]:
+        """Retorna as janelas de um processo (O(1))"""
+        self._fill_pending_pids()
+        with self._lock:
+            return [self.windows[a] for a in self._by_pid.get(pid, ())]
+
+    def windows_by_class(self, class_substring: str) -> List[Dict[str, Any]]:
+        """Retorna janelas cuja class contém a substring (O(k) nas classes distintas)"""
+        needle = class_substring.lower()
+        self._fill_pending_pids()
+        with self._lock:
+            return [
+                self.windows[address]
+                for window_class, addresses in self._by_class.items()
+                if needle in window_class
+                for address in addresses
+            ]
+
+    def windows_in_workspace(self, workspace_id: int) -> List[Dict[str, Any]]:
+        """Retorna as janelas de um workspace (O(1) + janelas do workspace)"""
+        self._fill_pending_pids()
+        with self._lock:
+            return [self.windows[a] for a in self._by_workspace.get(workspace_id, ())]
+
+    def window_count(self, workspace_id: int) -> int:
+        """Quantidade de janelas em um workspace"""
+        return len(self._by_workspace.get(workspace_id, ()))
+
+    def all_workspaces(self) -> List[Dict[str, Any]]:
+        """Retorna os workspaces conhecidos (com contagem de janelas atualizada)"""
+        with self._lock:
+            return [
+                dict(ws, windows=self.window_count(ws_id))
+                for ws_id, ws in sorted(self.workspaces.items())
+            ]
+
+    def active_workspace(self) -> Optional[Dict[str, Any]]:
+        """Retorna o workspace ativo"""
+        with self._lock:
+            ws = self.workspaces.get(self.active_workspace_id)
+            if ws is None:
+                return None
+            return dict(ws, windows=self.window_count(self.active_workspace_id))
+
+    # ===== Atualizações locais (após dispatch bem sucedido) =====
+
+    def note_moved(self, address: str, workspace_id: Any):
+        """Aplica um move já confirmado pelo Hyprland (antes do evento chegar)"""
+        ref = self._workspace_ref(str(workspace_id))
+        if ref is not None:
+            self._apply_move(normalize_address(address), ref["id"], ref["name"])
+
+    # ===== Eventos =====
+
+    def _on_event(self, event: str, data: str):
+        handler = self._EVENT_HANDLERS.get(event)
+        if handler is None:
+            return
+        handler(self, data)
+        self._notify(event, data)
+
+    def _on_openwindow(self, data: str):
+        address, ws_name, window_class, title = (data.split(",", 3) + ["", "", ""])[:4]
+        address = normalize_address(address)
+        ref = self._workspace_ref(ws_name) or {"id": None, "name": ws_name}
+
+        # Sem IPC aqui (thread do listener): o PID é buscado na próxima leitura
+        with self._lock:
+            self._put({
+                "address": address,
+                "workspace": ref,
+                "class": window_class,
+                "title": title,
+                "initialClass": window_class,
+                "initialTitle": title,
+                "pid": -1,
+            })
+            self._pending_pids.add(address)
+            self.version += 1
+
+    def _on_closewindow(self, data: str):
+        address = normalize_address(data)
+        with self._lock:
+            self._remove(address)
+            self._pending_pids.discard(address)
+            self.version += 1
+
+    def _on_movewindowv2(self, data: str):
+        address, ws_id, ws_name = (data.split(",", 2) + ["", ""])[:3]
+        try:
+            self._apply_move(normalize_address(address), int(ws_id), ws_name)
+        except ValueError:
+            pass
+
+    def _on_activewindowv2(self, data: str):
+        with self._lock:
+            self.active_address = normalize_address(data) if data.strip() else ""
+            self.version += 1
+
+    def _on_windowtitlev2(self, data: str):
+        address, _, title = data.partition(",")
+        address = normalize_address(address)
+        with self._lock:
+            client = self.windows.get(address)
+            if client is not None:
+                self.windows[address] = dict(client, title=title)
+                self.title_changed_at[address] = time.monotonic()
+                self.version += 1
+
+    def _on_workspacev2(self, data: str):
+        ws_id, _, name = data.partition(",")
+        with self._lock:
+            try:
+                self.active_workspace_id = int(ws_id)
+            except ValueError:
+                return
+            self._ensure_workspace(self.active_workspace_id, name)
+            self.version += 1
+
+    def _on_createworkspacev2(self, data: str):
+        ws_id, _, name = data.partition(",")
+        with self._lock:
+            try:
+                self._ensure_workspace(int(ws_id), name)
+            except ValueError:
+                return
+            self.version += 1
+
+    def _on_destroyworkspacev2(self, data: str):
+        ws_id, _, _ = data.partition(",")
+        with self._lock:
+            try:
+                self.workspaces.pop(int(ws_id), None)
+            except ValueError:
+                return
+            self.version += 1
+
+    _EVENT_HANDLERS = {
+        "openwindow": _on_openwindow,
+        "closewindow": _on_closewindow,
+        "movewindowv2": _on_movewindowv2,
+        "activewindowv2": _on_activewindowv2,
+        "windowtitlev2": _on_windowtitlev2,
+        "workspacev2": _on_workspacev2,
+        "createworkspacev2": _on_createworkspacev2,
+        "destroyworkspacev2": _on_destroyworkspacev2,
+    }
+
+    # ===== PIDs pendentes =====
+
+    def _fill_pending_pids(self):
+        """Completa o PID das janelas abertas por evento (um j/clients para todas)"""
+        with self._lock:
+            pending = set(self._pending_pids)
+        if not pending:
+            return
+        try:
+            clients = self.ipc.clients()
+        except Exception as e:
+            print(f"Erro ao buscar PIDs das janelas novas: {e}")
+            return
+
+        pids = {c.get("address"): c.get("pid", -1) for c in clients}
+        with self._lock:
+            for address in pending:
+                client = self.windows.get(address)
+                pid = pids.get(address, -1)
+                if client is not None and client.get("pid", -1) == -1 and pid != -1:
+                    self._put(dict(client, pid=pid))
+                    self.version += 1
+            # Janelas abertas durante o j/clients ficam para a próxima leitura
+            self._pending_pids -= pending
+
+    # ===== Índices =====
+
+    def _put(self, client: Dict[str, Any]):
+        """Insere/substitui uma janela e atualiza os índices (chamar com lock)"""
+        address = client["address"]
+        self._remove(address)
+        self.windows[address] = client
+
+        self._by_pid.setdefault(client.get("pid", -1), set()).add(address)
+        self._by_class.setdefault(client.get("class", "").lower(), set()).add(address)
+        ws = client.get("workspace", {})
+        ws_id = ws.get("id")
+        if ws_id is not None:
+            self._by_workspace.setdefault(ws_id, set()).add(address)
+            self._ensure_workspace(ws_id, ws.get("name", str(ws_id)))
+
+    def _remove(self, address: str):
+        """Remove uma janela dos índices (chamar com lock)"""
+        client = self.windows.pop(address, None)
+        if client is None:
+            return
+        self.title_changed_at.pop(address, None)
+
+        for index, key in (
+            (self._by_pid, client.get("pid", -1)),
+            (self._by_class, client.get("class", "").lower()),
+            (self._by_workspace, client.get("workspace", {}).get("id")),
+        ):
+            addresses = index.get(key)
+            if addresses is not None:
+                addresses.discard(address)
+                if not addresses:
+                    del index[key]
+
+        if self.active_address == address:
+            self.active_address = ""
+
+    def _apply_move(self, address: str, ws_id: int, ws_name: str):
+        with self._lock:
+            client = self.windows.get(address)
+            if client is None or client.get("workspace", {}).get("id") == ws_id:
+                return
+            self._put(dict(client, workspace={"id": ws_id, "name": ws_name or str(ws_id)}))
+            self.version += 1
+
+    def _ensure_workspace(self, ws_id: int, name: str):
+        if ws_id not in self.workspaces:
+            self.workspaces[ws_id] = {"id": ws_id, "name": name or str(ws_id), "monitor": "unknown"}
+
+    def _workspace_ref(self, ws_name: str) -> Optional[Dict[str, Any]]:
+        """Resolve nome de workspace ("3", "special:arq_1") para {id, name}"""
+        ws_name = ws_name.strip()
+        with self._lock:
+            for ws_id, ws in self.workspaces.items():
+                if ws.get("name") == ws_name:
+                    return {"id": ws_id, "name": ws_name}
+        try:
+            return {"id": int(ws_name), "name": ws_name}
+        except ValueError:
+            return None
+
+
+# Teste basico
+if __name__ == "__main__":
+    ipc = HyprlandIPC()
+    listener = HyprlandEventListener(ipc)
+    state = HyprlandState(ipc, listener)
+
+    if not listener.start() or not state.attach():
+        print("Hyprland não encontrado")
+        exit(1)
+
+    print(f"Janelas em cache: {len(state.windows)}")
+    for ws in state.all_workspaces():
+        print(f"  WS {ws['id']}: {ws['windows']} janelas")
+    print(f"Consistente: {state.check_consistency()}")
+    listener.stop()
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Launch Telemetry - Tempo de cada etapa de troca/abertura de projeto (tabela launch_events)
+Os eventos vão para uma fila e são gravados em lote por uma thread: medir nunca bloqueia a troca
+"""
+
+import queue
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+import psutil
+
+from database import Database
+from database_writer import DatabaseWriter
+
+
+def percentile(sorted_values: List[float], fraction: float) -> Optional[float]:
+    """Percentil com interpolação linear (sorted_values já ordenado)"""
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+class LaunchTelemetry:
+    """
+    Registro assíncrono de etapas de abertura + percentis (p50/p95)
+
+    Etapas usadas pelo ProjectManager:
+        switch_project, open_project  (span: com delta de RAM)
+        open_app                      (disparo → janela apareceu, + espera/envio do hotkey se houver)
+        window                        (disparo → janela apareceu)
+        interactive                   (janela apareceu → primeira troca de título)
+        hotkey                        (envio do atalho)
+        settle                        (atalho enviado → troca de título: app reagiu)
+
+    Etapas medidas dentro de um span herdam o run_id dele (mesma thread),
+    então um switch e os apps que ele abriu ficam agrupados.
+
+    Cada lote vira uma escrita no DatabaseWriter (a mesma fila/transação das
+    outras escritas do app).
+
+    Uso:
+        telemetry = LaunchTelemetry(db)
+        telemetry.start()
+        with telemetry.span("switch_project", project_id=3) as event:
+            ok = ...
+            event["outcome"] = "ok" if ok else "failed"
+        telemetry.stats("open_app")  # {"zed": {"count", "p50_ms", "p95_ms"}, ...}
+    """
+
+    BATCH_SIZE = 100
+
+    def __init__(self, db: Database, writer: Optional[DatabaseWriter] = None):
+        self.db = db
+        self.writer = writer if writer else DatabaseWriter(db)  # Não iniciado: grava na hora
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        self._local = threading.local()
+        self._thread = None
+        self._running = False
+
+    # ===== Ciclo de vida =====
+
+    def start(self):
+        """Inicia a thread de gravação"""
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="launch-telemetry", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        """Grava o que está na fila e para a thread"""
+        if not self._running:
+            return
+        self._running = False
+        self._queue.put(None)
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+
+    def flush(self, timeout: float = 2.0) -> bool:
+        """Espera a fila esvaziar (ex: antes de consultar stats em testes)"""
+        if not self._running:
+            self._write([event for event in self._drain() if event is not None])
+            return True
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.005)
+        return True
+
+    # ===== Registro =====
+
+    @contextmanager
+    def span(self, step: str, project_id: Optional[int] = None, app: Optional[str] = None,
+             workspace_id: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Mede o bloco (tempo + delta de RAM) e registra ao sair
+
+        O dict entregue pode receber "outcome" ("ok", "failed", ...).
+        Exceção no bloco registra outcome="error".
+        """
+        outer = getattr(self._local, "run_id", None) is None
+        if outer:
+            self._local.run_id = uuid.uuid4().hex[:12]
+
+        event = {"outcome": "ok"}
+        ram_before = _ram_used_mb()
+        started_at = time.time()
+        started = time.perf_counter()
+        try:
+            yield event
+        except BaseException:
+            event["outcome"] = "error"
+            raise
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            ram_after = _ram_used_mb()
+            self.record(
+                step,
+                duration_ms,
+                project_id=project_id,
+                app=app,
+                workspace_id=workspace_id,
+                outcome=event["outcome"],
+                started_at=started_at,
+                ram_delta_mb=(ram_after - ram_before) if ram_before is not None and ram_after is not None else None,
+            )
+            if outer:
+                self._local.run_id = None
+
+    def record(self, step: str, duration_ms: float, project_id: Optional[int] = None, app: Optional[str] = None,
+               workspace_id: Optional[int] = None, outcome: str = "ok", started_at: Optional[float] = None,
+               ram_delta_mb: Optional[float] = None, run_id: Optional[str] = None):
+        """
+        Registra uma etapa já medida (não bloqueia: só enfileira)
+
+        run_id: do span de outra thread (current_run_id()); None = span desta thread
+        """
+        if started_at is None:
+            started_at = time.time() - duration_ms / 1000
+        self._queue.put({
+            "run_id": run_id or getattr(self._local, "run_id", None),
+            "step": step,
+            "project_id": project_id,
+            "app": app.lower() if app else None,
+            "workspace_id": workspace_id,
+            "started_at": started_at,
+            "ended_at": started_at + duration_ms / 1000,
+            "duration_ms": duration_ms,
+            "outcome": outcome,
+            "ram_delta_mb": ram_delta_mb,
+        })
+
+    def current_run_id(self) -> Optional[str]:
+        """run_id do span aberto nesta thread (para medir etapas em outra thread)"""
+        return getattr(self._local, "run_id", None)
+
+    # ===== Consulta =====
+
+    def stats(self, step: str = "open_app", group_by: str = "app", since: Optional[float] = None) -> Dict[Any, Dict[str, Any]]:
+        """
+        p50/p95 de uma etapa por app ou por projeto
+
+        Args:
+            group_by: "app" ou "project_id"
+            since: Só eventos depois deste timestamp (epoch)
+
+        Returns:
+            {app ou project_id: {"count", "p50_ms", "p95_ms", "max_ms"}}
+        """
+        grouped: Dict[Any, List[float]] = {}
+        for key, duration_ms in self.db.get_launch_durations(step, group_by, since):
+            grouped.setdefault(key, []).append(duration_ms)  # Já ordenado pelo banco
+
+        return {
+            key: {
+                "count": len(durations),
+                "p50_ms": percentile(durations, 0.50),
+                "p95_ms": percentile(durations, 0.95),
+                "max_ms": durations[-1],
+            }
+            for key, durations in grouped.items()
+        }
+
+    def print_stats(self, step: str = "open_app", group_by: str = "app"):
+        """Imprime a tabela de p50/p95"""
+        stats = self.stats(step, group_by)
+        if not stats:
+            print(f"[Telemetria] Sem eventos de {step}")
+            return
+        print(f"[Telemetria] {step} por {group_by}:")
+        for key, values in sorted(stats.items(), key=lambda item: item[1]["p50_ms"]):
+            print(f"  {str(key):<15} n={values['count']:<5} p50: {values['p50_ms']:7.0f}ms  p95: {values['p95_ms']:7.0f}ms")
+
+    # ===== Internos =====
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()] + self._drain()
+            self._write([event for event in batch if event is not None])
+            for _ in batch:
+                self._queue.task_done()
+            if not self._running and self._queue.empty():
+                break
+
+    def _drain(self) -> List[Optional[Dict[str, Any]]]:
+        """Pega o que já está na fila (até BATCH_SIZE) sem esperar"""
+        batch = []
+        while len(batch) < self.BATCH_SIZE:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, events: List[Dict[str, Any]]):
+        if not events:
+            return
+        try:
+            # Esperar o commit: flush() só volta com os eventos gravados
+            self.writer.submit(self.db.add_launch_events, events).result()
+        except Exception as e:
+            print(f"Erro ao gravar telemetria ({len(events)} evento(s)): {e}")
+
+
+def _ram_used_mb() -> Optional[float]:
+    try:
+        return psutil.virtual_memory().used / (1024 ** 2)
+    except Exception:
+        return None
+
+
+# Teste basico
+if __name__ == "__main__":
+    import os
+    import random
+    import tempfile
+
+    db = Database(os.path.join(tempfile.mkdtemp(), "telemetry_test.db"))
+    telemetry = LaunchTelemetry(db)
+    telemetry.start()
+
+    # Custo de registrar (a thread que mede só enfileira)
+    iterations = 2000
+    start = time.perf_counter()
+    for _ in range(iterations):
+        telemetry.record("open_app", random.gauss(800, 150), project_id=1, app="zed", workspace_id=1)
+    print(f"record(): {(time.perf_counter() - start) / iterations * 1e6:.1f}µs por evento")
+
+    for _ in range(200):
+        telemetry.record("open_app", random.gauss(250, 40), project_id=2, app="ghostty", workspace_id=3)
+    with telemetry.span("switch_project", project_id=2) as event:
+        time.sleep(0.05)
+        telemetry.record("window", 42.0, project_id=2, app="ghostty")
+
+    telemetry.flush()
+    telemetry.print_stats("open_app")
+    telemetry.print_stats("open_app", group_by="project_id")
+    telemetry.print_stats("switch_project", group_by="project_id")
+    telemetry.stop()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Launch Timing - Esperas de abertura aprendidas do histórico (tabela launch_events)
+Substitui os delays fixos por percentil + margem de cada app; sem histórico, usa as constantes
+"""
+
+import time
+from typing import Any, Dict, Optional
+
+from launch_telemetry import LaunchTelemetry
+from constants import APP_WINDOW_TIMEOUT, HOTKEY_DELAY_BEFORE, HOTKEY_DELAY_AFTER
+
+
+class LaunchTimingModel:
+    """
+    Orçamento de espera por app, a partir das etapas medidas pela LaunchTelemetry
+
+    window       disparo → janela apareceu (timeout da espera pela janela)
+    interactive  janela apareceu → primeira troca de título (app carregou o
+                 projeto/shell; a partir daí o hotkey pode ser enviado)
+    settle       hotkey enviado → troca de título (app reagiu ao atalho; a
+                 partir daí o próximo foco/atalho não atropela o anterior)
+
+    Orçamento = p95 × margem + folga, limitado a [mínimo, máximo]. Só eventos
+    com outcome "ok" dos últimos HISTORY_DAYS dias entram, e só com pelo menos
+    MIN_SAMPLES amostras; abaixo disso vale a constante (APP_WINDOW_TIMEOUT,
+    HOTKEY_DELAY_BEFORE, HOTKEY_DELAY_AFTER). O p95 é robusto a uma abertura fora da curva, e a
+    janela de histórico acompanha a máquina ficando mais rápida ou mais lenta.
+
+    Os percentis ficam em cache e são relidos no máximo a cada REFRESH_INTERVAL
+    segundos (ou na próxima consulta após invalidate()).
+
+    Uso:
+        timing = LaunchTimingModel(telemetry)
+        waiter.wait(timing.window_timeout("zed"))
+        timing.interactive_budget("zed")  # ex: 0.35s em vez de 0.5s
+        timing.settle_budget("zed")  # ex: 0.12s em vez de 0.3s
+    """
+
+    MIN_SAMPLES = 5
+    PERCENTILE = "p95_ms"
+    HISTORY_DAYS = 30
+    REFRESH_INTERVAL = 60.0
+
+    # Janela: erra para o lado de esperar mais (estourar = app tratado como falho)
+    WINDOW_MARGIN = 2.0
+    WINDOW_PADDING = 2.0
+    WINDOW_MIN = 5.0
+    WINDOW_MAX = 60.0
+
+    # Interativo: estourar só significa enviar o hotkey (como antes, com delay fixo)
+    INTERACTIVE_MARGIN = 1.25
+    INTERACTIVE_PADDING = 0.1
+    INTERACTIVE_MIN = 0.05
+    INTERACTIVE_MAX = 5.0
+
+    # Pós-hotkey: estourar só significa seguir para o próximo app
+    SETTLE_MARGIN = 1.25
+    SETTLE_PADDING = 0.05
+    SETTLE_MIN = 0.0
+    SETTLE_MAX = 2.0
+
+    STEPS = ("window", "interactive", "settle")
+
+    def __init__(self, telemetry: LaunchTelemetry):
+        self.telemetry = telemetry
+        self._stats: Dict[str, Dict[str, Dict[str, Any]]] = {}  # {etapa: {app: stats}}
+        self._loaded_at: Optional[float] = None
+
+    def window_timeout(self, app: str) -> float:
+        """Segundos esperando a janela do app aparecer"""
+        learned = self._learned("window", app)
+        if learned is None:
+            return APP_WINDOW_TIMEOUT
+        return _clamp(learned * self.WINDOW_MARGIN + self.WINDOW_PADDING, self.WINDOW_MIN, self.WINDOW_MAX)
+
+    def interactive_budget(self, app: str) -> float:
+        """Segundos (desde a janela aparecer) esperando o app ficar pronto para o hotkey"""
+        learned = self._learned("interactive", app)
+        if learned is None:
+            return HOTKEY_DELAY_BEFORE
+        return _clamp(learned * self.INTERACTIVE_MARGIN + self.INTERACTIVE_PADDING,
+                      self.INTERACTIVE_MIN, self.INTERACTIVE_MAX)
+
+    def settle_budget(self, app: str) -> float:
+        """Segundos (desde o envio do hotkey) esperando o app reagir ao atalho"""
+        learned = self._learned("settle", app)
+        if learned is None:
+            return HOTKEY_DELAY_AFTER
+        return _clamp(learned * self.SETTLE_MARGIN + self.SETTLE_PADDING, self.SETTLE_MIN, self.SETTLE_MAX)
+
+    def invalidate(self):
+        """Relê os percentis na próxima consulta (ex: após registrar uma abertura)"""
+        self._loaded_at = None
+
+    def describe(self) -> Dict[str, Dict[str, Any]]:
+        """{app: {"window_s", "interactive_s", "settle_s", "samples"}} para os apps com histórico"""
+        stats = self._get_stats()
+        apps = set().union(*(stats.get(step, {}) for step in self.STEPS))
+        return {
+            app: {
+                "window_s": self.window_timeout(app),
+                "interactive_s": self.interactive_budget(app),
+                "settle_s": self.settle_budget(app),
+                "samples": {step: stats.get(step, {}).get(app, {}).get("count", 0) for step in self.STEPS},
+            }
+            for app in sorted(apps)
+        }
+
+    # ===== Internos =====
+
+    def _learned(self, step: str, app: str) -> Optional[float]:
+        """Percentil em segundos, ou None sem amostras suficientes"""
+        values = self._get_stats().get(step, {}).get(app.lower())
+        if not values or values["count"] < self.MIN_SAMPLES:
+            return None
+        return values[self.PERCENTILE] / 1000
+
+    def _get_stats(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        now = time.monotonic()
+        if self._loaded_at is None or now - self._loaded_at >= self.REFRESH_INTERVAL:
+            since = time.time() - self.HISTORY_DAYS * 86400
+            try:
+                self._stats = {step: self.telemetry.stats(step, "app", since) for step in self.STEPS}
+            except Exception as e:
+                print(f"Erro ao carregar histórico de abertura: {e}")
+            self._loaded_at = now
+        return self._stats
+
+
+def _clamp(value: float, lower: float, upper: float) -> float:
+    return max(lower, min(value, upper))
+
+
+# Teste basico
+if __name__ == "__main__":
+    import os
+    import random
+    import tempfile
+
+    from database import Database
+
+    db = Database(os.path.join(tempfile.mkdtemp(), "timing_test.db"))
+    telemetry = LaunchTelemetry(db)
+    telemetry.start()
+    timing = LaunchTimingModel(telemetry)
+
+    print(f"Sem histórico: janela {timing.window_timeout('zed'):.2f}s, interativo {timing.interactive_budget('zed'):.2f}s, "
+          f"pós-hotkey {timing.settle_budget('zed'):.2f}s")
+
+    random.seed(1)
+    for _ in range(50):
+        telemetry.record("window", random.gauss(700, 80), app="zed")
+        telemetry.record("interactive", random.gauss(250, 30), app="zed")
+        telemetry.record("window", random.gauss(150, 20), app="terminal")
+        telemetry.record("interactive", random.gauss(60, 10), app="terminal")
+        telemetry.record("settle", random.gauss(90, 15), app="zed")
+    telemetry.record("window", 9000, app="zed")  # Uma abertura fora da curva não move o p95
+    telemetry.record("interactive", 400, app="code")  # Poucas amostras: constante
+    telemetry.flush()
+    timing.invalidate()
+
+    for app, values in timing.describe().items():
+        print(f"  {app:<10} janela: {values['window_s']:5.2f}s  interativo: {values['interactive_s']:5.2f}s  "
+              f"pós-hotkey: {values['settle_s']:5.2f}s  amostras: {values['samples']}")
+
+    iterations = 10000
+    start = time.perf_counter()
+    for _ in range(iterations):
+        timing.interactive_budget("zed")
+    print(f"interactive_budget(): {(time.perf_counter() - start) / iterations * 1e6:.2f}µs por consulta (cache)")
+    telemetry.stop()
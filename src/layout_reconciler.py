@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Layout Reconciler - Leva os workspaces ao layout desejado de um projeto com o mínimo de ações
+Compara o layout (app por workspace) com as janelas vivas e gera move/launch/close/focus
+"""
+
+import os
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
+
+from constants import APP_WINDOW_CLASSES, PROJECT_WORKSPACES
+
+if TYPE_CHECKING:
+    from project_manager import ProjectManager
+
+
+ARQUITETO_WORKSPACE = 9
+UNOWNED_WORKSPACE = 5  # Janelas sem projeto ativo (comportamento antigo do switch)
+
+
+class LayoutReconciler:
+    """
+    Reconciliação estado desejado x estado real dos workspaces
+
+    plan() só lê o cache de janelas (sem IPC) e devolve a lista de ações:
+        {"action": "move",   "address", "workspace", "from", "class"}
+        {"action": "close",  "address", "class"}
+        {"action": "launch", "spec"}            (spec de get_project_apps)
+        {"action": "focus",  "workspace"}
+    apply() envia moves/closes/focus em um único batch e abre só os apps que faltam.
+
+    Janelas consideradas do projeto: as dos workspaces dele (1, 2, 3 + os do
+    layout, se ele é o ativo) e as estacionadas em special:arq_<id>. Janelas
+    do projeto ativo nos workspaces de qualquer um dos dois são estacionadas
+    no special workspace dele.
+    """
+
+    def __init__(self, project_manager: "ProjectManager"):
+        self.pm = project_manager
+        self.wm = project_manager.workspace_manager
+
+    def plan(self, project: Dict[str, Any], active_project: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Calcula as ações para o layout do projeto
+
+        Args:
+            project: Projeto desejado
+            active_project: Projeto ativo agora (dono das janelas dos workspaces dele)
+        """
+        project_id = project["id"]
+        active_id = active_project["id"] if active_project else None
+        arquiteto_pid = os.getpid()
+        apps = self.pm.get_project_apps(project)
+        actions: List[Dict[str, Any]] = []
+
+        workspaces = sorted(
+            set(self.pm.project_workspace_ids(project)) | set(self.pm.project_workspace_ids(active_project))
+        )
+        in_place = [
+            client
+            for ws_id in workspaces
+            for client in self.wm.get_windows_in_workspace(ws_id)
+            if client.get("address") and client.get("pid", -1) != arquiteto_pid
+        ]
+
+        # 1. Janelas candidatas: já no lugar (se o projeto é o ativo) + estacionadas
+        if active_id == project_id:
+            candidates = list(in_place)
+        else:
+            candidates = []
+            park_to = self.pm.project_special_workspace(active_id) if active_id is not None else UNOWNED_WORKSPACE
+            for client in in_place:
+                actions.append(self._move(client, park_to))
+        candidates += self.wm.get_windows_in_workspace_named(self.pm.project_special_workspace(project_id))
+
+        # 2. Um app por workspace: preferir janela já no workspace, depois a que saiu dele
+        assigned: Dict[int, Dict[str, Any]] = {}
+        used = set()
+        preferences = (
+            lambda client, ws_id: self._workspace_id(client) == ws_id,
+            lambda client, ws_id: self.pm.parked_origin.get(client["address"]) == ws_id,
+            lambda client, ws_id: True,
+        )
+        for prefer in preferences:
+            for spec in apps:
+                ws_id = spec["workspace_id"]
+                if ws_id in assigned:
+                    continue
+                expected_class = APP_WINDOW_CLASSES.get(spec["app"].lower())
+                for client in candidates:
+                    if client["address"] in used or not prefer(client, ws_id):
+                        continue
+                    if expected_class and expected_class not in client.get("class", "").lower():
+                        continue
+                    if not expected_class and self._workspace_id(client) != ws_id:
+                        continue  # App sem class conhecida: só conta janela já no workspace
+                    assigned[ws_id] = client
+                    used.add(client["address"])
+                    break
+
+        for spec in apps:
+            client = assigned.get(spec["workspace_id"])
+            if client is None:
+                actions.append({"action": "launch", "spec": spec})
+            elif self._workspace_id(client) != spec["workspace_id"]:
+                actions.append(self._move(client, spec["workspace_id"]))
+
+        # 3. Janelas do projeto que sobraram
+        app_classes = [APP_WINDOW_CLASSES.get(spec["app"].lower()) for spec in apps]
+        owned_pids = set(self.pm.supervisor.project_pids(project_id))
+        for client in candidates:
+            if client["address"] in used:
+                continue
+            window_class = client.get("class", "").lower()
+            if self._workspace_id(client) not in workspaces:
+                # Estacionada sem app correspondente: volta para onde estava
+                actions.append(self._move(client, self.pm.parked_origin.get(client["address"], PROJECT_WORKSPACES[0])))
+            elif client.get("pid") in owned_pids and not any(cls and cls in window_class for cls in app_classes):
+                # Aberta pelo projeto para um app que saiu do layout
+                actions.append({"action": "close", "address": client["address"], "class": client.get("class", "")})
+
+        # 4. Arquiteto no workspace 9 e foco no workspace 1
+        for client in self.wm.get_windows_by_pid(arquiteto_pid):
+            if client.get("address") and self._workspace_id(client) != ARQUITETO_WORKSPACE:
+                actions.append(self._move(client, ARQUITETO_WORKSPACE))
+
+        active_ws = self.wm.get_active_workspace()
+        if not active_ws or active_ws.get("id") != PROJECT_WORKSPACES[0]:
+            actions.append({"action": "focus", "workspace": PROJECT_WORKSPACES[0]})
+
+        return actions
+
+    def apply(self, project: Dict[str, Any], actions: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Executa as ações: um batch para move/close/focus, depois abre os apps faltando
+
+        Returns:
+            Quantidade de ações por tipo (+ "failed" com dispatches que falharam)
+        """
+        counts = {"move": 0, "close": 0, "launch": 0, "focus": 0, "failed": 0}
+        dispatched = [action for action in actions if action["action"] != "launch"]
+        launches = [action["spec"] for action in actions if action["action"] == "launch"]
+
+        if dispatched:
+            with self.wm.batch() as batch:
+                for action in dispatched:
+                    if action["action"] == "move":
+                        batch.add("movetoworkspacesilent", f"{action['workspace']},address:{action['address']}")
+                    elif action["action"] == "close":
+                        batch.add("closewindow", f"address:{action['address']}")
+                    elif action["action"] == "focus":
+                        batch.add("workspace", str(action["workspace"]))
+
+            for action, ok in zip(dispatched, batch.results):
+                if not ok:
+                    counts["failed"] += 1
+                    continue
+                counts[action["action"]] += 1
+                if action["action"] == "move":
+                    self._remember_origin(action)
+
+        if launches:
+            print(f"Abrindo {len(launches)} app(s) do projeto '{project['name']}'...")
+            self.pm.open_project(project, parallel=True, apps=launches)
+            counts["launch"] = len(launches)
+
+        return counts
+
+    def reconcile(self, project: Dict[str, Any], active_project: Optional[Dict[str, Any]] = None) -> Dict[str, int]:
+        """plan() + apply()"""
+        actions = self.plan(project, active_project)
+        for action in actions:
+            print(f"  [Layout] {self.describe(action)}")
+        return self.apply(project, actions)
+
+    @staticmethod
+    def describe(action: Dict[str, Any]) -> str:
+        """Texto curto de uma ação (para log)"""
+        kind = action["action"]
+        if kind == "move":
+            return f"mover {action['class']} {action['from']} → {action['workspace']}"
+        if kind == "close":
+            return f"fechar {action['class']}"
+        if kind == "launch":
+            return f"abrir {action['spec']['app']} no WS{action['spec']['workspace_id']}"
+        return f"focar WS{action['workspace']}"
+
+    # ===== Internos =====
+
+    def _move(self, client: Dict[str, Any], workspace: Any) -> Dict[str, Any]:
+        ws = client.get("workspace", {})
+        return {
+            "action": "move",
+            "address": client["address"],
+            "workspace": workspace,
+            "from": ws.get("id") if (ws.get("id") or 0) > 0 else ws.get("name"),
+            "class": client.get("class", ""),
+        }
+
+    def _remember_origin(self, action: Dict[str, Any]):
+        """Lembra de onde a janela saiu quando ela é estacionada"""
+        if str(action["workspace"]).startswith("special:"):
+            if isinstance(action["from"], int) and action["from"] > 0:
+                self.pm.parked_origin[action["address"]] = action["from"]
+        else:
+            self.pm.parked_origin.pop(action["address"], None)
+
+    @staticmethod
+    def _workspace_id(client: Dict[str, Any]) -> Optional[int]:
+        return client.get("workspace", {}).get("id")
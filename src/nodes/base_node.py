@@ -51,6 +51,10 @@ class BaseNode:
 
         print(f"Node '{self.config['label']}' criado: {self.node_id}")
 
+    def get_data(self) -> dict:
+        """Dados customizados do node (salvos no workflow); nodes sem conteúdo não têm"""
+        return {}
+
     def _create_input_attribute(self):
         """Cria atributo de entrada (pin de conexão)"""
         input_tag = f"{self.node_id}_input"
@@ -13,6 +13,9 @@ class NodeStateTracker:
     - Todos os nodes criados (id, tipo, instância)
     - Todos os links criados (conexões entre nodes)
     - Flag de mudanças não salvas
+
+    Com um EditJournal anexado (attach_journal), cada mutação também vira uma
+    linha no journal da sessão, para recuperar as edições após um crash.
     """
 
     _instance = None
@@ -30,6 +33,8 @@ class NodeStateTracker:
             self.links = []  # [{"id": str, "from_attr": str, "to_attr": str}]
             self.has_unsaved_changes = False
             self.current_workflow_name = None
+            self.journal = None  # EditJournal da sessão (opcional)
+            self.revision = 0  # Incrementa a cada edição (um save só vale se nada mudou desde o snapshot)
             NodeStateTracker._initialized = True
 
     # ===== Node Management =====
@@ -47,7 +52,13 @@ class NodeStateTracker:
             "type": node_type,
             "instance": node_instance,
         }
-        self.has_unsaved_changes = True
+        self._changed(
+            "add_node",
+            id=node_id,
+            type=node_type,
+            pos=list(node_instance.pos),
+            data=node_instance.get_data(),
+        )
         print(f"[NodeStateTracker] Node registrado: {node_id} (tipo: {node_type})")
 
     def remove_node(self, node_id: str):
@@ -59,7 +70,7 @@ class NodeStateTracker:
         """
         if node_id in self.nodes:
             del self.nodes[node_id]
-            self.has_unsaved_changes = True
+            self._changed("remove_node", id=node_id)
             print(f"[NodeStateTracker] Node removido: {node_id}")
 
             # Remover links associados a este node (checa pelos atributos)
@@ -69,6 +80,35 @@ class NodeStateTracker:
                 if not (link["from_attr"].startswith(node_id) or link["to_attr"].startswith(node_id))
             ]
 
+    def update_node_position(self, node_id: str, pos):
+        """
+        Atualiza a posição de um node (chamado enquanto ele é arrastado)
+
+        Args:
+            node_id: ID do node
+            pos: Posição (x, y) no editor
+        """
+        node = self.nodes.get(node_id)
+        if node is None:
+            return
+        pos = [pos[0], pos[1]]
+        if node.get("pos", list(node["instance"].pos)) == pos:
+            return
+        node["pos"] = pos
+        self._changed("move_node", id=node_id, pos=pos)
+
+    def update_node_data(self, node_id: str, data: dict):
+        """
+        Atualiza os dados customizados de um node (ex: {"project_name": "uberti"})
+
+        Args:
+            node_id: ID do node
+            data: Campos alterados
+        """
+        if node_id not in self.nodes:
+            return
+        self._changed("set_data", id=node_id, data=data)
+
     def get_node(self, node_id: str):
         """Retorna dados de um node específico"""
         return self.nodes.get(node_id)
@@ -98,7 +138,7 @@ class NodeStateTracker:
             "to_attr": to_attr,
         }
         self.links.append(link_data)
-        self.has_unsaved_changes = True
+        self._changed("add_link", id=link_id, from_attr=from_attr, to_attr=to_attr)
         print(f"[NodeStateTracker] Link registrado: {from_attr} -> {to_attr}")
 
     def remove_link(self, link_id: str):
@@ -109,7 +149,7 @@ class NodeStateTracker:
             link_id: ID do link a remover
         """
         self.links = [link for link in self.links if link["id"] != link_id]
-        self.has_unsaved_changes = True
+        self._changed("remove_link", id=link_id)
         print(f"[NodeStateTracker] Link removido: {link_id}")
 
     def get_all_links(self) -> list:
@@ -127,20 +167,68 @@ class NodeStateTracker:
         self.nodes.clear()
         self.links.clear()
         self.has_unsaved_changes = False
+        self.revision += 1
+        self._record("clear")
         print("[NodeStateTracker] Estado limpo")
 
     def mark_as_saved(self):
         """Marca o estado atual como salvo"""
         self.has_unsaved_changes = False
+        self._record("saved")
+
+    def mark_as_unsaved(self):
+        """Marca o estado atual como não salvo (ex: edições recuperadas do journal)"""
+        self.has_unsaved_changes = True
+        self._record("unsaved")
 
     def set_current_workflow(self, name: str):
         """Define o nome do workflow atual"""
         self.current_workflow_name = name
+        self._record("workflow", name=name)
 
     def get_current_workflow(self) -> str:
         """Retorna nome do workflow atual ou None"""
         return self.current_workflow_name
 
+    # ===== Journal =====
+
+    def attach_journal(self, journal):
+        """
+        Anexa o EditJournal da sessão (None desanexa)
+
+        O journal começa com o estado atual, para que snapshot + journal
+        reproduzam o editor mesmo que nodes já existam.
+        """
+        self.journal = journal
+        if journal is None:
+            return
+        self._record("clear")
+        self._record("workflow", name=self.current_workflow_name)
+        for node_id, node in self.nodes.items():
+            instance = node["instance"]
+            self._record(
+                "add_node",
+                id=node_id,
+                type=node["type"],
+                pos=node.get("pos", list(instance.pos)),
+                data=instance.get_data(),
+            )
+        for link in self.links:
+            self._record("add_link", id=link["id"], from_attr=link["from_attr"], to_attr=link["to_attr"])
+        if not self.has_unsaved_changes:
+            self._record("saved")
+
+    def _changed(self, op: str, **fields):
+        """Uma edição: marca como não salvo, avança a revisão e registra no journal"""
+        self.has_unsaved_changes = True
+        self.revision += 1
+        self._record(op, **fields)
+
+    def _record(self, op: str, **fields):
+        """Registra a mutação no journal (se houver)"""
+        if self.journal is not None:
+            self.journal.record(op, **fields)
+
     # ===== Debug =====
 
     def print_state(self):
@@ -5,6 +5,7 @@ Node Types - Implementações específicas de nodes
 
 import dearpygui.dearpygui as dpg
 from .base_node import BaseNode
+from .node_state_tracker import NodeStateTracker
 
 
 class WorkspaceNode(BaseNode):
@@ -29,8 +30,17 @@ class WorkspaceNode(BaseNode):
                 default_value="1",
                 tag=self.combo_id,
                 width=200,
+                callback=self._on_workspace_changed,
             )
 
+    def _on_workspace_changed(self, sender, app_data):
+        """Registra a troca de workspace (journal de edições)"""
+        NodeStateTracker().update_node_data(self.node_id, self.get_data())
+
+    def get_data(self) -> dict:
+        """Dados customizados do node"""
+        return {"workspace_number": self.get_workspace_number()}
+
     def get_workspace_number(self) -> int:
         """
         Retorna o número do workspace selecionado
@@ -49,11 +59,18 @@ class ProjetoIniciadoNode(BaseNode):
     Node especial "Projeto Iniciado" que tem input de texto
 
     Este node é o ponto de partida dos workflows
+
+    Enquanto o nome é digitado, mostra sugestões de projetos (ProjectSearch)
     """
 
+    # Busca de projetos (ProjectSearch), definida pelo app. None = sem sugestões
+    project_search = None
+    SUGGESTION_LIMIT = 5
+
     def __init__(self, node_id: str, config: dict, pos: tuple = (0, 0)):
         super().__init__(node_id, config, pos)
         self.input_id = f"{node_id}_input"
+        self.suggestions_id = f"{node_id}_suggestions"
 
     def _create_content_attribute(self):
         """
@@ -67,8 +84,39 @@ class ProjetoIniciadoNode(BaseNode):
                 tag=self.input_id,
                 hint="Ex: uberti, mecanica, amage...",
                 width=200,
+                callback=self._on_name_changed,
+            )
+            dpg.add_listbox(
+                items=[],
+                tag=self.suggestions_id,
+                num_items=self.SUGGESTION_LIMIT,
+                width=200,
+                show=False,
+                callback=self._on_suggestion_selected,
             )
 
+    def _on_name_changed(self, sender, app_data):
+        """Atualiza as sugestões a cada tecla"""
+        NodeStateTracker().update_node_data(self.node_id, {"project_name": app_data})
+        if self.project_search is None or not dpg.does_item_exist(self.suggestions_id):
+            return
+
+        names = [project["name"] for project in self.project_search.search(app_data, self.SUGGESTION_LIMIT)] if app_data.strip() else []
+        # Nome já completo: esconder a lista
+        if names and names[0] == app_data:
+            names = []
+        dpg.configure_item(self.suggestions_id, items=names, show=bool(names))
+
+    def _on_suggestion_selected(self, sender, app_data):
+        """Preenche o input com o projeto escolhido"""
+        dpg.set_value(self.input_id, app_data)
+        dpg.configure_item(self.suggestions_id, items=[], show=False)
+        NodeStateTracker().update_node_data(self.node_id, {"project_name": app_data})
+
+    def get_data(self) -> dict:
+        """Dados customizados do node"""
+        return {"project_name": self.get_project_name()}
+
     def get_project_name(self) -> str:
         """
         Retorna o nome do projeto digitado no input
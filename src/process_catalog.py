@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Process Catalog - Leitura única do /proc para localizar processos por nome
+Substitui um psutil.process_iter() por nome (com exe/cmdline) por uma só passada
+"""
+
+import re
+import psutil
+from typing import Dict, Iterable, List, Optional, Pattern
+
+
+class ProcessCatalog:
+    """
+    Encontra processos de vários nomes em uma única varredura do /proc
+
+    Só o campo "name" é lido (exe/cmdline exigem leituras extras por processo).
+    A comparação é por substring, sem diferenciar maiúsculas ("zed" casa com
+    "zed-editor"), como o antigo get_process_by_name.
+
+    Uso:
+        catalog = ProcessCatalog(["zed", "zen-browser", "kitty"])
+        victims = catalog.scan()  # {"zed": [Process, ...], "kitty": [...]}
+    """
+
+    def __init__(self, names: Iterable[str]):
+        # Nomes mais longos primeiro: "zen-browser" ganha de "zen" no mesmo processo
+        self.names = sorted(
+            {name.strip().lower() for name in names if name and name.strip()},
+            key=len,
+            reverse=True,
+        )
+        self.matcher = self.build_matcher(self.names)
+
+    @staticmethod
+    def build_matcher(names: List[str]) -> Optional[Pattern]:
+        """Compila um único regex com todos os nomes (alternação de substrings)"""
+        if not names:
+            return None
+        return re.compile("|".join(re.escape(name) for name in names))
+
+    def match(self, process_name: str) -> Optional[str]:
+        """Retorna o nome alvo que casa com o processo (ou None)"""
+        if self.matcher is None or not process_name:
+            return None
+        found = self.matcher.search(process_name.lower())
+        return found.group(0) if found else None
+
+    def scan(self, exclude_pids: Optional[Iterable[int]] = None) -> Dict[str, List[psutil.Process]]:
+        """
+        Varre o /proc uma vez e agrupa os processos encontrados por nome alvo
+
+        Args:
+            exclude_pids: PIDs que nunca devem ser retornados (ex: o próprio Arquiteto)
+
+        Returns:
+            {nome_alvo: [Process, ...]} (só nomes com pelo menos um processo)
+        """
+        groups: Dict[str, List[psutil.Process]] = {}
+        if self.matcher is None:
+            return groups
+
+        excluded = set(exclude_pids) if exclude_pids else set()
+        for proc in psutil.process_iter(["name"]):
+            if proc.pid in excluded:
+                continue
+            target = self.match(proc.info.get("name") or "")
+            if target:
+                groups.setdefault(target, []).append(proc)
+        return groups
+
+    def processes(self, exclude_pids: Optional[Iterable[int]] = None) -> List[psutil.Process]:
+        """Mesma varredura de scan(), mas em uma lista única"""
+        return [proc for procs in self.scan(exclude_pids).values() for proc in procs]
+
+
+def kill_by_name(names: Iterable[str], exclude_pids: Optional[Iterable[int]] = None) -> Dict[str, int]:
+    """
+    Envia SIGKILL para todos os processos dos nomes informados (uma varredura)
+
+    Returns:
+        {nome_alvo: quantidade de processos mortos}
+    """
+    killed: Dict[str, int] = {}
+    for name, procs in ProcessCatalog(names).scan(exclude_pids).items():
+        for proc in procs:
+            try:
+                proc.kill()
+                killed[name] = killed.get(name, 0) + 1
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+    return killed
+
+
+# Teste basico
+if __name__ == "__main__":
+    import time
+
+    names = ["zed", "zen-browser", "cursor", "ghostty", "kitty", "alacritty", "python"]
+
+    # Antes: uma varredura completa (com exe/cmdline) por nome
+    start = time.perf_counter()
+    old_total = 0
+    for name in names:
+        for proc in psutil.process_iter(["name", "exe", "cmdline"]):
+            proc_name = (proc.info["name"] or "").lower()
+            if name in proc_name:
+                old_total += 1
+    old_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    groups = ProcessCatalog(names).scan()
+    new_ms = (time.perf_counter() - start) * 1000
+
+    for name, procs in groups.items():
+        print(f"  {name}: {[p.pid for p in procs]}")
+    print(f"Varredura por nome: {old_ms:.1f}ms ({old_total} processos)")
+    print(f"ProcessCatalog:     {new_ms:.1f}ms ({sum(len(p) for p in groups.values())} processos)")
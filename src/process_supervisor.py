@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""
+Process Supervisor - Processos de cada projeto (PID + descendentes) vigiados via pidfd
+Fechar um projeto sinaliza só a árvore dele e recebe a notificação de saída sem polling
+"""
+
+import os
+import select
+import signal
+import threading
+import psutil
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from database import Database
+from database_writer import DatabaseWriter
+
+
+# Callback de saída: callback(pid, ids_dos_projetos_que_eram_donos)
+ExitCallback = Callable[[int, Set[int]], None]
+
+
+class ProcessSupervisor:
+    """
+    Mapa de posse projeto → processos, persistido na tabela project_processes
+
+    Cada processo adotado ganha um pidfd (os.pidfd_open) registrado em um epoll;
+    uma thread espera no epoll e remove o processo do mapa quando ele sai.
+    O pidfd também é usado para sinalizar (signal.pidfd_send_signal), então um
+    PID reutilizado por outro processo nunca recebe o sinal.
+
+    Apps de instância única (ex: Zed com várias janelas) podem ter o mesmo PID
+    em dois projetos: esse PID é "compartilhado" e não é sinalizado ao fechar
+    um só dos projetos (só a janela do projeto deve ser fechada).
+
+    As escritas em project_processes passam pelo DatabaseWriter (a thread de
+    supervisão não abre transações próprias).
+    """
+
+    def __init__(self, db: Database, writer: Optional[DatabaseWriter] = None):
+        self.db = db
+        self.writer = writer if writer else DatabaseWriter(db)  # Não iniciado: grava na hora
+        self.supported = hasattr(os, "pidfd_open") and hasattr(select, "epoll")
+
+        self._owned: Dict[int, Dict[int, Dict[str, Any]]] = {}  # {project_id: {pid: processo}}
+        self._fds: Dict[int, int] = {}  # {pid: pidfd}
+        self._fd_pids: Dict[int, int] = {}  # {pidfd: pid}
+        self._callbacks: List[ExitCallback] = []
+        self._cond = threading.Condition(threading.RLock())
+
+        self._epoll = None
+        self._wake_r = self._wake_w = -1
+        self._thread = None
+        self._running = False
+
+    # ===== Ciclo de vida =====
+
+    def start(self) -> bool:
+        """
+        Inicia a thread de supervisão e recarrega o mapa salvo no banco
+
+        Returns:
+            True se a supervisão via pidfd está ativa
+        """
+        if self._running:
+            return True
+
+        if self.supported:
+            try:
+                self._epoll = select.epoll()
+                self._wake_r, self._wake_w = os.pipe()
+                self._epoll.register(self._wake_r, select.EPOLLIN)
+            except OSError as e:
+                print(f"Erro ao iniciar supervisão de processos: {e}")
+                self.supported = False
+
+        if self.supported:
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name="process-supervisor", daemon=True)
+            self._thread.start()
+
+        self.restore()
+        return self.supported
+
+    def stop(self):
+        """Para a thread de supervisão (não mata nenhum processo)"""
+        if not self._running:
+            return
+        self._running = False
+        os.write(self._wake_w, b"x")
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1)
+        self._thread = None
+
+        with self._cond:
+            for fd in list(self._fd_pids):
+                self._close_fd(fd)
+            self._epoll.close()
+            os.close(self._wake_r)
+            os.close(self._wake_w)
+            self._epoll = None
+
+    def restore(self) -> int:
+        """
+        Recarrega o mapa salvo no banco (após reiniciar o Arquiteto)
+
+        Processos que já saíram, ou cujo PID foi reutilizado (create_time diferente),
+        são removidos do banco.
+
+        Returns:
+            Quantidade de processos ainda vivos recarregados
+        """
+        alive = 0
+        stale = []
+        for row in self.db.get_project_processes():
+            if self._watch(row["pid"], row["create_time"]):
+                with self._cond:
+                    self._owned.setdefault(row["project_id"], {})[row["pid"]] = row
+                alive += 1
+            else:
+                stale.append(row["pid"])
+
+        if stale:
+            self.writer.submit(self.db.remove_project_processes, stale)
+        return alive
+
+    # ===== Posse =====
+
+    def adopt(self, project_id: int, pid: int, app: str = "", address: str = "") -> List[int]:
+        """
+        Registra um processo (e todos os seus descendentes) como do projeto
+
+        Args:
+            pid: PID da janela do app (ex: client["pid"] do Hyprland)
+            address: Janela do projeto nesse processo (usada se o PID for compartilhado)
+
+        Returns:
+            PIDs adotados
+        """
+        if pid <= 0 or pid == os.getpid():
+            return []
+
+        try:
+            root = psutil.Process(pid)
+            tree = [root] + root.children(recursive=True)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return []
+
+        return self._adopt_tree(project_id, pid, tree, app, address)
+
+    def refresh(self, project_id: int) -> List[int]:
+        """Adota descendentes criados depois da adoção (ex: language servers do editor)"""
+        with self._cond:
+            roots = {
+                (info["root_pid"], info.get("app", ""), info.get("address", ""))
+                for pid, info in self._owned.get(project_id, {}).items()
+                if pid == info["root_pid"]
+            }
+
+        adopted = []
+        for root_pid, app, address in roots:
+            try:
+                children = psutil.Process(root_pid).children(recursive=True)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+            with self._cond:
+                known = self._owned.get(project_id, {})
+                new = [proc for proc in children if proc.pid not in known]
+            if new:
+                adopted += self._adopt_tree(project_id, root_pid, new, app, address)
+        return adopted
+
+    def forget_project(self, project_id: int):
+        """Esquece os processos de um projeto (sem sinalizar)"""
+        with self._cond:
+            owned = self._owned.pop(project_id, {})
+            for pid in owned:
+                if not self.owners(pid):
+                    self._unwatch(pid)
+        if owned:
+            self.writer.submit(self.db.remove_project_processes, list(owned), project_id)
+
+    def project_pids(self, project_id: int) -> List[int]:
+        """PIDs vivos do projeto"""
+        with self._cond:
+            return sorted(self._owned.get(project_id, {}))
+
+    def project_processes(self, project_id: int) -> List[Dict[str, Any]]:
+        """Processos vivos do projeto ({"pid", "root_pid", "app", "address", "create_time"})"""
+        with self._cond:
+            return [dict(info) for info in self._owned.get(project_id, {}).values()]
+
+    def owners(self, pid: int) -> Set[int]:
+        """Projetos donos de um PID"""
+        with self._cond:
+            return {project_id for project_id, owned in self._owned.items() if pid in owned}
+
+    def has_processes(self, project_id: int) -> bool:
+        """True se o projeto tem algum processo vivo registrado"""
+        with self._cond:
+            return bool(self._owned.get(project_id))
+
+    # ===== Sinais =====
+
+    def signal_project(self, project_id: int, sig: int = signal.SIGKILL) -> Tuple[List[int], List[str]]:
+        """
+        Sinaliza a árvore de processos do projeto
+
+        PIDs compartilhados com outros projetos não são sinalizados: as janelas
+        deste projeto neles são retornadas para serem fechadas via closewindow.
+
+        Returns:
+            (PIDs sinalizados, endereços de janelas em processos compartilhados)
+        """
+        own, shared_addresses = self.split_shared(project_id)
+        signaled = [info["pid"] for info in own if self.send_signal(info["pid"], sig)]
+        return signaled, shared_addresses
+
+    def split_shared(self, project_id: int) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """
+        Separa os processos só do projeto dos compartilhados com outros projetos
+
+        Returns:
+            (processos só do projeto, endereços das janelas do projeto em processos compartilhados)
+        """
+        self.refresh(project_id)
+
+        own = []
+        shared_addresses = []
+        for info in self.project_processes(project_id):
+            pid = info["pid"]
+            if self.owners(pid) - {project_id}:
+                if info.get("address") and pid == info["root_pid"]:
+                    shared_addresses.append(info["address"])
+            else:
+                own.append(info)
+        return own, shared_addresses
+
+    def signal_all(self, sig: int = signal.SIGKILL) -> List[int]:
+        """Sinaliza os processos de todos os projetos (inclusive os compartilhados)"""
+        with self._cond:
+            project_ids = list(self._owned)
+        for project_id in project_ids:
+            self.refresh(project_id)
+
+        with self._cond:
+            pids = {pid for owned in self._owned.values() for pid in owned}
+        return [pid for pid in sorted(pids) if self.send_signal(pid, sig)]
+
+    def send_signal(self, pid: int, sig: int) -> bool:
+        """Envia um sinal pelo pidfd (imune a reutilização de PID)"""
+        with self._cond:
+            fd = self._fds.get(pid)
+        try:
+            if fd is not None:
+                signal.pidfd_send_signal(fd, sig)
+            elif self.supported:
+                return False  # Sem pidfd: o processo já saiu
+            else:
+                os.kill(pid, sig)
+            return True
+        except (ProcessLookupError, PermissionError):
+            return False
+
+    def wait_pids(self, pids: Iterable[int], timeout: float) -> List[int]:
+        """
+        Espera os processos saírem (notificação do epoll, sem polling)
+
+        Returns:
+            PIDs que ainda estavam vivos quando o timeout expirou
+        """
+        pids = set(pids)
+        if not self.supported:
+            procs = []
+            for pid in pids:
+                try:
+                    procs.append(psutil.Process(pid))
+                except psutil.NoSuchProcess:
+                    pass
+            _, alive = psutil.wait_procs(procs, timeout=timeout)
+            return sorted(proc.pid for proc in alive)
+
+        with self._cond:
+            self._cond.wait_for(lambda: not (pids & self._fds.keys()), timeout)
+            return sorted(pids & self._fds.keys())
+
+    # ===== Notificações =====
+
+    def subscribe(self, callback: ExitCallback):
+        """Registra callback chamado quando um processo supervisionado sai"""
+        with self._cond:
+            self._callbacks.append(callback)
+
+    def unsubscribe(self, callback: ExitCallback):
+        """Remove callback registrado"""
+        with self._cond:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    # ===== Internos =====
+
+    def _adopt_tree(self, project_id: int, root_pid: int, procs: List[psutil.Process], app: str, address: str) -> List[int]:
+        rows = []
+        for proc in procs:
+            try:
+                create_time = proc.create_time()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+            if proc.pid == os.getpid() or not self._watch(proc.pid, create_time):
+                continue
+            rows.append({
+                "project_id": project_id,
+                "pid": proc.pid,
+                "root_pid": root_pid,
+                "app": app,
+                "address": address if proc.pid == root_pid else "",
+                "create_time": create_time,
+            })
+
+        if rows:
+            with self._cond:
+                owned = self._owned.setdefault(project_id, {})
+                for row in rows:
+                    owned[row["pid"]] = row
+            self.writer.submit(self.db.add_project_processes, project_id, rows)
+        return [row["pid"] for row in rows]
+
+    def _watch(self, pid: int, create_time: float) -> bool:
+        """Abre o pidfd do processo (False se ele já saiu ou o PID foi reutilizado)"""
+        if not self.supported:
+            try:
+                return psutil.Process(pid).create_time() == create_time
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                return False
+
+        with self._cond:
+            if pid in self._fds:
+                return True
+            try:
+                fd = os.pidfd_open(pid)
+            except OSError:
+                return False
+
+            # O pidfd aponta para o processo atual do PID: conferir que é o mesmo
+            try:
+                same = psutil.Process(pid).create_time() == create_time
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                same = False
+            if not same:
+                os.close(fd)
+                return False
+
+            self._fds[pid] = fd
+            self._fd_pids[fd] = pid
+            if self._epoll is not None:
+                self._epoll.register(fd, select.EPOLLIN)
+            return True
+
+    def _unwatch(self, pid: int):
+        with self._cond:
+            fd = self._fds.get(pid)
+            if fd is not None:
+                self._close_fd(fd)
+
+    def _close_fd(self, fd: int):
+        pid = self._fd_pids.pop(fd, None)
+        if pid is not None:
+            self._fds.pop(pid, None)
+        if self._epoll is not None:
+            try:
+                self._epoll.unregister(fd)
+            except (OSError, ValueError):
+                pass
+        os.close(fd)
+
+    def _run(self):
+        while self._running:
+            try:
+                ready = self._epoll.poll()
+            except (OSError, ValueError):
+                break
+            for fd, _ in ready:
+                if fd == self._wake_r:
+                    return
+                self._on_exit(fd)
+
+    def _on_exit(self, fd: int):
+        """pidfd ficou legível: o processo saiu"""
+        with self._cond:
+            pid = self._fd_pids.get(fd)
+            if pid is None:
+                return
+            self._close_fd(fd)
+
+            owners = set()
+            for project_id in list(self._owned):
+                if self._owned[project_id].pop(pid, None) is not None:
+                    owners.add(project_id)
+                if not self._owned[project_id]:
+                    del self._owned[project_id]
+
+            callbacks = list(self._callbacks)
+            self._cond.notify_all()
+
+        self.writer.submit(self.db.remove_project_processes, [pid])
+        for callback in callbacks:
+            try:
+                callback(pid, owners)
+            except Exception as e:
+                print(f"Erro em callback de saída de processo ({pid}): {e}")
+
+
+# Teste basico
+if __name__ == "__main__":
+    import subprocess
+    import tempfile
+    import time
+
+    db = Database(os.path.join(tempfile.mkdtemp(), "supervisor_test.db"))
+    supervisor = ProcessSupervisor(db)
+    print(f"pidfd/epoll disponível: {supervisor.start()}")
+    supervisor.subscribe(lambda pid, owners: print(f"  Saiu: {pid} (projetos {sorted(owners)})"))
+
+    # Um "app" com um filho, para cada projeto
+    apps = [subprocess.Popen(["bash", "-c", "sleep 60 & wait"]) for _ in range(2)]
+    time.sleep(0.1)
+    for project_id, app in enumerate(apps, start=1):
+        print(f"Projeto {project_id}: adotados {supervisor.adopt(project_id, app.pid, 'bash')}")
+
+    start = time.perf_counter()
+    signaled, _ = supervisor.signal_project(1, signal.SIGTERM)
+    alive = supervisor.wait_pids(signaled, timeout=2)
+    print(f"Projeto 1 fechado em {(time.perf_counter() - start) * 1000:.1f}ms (vivos: {alive})")
+    print(f"Projeto 2 intacto: {supervisor.project_pids(2)}")
+
+    supervisor.signal_project(2, signal.SIGKILL)
+    for app in apps:
+        app.wait()
+    supervisor.stop()
@@ -3,74 +3,112 @@
 Project Manager - Gerenciamento de abertura/fechamento de projetos
 """
 
+import os
+import signal
 import subprocess
+import threading
 import time
 import psutil
-from typing import Optional, Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Set
 from database import Database
+from project_repository import ProjectRepository
+from workspace_manager import WorkspaceManager
+from process_catalog import ProcessCatalog, kill_by_name
+from process_supervisor import ProcessSupervisor
+from ram_monitor import RAMMonitor
+from warm_pool import WarmAppPool
+from layout_reconciler import LayoutReconciler
+from launch_telemetry import LaunchTelemetry
+from launch_timing import LaunchTimingModel
+from constants import (
+    APP_WINDOW_CLASSES, SHUTDOWN_TIMEOUT, WARM_POOL_SIZES, PROJECT_WORKSPACES, HOTKEY_DELAY_BEFORE, HOTKEY_DELAY_AFTER
+)
 
 
 class ProjectManager:
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, workspace_manager: Optional[WorkspaceManager] = None,
+                 ram_monitor: Optional[RAMMonitor] = None, warm_pool_sizes: Optional[Dict[str, int]] = None,
+                 projects: Optional[ProjectRepository] = None):
         self.db = db
+        # Projetos em memória (leituras sem banco; escritas passam por aqui)
+        self.projects = projects if projects is not None else ProjectRepository(db)
+        # Todas as operações de janela/workspace passam pelo socket IPC do Hyprland
+        self.workspace_manager = workspace_manager if workspace_manager else WorkspaceManager()
+        # Processos abertos por cada projeto (persistido em projects.db)
+        self.supervisor = ProcessSupervisor(db, self.projects.writer)
+        self.supervisor.start()
+        # Workspace de origem das janelas estacionadas: {address: workspace_id}
+        self.parked_origin: Dict[str, int] = {}
+        # Instâncias pré-abertas (opcional; desativado com WARM_POOL_SIZES vazio)
+        self.warm_pool = WarmAppPool(
+            self.workspace_manager,
+            ram_monitor,
+            WARM_POOL_SIZES if warm_pool_sizes is None else warm_pool_sizes,
+        )
+        self.warm_pool.start()
+        # Diferença layout desejado x janelas vivas (usado pelo switch_project)
+        self.reconciler = LayoutReconciler(self)
+        # Tempo de cada troca/abertura (gravado em background na tabela launch_events)
+        self.telemetry = LaunchTelemetry(db, self.projects.writer)
+        self.telemetry.start()
+        # Esperas de janela/hotkey aprendidas do histórico da telemetria
+        self.timing = LaunchTimingModel(self.telemetry)
+        # Uma troca de projeto por vez; a mais recente na fila vence
+        self._switch_running = threading.Lock()
+        self._switch_lock = threading.Lock()
+        self._switch_ticket = 0
+
+    def shutdown(self):
+        """
+        Para as threads de background (chamar antes de parar o DatabaseWriter)
+
+        A telemetria grava os eventos ainda na fila, o pool fecha as instâncias
+        ociosas e o supervisor para de vigiar (os processos dos projetos continuam).
+        """
+        self.telemetry.stop()
+        self.warm_pool.stop()
+        self.supervisor.stop()
 
     def get_process_by_name(self, name: str) -> List[psutil.Process]:
         """Retorna lista de processos por nome"""
-        processes = []
-        for proc in psutil.process_iter(['name', 'exe', 'cmdline']):
-            try:
-                proc_name = proc.info['name'].lower() if proc.info['name'] else ""
-                if name.lower() in proc_name:
-                    processes.append(proc)
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                pass
-        return processes
-
-    def kill_processes(self, process_names: List[str]):
-        """Mata processos por nome"""
-        for name in process_names:
-            try:
-                # Primeiro tenta pkill (mais rapido)
-                subprocess.run(["pkill", "-9", name], capture_output=True, timeout=2)
-                time.sleep(0.1)
-            except:
-                pass
-
-            # Depois verifica se ainda existem processos e mata via psutil
-            processes = self.get_process_by_name(name)
-            for proc in processes:
-                try:
-                    proc.kill()
-                except:
-                    pass
+        return ProcessCatalog([name]).processes()
+
+    def kill_processes(self, process_names: List[str]) -> Dict[str, int]:
+        """
+        Mata processos por nome
+
+        Uma única varredura do /proc encontra todos os nomes de uma vez
+        (antes: pkill + varredura completa para cada nome).
+
+        Returns:
+            {nome: quantidade de processos mortos}
+        """
+        try:
+            return kill_by_name(process_names, exclude_pids=[os.getpid()])
+        except Exception as e:
+            print(f"Erro ao matar processos: {e}")
+            return {}
 
     def close_all_windows_in_workspace(self, workspace_id: int):
         """Fecha todas as janelas de um workspace especifico"""
-        try:
-            result = subprocess.run(
-                ["hyprctl", "clients", "-j"],
-                capture_output=True,
-                text=True,
-                timeout=2
-            )
+        self.close_all_windows_in_workspaces([workspace_id])
 
-            if result.returncode == 0:
-                import json
-                clients = json.loads(result.stdout)
-
-                for client in clients:
-                    ws = client.get("workspace", {})
-                    if ws.get("id") == workspace_id:
-                        address = client.get("address", "")
-                        if address:
-                            subprocess.run(
-                                ["hyprctl", "dispatch", "closewindow", f"address:{address}"],
-                                capture_output=True,
-                                timeout=1
-                            )
-                            time.sleep(0.05)
+    def close_all_windows_in_workspaces(self, workspace_ids: List[int]):
+        """Fecha todas as janelas dos workspaces informados (um único batch)"""
+        try:
+            addresses = [
+                client.get("address", "")
+                for ws_id in workspace_ids
+                for client in self.workspace_manager.get_windows_in_workspace(ws_id)
+                if client.get("address")
+            ]
+
+            if addresses:
+                results = self.workspace_manager.close_windows(addresses)
+                print(f"{sum(results)}/{len(addresses)} janela(s) fechada(s) nos workspaces {workspace_ids}")
         except Exception as e:
-            print(f"Erro ao fechar janelas do workspace {workspace_id}: {e}")
+            print(f"Erro ao fechar janelas dos workspaces {workspace_ids}: {e}")
 
     def parse_hotkey(self, hotkey_string: str) -> Optional[List[str]]:
         """
@@ -158,12 +196,13 @@ class ProjectManager:
 
         return cmd
 
-    def send_hotkey(self, window_address: str, hotkey_string: str, delay_before: float = 0.5, delay_after: float = 0.3) -> bool:
+    def send_hotkey(self, window_address: str, hotkey_string: str, delay_before: float = HOTKEY_DELAY_BEFORE,
+                    delay_after: float = HOTKEY_DELAY_AFTER) -> bool:
         """
         Envia atalho de teclado para uma janela específica
 
         Args:
-            window_address: Endereço da janela (hyprctl)
+            window_address: Endereço da janela (Hyprland)
             hotkey_string: String do atalho (ex: "ctrl+shift+e")
             delay_before: Delay antes de enviar (para janela estabilizar)
             delay_after: Delay após enviar
@@ -181,15 +220,13 @@ class ProjectManager:
 
         try:
             # Aguardar janela estabilizar
-            time.sleep(delay_before)
+            if delay_before > 0:
+                time.sleep(delay_before)
 
-            # Focar a janela
-            subprocess.run(
-                ["hyprctl", "dispatch", "focuswindow", f"address:{window_address}"],
-                capture_output=True,
-                timeout=1
-            )
-            time.sleep(0.2)
+            # Focar a janela (e esperar o Hyprland confirmar o foco)
+            self.workspace_manager.focus_window(window_address)
+            if not self.workspace_manager.wait_for_focus(window_address, timeout=0.5):
+                print(f"AVISO: Janela {window_address} não recebeu foco, enviando atalho mesmo assim")
 
             # Enviar atalho via wtype
             result = subprocess.run(
@@ -222,27 +259,9 @@ class ProjectManager:
         try:
             print(f"[DEBUG] Claude Code: folder_path = '{folder_path}'")
 
-            # 1. Ir para o workspace
-            subprocess.run(
-                ["hyprctl", "dispatch", "workspace", str(workspace_id)],
-                capture_output=True,
-                timeout=1
-            )
-
-            time.sleep(0.2)
-
-            # 2. Abrir ghostty no diretório do projeto E executar "claude" diretamente
-            # Ghostty aceita -e para executar comando
-            # Usamos bash -c para executar "claude" no diretório correto
-            subprocess.Popen(
-                [
-                    "ghostty",
-                    f"--working-directory={folder_path}",
-                    "-e", "bash", "-c", "claude"
-                ],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL
-            )
+            # Ghostty no diretório do projeto executando "claude" direto no workspace alvo
+            if not self.exec_app_in_workspace("claude-code", workspace_id, folder_path):
+                return False
 
             print(f"Claude Code iniciado via terminal no WS{workspace_id}")
             return True
@@ -251,371 +270,714 @@ class ProjectManager:
             print(f"Erro ao abrir Claude Code via terminal: {e}")
             return False
 
-    def open_app_in_workspace(self, app_name: str, workspace_id: int, folder_path: Optional[str] = None, zen_container: Optional[str] = None, hotkey: Optional[str] = None):
-        """Abre um app em um workspace especifico e opcionalmente envia atalho de teclado"""
-        try:
-            # Primeiro vai para o workspace
-            subprocess.run(
-                ["hyprctl", "dispatch", "workspace", str(workspace_id)],
-                capture_output=True,
-                timeout=1
-            )
+    def open_app_in_workspace(self, app_name: str, workspace_id: int, folder_path: Optional[str] = None, zen_container: Optional[str] = None, hotkey: Optional[str] = None, project_id: Optional[int] = None, args: Optional[List[str]] = None,
+                              timing: Optional[Dict[str, Any]] = None):
+        """
+        Abre um app em um workspace especifico e opcionalmente envia atalho de teclado
 
-            time.sleep(0.2)
-
-            # Se é Zen, usar ZenController com container
-            if app_name.lower() in ["zen-browser", "zen"]:
-                from zen_controller import ZenController
-                zen = ZenController()
-                if zen_container:
-                    zen.open_container(zen_container)
-                else:
-                    zen.open_zen()
-                time.sleep(0.3)
-                return True
+        O app é disparado com regra de workspace ("dispatch exec [workspace N silent]"):
+        a janela já nasce no workspace certo, sem trocar o workspace visível.
+        Em vez de sleeps fixos, espera a janela do app aparecer (eventos do Hyprland).
 
-            # Se é Claude Code, abrir via terminal com comando "claude"
-            if app_name.lower() == "claude-code":
-                if folder_path:
-                    return self.open_claude_code_in_terminal(workspace_id, folder_path)
-                else:
-                    print("AVISO: Claude Code precisa de folder_path para abrir")
-                    return False
-
-            # Mapa de apps para comandos (SEM folder_path aqui)
-            app_commands = {
-                "zed": ["zeditor"],  # Zed no Arch é "zeditor", não "zed"
-                "terminal": ["ghostty"],
-                "ghostty": ["ghostty"],
-                "kitty": ["kitty"],
-                "alacritty": ["alacritty"],
-                "cursor": ["cursor"],
-                # "claude-code" é tratado separadamente acima
-            }
+        Com project_id, o processo da janela (e descendentes) é registrado no projeto.
+        args são argumentos extras do comando (apps com args não usam o warm pool).
+
+        timing (dict do open_project) recebe "total_ms": disparo → janela apareceu
+        (+ espera/envio do hotkey). Sem hotkey a janela é esperada em background:
+        aí timing ganha "deferred" e a thread registra o open_app quando ela aparece.
+        """
+        if timing is None:
+            timing = {}
+        try:
+            app = app_name.lower()
+
+            # Instância pré-aberta do pool: sem cold start
+            claim_start = time.monotonic()
+            window = None if args else self.warm_pool.claim(app, workspace_id, folder_path)
+            if window:
+                timing["pooled"] = True
+                self._adopt_window(project_id, app_name, window)
+                if hotkey and hotkey.strip():
+                    print(f"Enviando hotkey '{hotkey}' para {app_name}...")
+                    self._send_hotkey_when_ready(app_name, window, hotkey, claim_start, record=False)
+                timing["total_ms"] = (time.monotonic() - claim_start) * 1000
+                return True
 
-            command = app_commands.get(app_name.lower())
-            if not command:
-                print(f"App desconhecido: {app_name}")
+            # Preparar a espera ANTES de abrir o app (para não perder o evento openwindow)
+            # Janelas do mesmo app que já existiam não contam como "a nova janela"
+            expected_class = APP_WINDOW_CLASSES.get(app)
+            waiter = None
+            if expected_class:
+                existing = {
+                    client.get("address")
+                    for client in self.workspace_manager.get_windows_by_class(expected_class)
+                }
+                waiter = self.workspace_manager.expect_window(expected_class, workspace_id=workspace_id, exclude=existing)
+
+            started = time.monotonic()
+            if not self.exec_app_in_workspace(app, workspace_id, folder_path, zen_container, args):
+                timing["total_ms"] = (time.monotonic() - started) * 1000
+                if waiter:
+                    waiter.cancel()
                 return False
 
-            # Adicionar folder_path aos comandos se aplicavel
-            if folder_path:
-                if app_name.lower() in ["zed", "cursor"]:
-                    # Zed/Cursor: folder_path como argumento
-                    command = command + [folder_path]
-                elif app_name.lower() == "ghostty":
-                    # Ghostty: usar --working-directory
-                    command = ["ghostty", "--working-directory", folder_path]
-                elif app_name.lower() in ["kitty", "alacritty"]:
-                    # Kitty/Alacritty: usar --directory
-                    command = command + ["--directory", folder_path]
-
-            # Abre o app
-            subprocess.Popen(
-                command,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL
-            )
+            # Sem classe de janela conhecida: nada a esperar (nem a medir)
+            if waiter is None:
+                return True
 
-            time.sleep(0.5)  # Aguardar app abrir
+            if not (hotkey and hotkey.strip()):
+                # Registrar o processo e medir a abertura: esperar a janela em background
+                timing["deferred"] = True
+                threading.Thread(
+                    target=self._adopt_when_ready,
+                    args=(waiter, project_id, app_name, workspace_id, started, timing, self.telemetry.current_run_id()),
+                    daemon=True,
+                ).start()
+                return True
 
-            # Garantir que Zed fique no workspace correto (Zed às vezes abre em workspace errado)
-            if app_name.lower() == "zed":
-                time.sleep(1.0)  # Zed precisa de mais tempo para carregar pasta
-                try:
-                    result = subprocess.run(
-                        ["hyprctl", "clients", "-j"],
-                        capture_output=True,
-                        text=True,
-                        timeout=2
-                    )
-                    if result.returncode == 0:
-                        import json
-                        clients = json.loads(result.stdout)
-                        for client in clients:
-                            if "zed" in client.get("class", "").lower():
-                                # Se Zed está em outro workspace, mover
-                                ws = client.get("workspace", {})
-                                if ws.get("id") != workspace_id:
-                                    address = client.get("address", "")
-                                    subprocess.run(
-                                        ["hyprctl", "dispatch", "movetoworkspacesilent", f"{workspace_id},address:{address}"],
-                                        capture_output=True,
-                                        timeout=1
-                                    )
-                                    print(f"Zed movido para workspace {workspace_id}")
-                                break
-                except Exception as e:
-                    print(f"Aviso: Não consegui garantir Zed no workspace {workspace_id}: {e}")
-
-            # Enviar hotkey se configurado (lógica genérica para qualquer app)
-            if hotkey and hotkey.strip():
-                time.sleep(0.5)  # Aguardar app carregar completamente
+            window = self._wait_app_window(waiter, app_name, project_id, workspace_id, started)
+            if not window:
+                timing["total_ms"] = (time.monotonic() - started) * 1000
+                timing["window_failed"] = True
+                return True
 
-                try:
-                    # Buscar endereço da janela recém-aberta
-                    result = subprocess.run(
-                        ["hyprctl", "clients", "-j"],
-                        capture_output=True,
-                        text=True,
-                        timeout=2
-                    )
+            self._adopt_window(project_id, app_name, window)
 
-                    if result.returncode == 0:
-                        import json
-                        clients = json.loads(result.stdout)
-
-                        # Mapa de apps para class names
-                        app_class_map = {
-                            "zed": "zed",
-                            "zen-browser": "zen",
-                            "zen": "zen",
-                            "terminal": "ghostty",
-                            "ghostty": "ghostty",
-                            "kitty": "kitty",
-                            "cursor": "cursor",
-                            "alacritty": "alacritty",
-                            "claude-code": "ghostty",  # Claude Code roda em terminal
-                        }
-
-                        expected_class = app_class_map.get(app_name.lower(), "").lower()
-
-                        # Encontrar janela do app no workspace correto
-                        for client in clients:
-                            ws = client.get("workspace", {})
-                            if ws.get("id") == workspace_id:
-                                class_name = client.get("class", "").lower()
-
-                                # Verificar se é o app que acabamos de abrir
-                                if expected_class and expected_class in class_name:
-                                    address = client.get("address", "")
-                                    if address:
-                                        print(f"Enviando hotkey '{hotkey}' para {app_name}...")
-                                        self.send_hotkey(address, hotkey)
-                                    break
-                except Exception as e:
-                    print(f"Erro ao enviar hotkey para {app_name}: {e}")
+            # Enviar hotkey (lógica genérica para qualquer app)
+            print(f"Enviando hotkey '{hotkey}' para {app_name}...")
+            self._send_hotkey_when_ready(app_name, window, hotkey, time.monotonic(), project_id, workspace_id)
+            timing["total_ms"] = (time.monotonic() - started) * 1000
 
             return True
         except Exception as e:
             print(f"Erro ao abrir {app_name} no workspace {workspace_id}: {e}")
             return False
 
-    def close_project(self, project: Dict[str, Any]):
-        """Fecha um projeto (mata processos e limpa workspaces)"""
+    def _adopt_window(self, project_id: Optional[int], app_name: str, window: Dict[str, Any]):
+        """Registra o processo da janela (e descendentes) no projeto"""
+        if project_id is None:
+            return
+        pids = self.supervisor.adopt(project_id, window.get("pid", -1), app_name, window.get("address", ""))
+        if not pids:
+            print(f"AVISO: Processo de {app_name} não pôde ser registrado no projeto")
+
+    def _adopt_when_ready(self, waiter, project_id: Optional[int], app_name: str, workspace_id: int, started: float,
+                          timing: Dict[str, Any], run_id: Optional[str] = None):
+        """Espera a janela em background, registra o processo e o open_app (app sem hotkey)"""
+        window = self._wait_app_window(waiter, app_name, project_id, workspace_id, started, run_id)
+        if window:
+            self._adopt_window(project_id, app_name, window)
+        timing["total_ms"] = (time.monotonic() - started) * 1000
+        timing["window_failed"] = window is None
+        self._record_app_timing(project_id, timing, run_id)
+        self.timing.invalidate()
+
+    def _wait_app_window(self, waiter, app_name: str, project_id: Optional[int], workspace_id: int,
+                         started: float, run_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Espera a janela pelo tempo aprendido do app e registra o tempo até ela aparecer"""
+        timeout = self.timing.window_timeout(app_name)
+        window = waiter.wait(timeout)
+        outcome = "ok" if window else "failed"
+        self.telemetry.record("window", (time.monotonic() - started) * 1000, project_id=project_id, app=app_name,
+                              workspace_id=workspace_id, outcome=outcome, run_id=run_id)
+        if not window:
+            print(f"AVISO: Janela de {app_name} não apareceu em {timeout:.1f}s")
+        return window
+
+    def _send_hotkey_when_ready(self, app_name: str, window: Dict[str, Any], hotkey: str, seen_at: float,
+                                project_id: Optional[int] = None, workspace_id: Optional[int] = None,
+                                record: bool = True) -> bool:
+        """
+        Envia o hotkey assim que o app estiver pronto, em vez de um delay fixo
+
+        "Pronto" = primeira troca de título depois da janela aparecer (seen_at,
+        time.monotonic()): o app terminou de carregar o projeto/shell. A espera
+        vai no máximo até o orçamento do LaunchTimingModel, contado de seen_at.
+        Depois do envio, a espera fixa (HOTKEY_DELAY_AFTER) vira a espera pela
+        próxima troca de título, até o orçamento "settle" do app.
+        Com record=True os tempos observados viram amostras "interactive"/"settle" do app.
+        """
+        address = window.get("address", "")
+        budget = self.timing.interactive_budget(app_name)
+        waiter = self.workspace_manager.expect_title_change(address, window.get("title", ""))
+        changed_at = waiter.wait(max(budget - (time.monotonic() - seen_at), 0.0))
+        if changed_at is not None and record:
+            self.telemetry.record("interactive", max(changed_at - seen_at, 0.0) * 1000, project_id=project_id,
+                                  app=app_name, workspace_id=workspace_id)
+
+        # Depois do atalho: esperar o app reagir (troca de título), no máximo o orçamento aprendido
+        title = (self.workspace_manager.state.get_window(address) or window).get("title", "")
+        waiter = self.workspace_manager.expect_title_change(address, title)
+        sent_at = time.monotonic()
+        if not self.send_hotkey(address, hotkey, delay_before=0, delay_after=0):
+            waiter.cancel()
+            return False
+        reacted_at = waiter.wait(self.timing.settle_budget(app_name))
+        if reacted_at is not None and record:
+            self.telemetry.record("settle", max(reacted_at - sent_at, 0.0) * 1000, project_id=project_id,
+                                  app=app_name, workspace_id=workspace_id)
+        return True
+
+    def build_app_command(self, app_name: str, folder_path: Optional[str] = None) -> Optional[List[str]]:
+        """Retorna o comando para abrir um app (ou None se desconhecido)"""
+        app = app_name.lower()
+
+        # Mapa de apps para comandos (SEM folder_path aqui)
+        app_commands = {
+            "zed": ["zeditor"],  # Zed no Arch é "zeditor", não "zed"
+            "terminal": ["ghostty"],
+            "ghostty": ["ghostty"],
+            "kitty": ["kitty"],
+            "alacritty": ["alacritty"],
+            "cursor": ["cursor"],
+            # "claude-code" e Zen são tratados separadamente
+        }
+
+        # Claude Code: terminal no diretório do projeto executando "claude"
+        if app == "claude-code":
+            if not folder_path:
+                return None
+            return ["ghostty", f"--working-directory={folder_path}", "-e", "bash", "-c", "claude"]
+
+        command = app_commands.get(app)
+        if not command:
+            return None
+
+        # Adicionar folder_path aos comandos se aplicavel
+        if folder_path:
+            if app in ["zed", "cursor"]:
+                # Zed/Cursor: folder_path como argumento
+                command = command + [folder_path]
+            elif app == "ghostty":
+                # Ghostty: usar --working-directory
+                command = ["ghostty", "--working-directory", folder_path]
+            elif app in ["kitty", "alacritty"]:
+                # Kitty/Alacritty: usar --directory
+                command = command + ["--directory", folder_path]
+
+        return command
+
+    def exec_app_in_workspace(self, app_name: str, workspace_id: int, folder_path: Optional[str] = None, zen_container: Optional[str] = None, args: Optional[List[str]] = None) -> bool:
+        """
+        Dispara o app direto no workspace alvo ("dispatch exec [workspace N silent]")
+
+        Não troca o workspace visível, então vários apps podem ser disparados ao mesmo tempo.
+        Não espera a janela aparecer.
+        """
+        app = app_name.lower()
+
+        if app in ["zen-browser", "zen"]:
+            from zen_controller import ZenController
+            zen = ZenController()
+            if not zen.is_zen_installed():
+                print(f"Erro: {zen.zen_binary} nao encontrado no sistema")
+                return False
+            if zen_container:
+                print(f"[INFO] Workspace/Espaco '{zen_container}' deve ser trocado manualmente")
+            command = zen.build_command()
+        else:
+            command = self.build_app_command(app, folder_path)
+
+        if not command:
+            print(f"App desconhecido (ou sem pasta): {app_name}")
+            return False
+
+        if args:
+            command = command + list(args)
+
+        return self.workspace_manager.exec_in_workspace(command, workspace_id)
+
+    def close_project(self, project: Dict[str, Any], timeout: float = SHUTDOWN_TIMEOUT):
+        """
+        Fecha um projeto: pede para os apps fecharem e só força quem não fechar
+
+        1. closewindow em todas as janelas (um batch) + SIGTERM nos processos sem janela
+        2. Espera todos os processos ao mesmo tempo, até o prazo (timeout)
+        3. SIGKILL apenas nos sobreviventes
+
+        O tempo total é o do app mais lento a sair (não uma soma de sleeps).
+        """
         print(f"Fechando projeto: {project['name']}")
+        start = time.perf_counter()
+
+        # Projeto com processos registrados: só a árvore dele
+        # Sem registro (ex: aberto antes do rastreamento): por nome
+        project_id = project.get("id")
+        if project_id is not None and self.supervisor.has_processes(project_id):
+            forced = self._shutdown_project_processes(project, timeout)
+        else:
+            forced = self._shutdown_processes_by_name(project, timeout)
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if forced:
+            print(f"Projeto '{project['name']}' fechado em {elapsed_ms:.0f}ms ({forced} processo(s) forçado(s) com SIGKILL)")
+        else:
+            print(f"Projeto '{project['name']}' fechado em {elapsed_ms:.0f}ms")
+
+    def _shutdown_project_processes(self, project: Dict[str, Any], timeout: float) -> int:
+        """
+        Encerra os processos registrados do projeto (graceful → SIGKILL)
+
+        Processos de outros projetos (mesmo app, mesmo nome) não são tocados.
+        Só janelas do projeto recebem closewindow: as registradas na adoção, as
+        do special workspace dele e, se ele for o ativo, as dos seus workspaces.
+        Um processo (árvore do root_pid) que ainda tem janelas fora do projeto
+        (ex: Zed/terminal com janelas do usuário) é só desanexado, como os
+        compartilhados do split_shared: nunca recebe sinal.
+        A espera termina quando o último processo sai (notificação do pidfd).
+
+        Returns:
+            Quantidade de processos que precisaram de SIGKILL
+        """
+        project_id = project["id"]
+        own, addresses = self.supervisor.split_shared(project_id)
+
+        # Janelas do projeto
+        addresses += [info["address"] for info in own if info.get("address")]
+        addresses += [
+            client.get("address", "")
+            for client in self.workspace_manager.get_windows_in_workspace_named(
+                self.project_special_workspace(project_id)
+            )
+        ]
+        # Os workspaces do projeto só pertencem a ele se ele for o ativo
+        if project.get("is_active"):
+            addresses += [
+                client.get("address", "")
+                for ws_id in self.project_workspace_ids(project)
+                for client in self.workspace_manager.get_windows_in_workspace(ws_id)
+            ]
+        project_addresses = set(addresses)
+
+        # Árvores com janela de fora do projeto são desanexadas (sem sinal)
+        windows = {info["pid"]: self.workspace_manager.get_windows_by_pid(info["pid"]) for info in own}
+        detached_roots = {
+            info["root_pid"]
+            for info in own
+            if any(window.get("address") not in project_addresses for window in windows[info["pid"]])
+        }
+
+        # Processos com janela fecham pela janela; os demais recebem SIGTERM
+        pids = []
+        windowless = []
+        detached = 0
+        for info in own:
+            if info["root_pid"] in detached_roots:
+                detached += 1
+                continue
+            pids.append(info["pid"])
+            if not windows[info["pid"]]:
+                windowless.append(info["pid"])
+
+        self._request_close(addresses)
+        for pid in windowless:
+            self.supervisor.send_signal(pid, signal.SIGTERM)
+        if detached:
+            print(f"  {detached} processo(s) com janelas fora do projeto desanexado(s) (só as janelas do projeto fecham)")
+        print(f"Encerrando {len(pids)} processo(s) do projeto (prazo: {timeout:.0f}s)")
+
+        survivors = self.supervisor.wait_pids(pids, timeout)
+        if survivors:
+            print(f"AVISO: {len(survivors)} processo(s) não fecharam em {timeout:.0f}s, enviando SIGKILL")
+            for pid in survivors:
+                self.supervisor.send_signal(pid, signal.SIGKILL)
+            self.supervisor.wait_pids(survivors, 1.0)
+
+        self.supervisor.forget_project(project_id)
+        return len(survivors)
+
+    def _shutdown_processes_by_name(self, project: Dict[str, Any], timeout: float) -> int:
+        """
+        Encerra os apps por nome (graceful → SIGKILL) e limpa os workspaces do projeto
 
-        # Lista de processos para matar
-        processes_to_kill = []
+        Só processos com janela nos workspaces do projeto são alvo: instâncias
+        do warm pool (special:arq_pool) e processos registrados por outros
+        projetos no ProcessSupervisor nunca recebem sinal (janelas compartilhadas
+        só recebem closewindow).
+
+        Returns:
+            Quantidade de processos que precisaram de SIGKILL
+        """
+        # Lista de processos para fechar
+        process_names = []
 
         # Coletar nomes de apps dos workspaces
-        for ws_num in [1, 2, 3]:
-            app = project.get(f"workspace_{ws_num}_app")
-            if app:
-                processes_to_kill.append(app)
+        for spec in self.get_project_apps(project):
+            if spec["app"] not in process_names:
+                process_names.append(spec["app"])
 
-        # Apps padroes para matar
+        # Apps padroes para fechar
         default_apps = ["zed", "zen-browser", "cursor", "ghostty", "kitty", "alacritty"]
         for app in default_apps:
-            if app not in processes_to_kill:
-                processes_to_kill.append(app)
+            if app not in process_names:
+                process_names.append(app)
 
-        # Matar processos
-        print(f"Matando processos: {', '.join(processes_to_kill)}")
-        self.kill_processes(processes_to_kill)
+        print(f"Encerrando processos: {', '.join(process_names)} (prazo: {timeout:.0f}s)")
+        try:
+            procs = ProcessCatalog(process_names).processes(exclude_pids=[os.getpid()])
+        except Exception as e:
+            print(f"Erro ao listar processos: {e}")
+            procs = []
+
+        # Janelas dos workspaces do projeto recebem closewindow
+        windows = [
+            client
+            for ws_id in self.project_workspace_ids(project)
+            for client in self.workspace_manager.get_windows_in_workspace(ws_id)
+        ]
+        self._request_close([client.get("address", "") for client in windows])
+
+        # Só esperar/forçar os processos dessas janelas (fora pool e processos de outros projetos)
+        windowed_pids = {client.get("pid") for client in windows}
+        protected = self.warm_pool.pids() | {pid for pid in windowed_pids if self.supervisor.owners(pid)}
+        skipped = [proc for proc in procs if proc.pid not in windowed_pids or proc.pid in protected]
+        procs = [proc for proc in procs if proc.pid in windowed_pids and proc.pid not in protected]
+        if skipped:
+            print(f"  {len(skipped)} processo(s) fora dos workspaces do projeto (ou do pool/outros projetos) mantido(s)")
+
+        _, alive = psutil.wait_procs(procs, timeout=timeout)
+        if alive:
+            print(f"AVISO: {len(alive)} processo(s) não fecharam em {timeout:.0f}s, enviando SIGKILL")
+            for proc in alive:
+                try:
+                    proc.kill()
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    pass
+            psutil.wait_procs(alive, timeout=1.0)
 
-        # Aguardar processos morrerem
-        time.sleep(0.5)
+        return len(alive)
 
-        # Fechar janelas restantes nos workspaces 1, 2, 3
-        print("Limpando workspaces 1, 2, 3")
-        for ws_id in [1, 2, 3]:
-            self.close_all_windows_in_workspace(ws_id)
-            time.sleep(0.1)
+    def _request_close(self, addresses: List[str]):
+        """Envia closewindow para todas as janelas de uma vez (sem duplicatas)"""
+        addresses = list(dict.fromkeys(address for address in addresses if address))
+        if addresses:
+            results = self.workspace_manager.close_windows(addresses)
+            print(f"{sum(results)}/{len(addresses)} janela(s) pediram para fechar")
 
-        print(f"Projeto '{project['name']}' fechado")
+    def get_project_apps(self, project: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Lista os apps configurados do projeto
 
-    def open_project(self, project: Dict[str, Any]):
-        """Abre um projeto (distribui apps nos workspaces)"""
-        print(f"Abrindo projeto: {project['name']}")
+        O layout vem de project["workspaces"] (qualquer número de workspaces);
+        projetos sem ele usam as chaves antigas workspace_{1,2,3}_app/hotkey.
 
+        Returns:
+            [{"app", "workspace_id", "folder_path", "zen_container", "hotkey", "args", "project_id"}, ...]
+        """
         folder_path = project.get("folder_path", "")
         zen_container = project.get("zen_container", "")
 
-        # Abrir apps nos workspaces configurados
-        for ws_num in [1, 2, 3]:
-            app = project.get(f"workspace_{ws_num}_app")
-            hotkey = project.get(f"workspace_{ws_num}_hotkey", "")  # Pegar hotkey configurado
+        layout = project.get("workspaces")
+        if layout is None:
+            layout = [
+                {
+                    "workspace_id": ws_num,
+                    "app": project.get(f"workspace_{ws_num}_app"),
+                    "hotkey": project.get(f"workspace_{ws_num}_hotkey", ""),  # Pegar hotkey configurado
+                }
+                for ws_num in PROJECT_WORKSPACES
+            ]
+
+        apps = []
+        for entry in layout:
+            app = entry.get("app")
+            hotkey = entry.get("hotkey") or ""
 
             if app and app.strip():
-                print(f"Abrindo {app} no workspace {ws_num}")
-
                 # Passar folder_path para apps que usam diretorio
                 folder = folder_path if app.lower() in ["zed", "cursor", "terminal", "ghostty", "kitty", "alacritty", "claude-code"] else None
 
                 # Passar zen_container apenas para Zen
                 zen_cont = zen_container if app.lower() in ["zen-browser", "zen"] else None
 
-                self.open_app_in_workspace(app, ws_num, folder, zen_cont, hotkey)  # Passar hotkey
-                time.sleep(0.3)
+                apps.append({
+                    "app": app,
+                    "workspace_id": entry["workspace_id"],
+                    "folder_path": folder,
+                    "zen_container": zen_cont,
+                    "hotkey": hotkey,
+                    "args": list(entry.get("args") or []),
+                    "project_id": project.get("id"),
+                })
+
+        return apps
+
+    def open_project(self, project: Dict[str, Any], parallel: bool = False, apps: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """
+        Abre um projeto (distribui apps nos workspaces)
+
+        Args:
+            project: Projeto do banco
+            parallel: Se True, dispara todos os apps ao mesmo tempo (open_project_parallel)
+            apps: Apps a abrir (de get_project_apps). Se None, todos os do projeto
+
+        Returns:
+            Tempos de cada app (ver _print_launch_timings)
+        """
+        print(f"Abrindo projeto: {project['name']}")
+        start = time.perf_counter()
+
+        if apps is None:
+            apps = self.get_project_apps(project)
+
+        with self.telemetry.span("open_project", project_id=project.get("id")) as event:
+            if parallel:
+                timings = self.open_project_parallel(project, apps)
+            else:
+                timings = []
+                for spec in apps:
+                    print(f"Abrindo {spec['app']} no workspace {spec['workspace_id']}")
+
+                    # Com hotkey, retorna depois de enviá-lo; sem, a janela é esperada em background
+                    timing = {"app": spec["app"], "workspace_id": spec["workspace_id"], "ok": False, "total_ms": None}
+                    timing["ok"] = self.open_app_in_workspace(
+                        spec["app"], spec["workspace_id"], spec["folder_path"], spec["zen_container"], spec["hotkey"],
+                        spec["project_id"], spec.get("args"), timing=timing
+                    )
+                    timings.append(timing)
+
+            self._record_launch_timings(project.get("id"), timings)
+            if not all(t.get("ok") for t in timings):
+                event["outcome"] = "failed"
 
+        self._print_launch_timings(timings, (time.perf_counter() - start) * 1000)
         print(f"Projeto '{project['name']}' aberto")
+        return timings
 
-    def move_all_windows_to_ws5(self):
-        """Move todas as janelas dos workspaces 1, 2, 3 para workspace 5 (preserva estado)"""
-        try:
-            import os
-            import json
+    def _record_launch_timings(self, project_id: Optional[int], timings: List[Dict[str, Any]]):
+        """
+        Envia os tempos de cada app para a telemetria
 
-            # PID do processo atual (Arquiteto)
-            arquiteto_pid = os.getpid()
+        open_app vai sempre até a janela aparecer (mais a espera/envio do hotkey,
+        se houver); apps cuja janela é esperada em background ("deferred") são
+        registrados pela própria thread quando ela aparece.
+        """
+        for t in timings:
+            if not t.get("deferred"):
+                self._record_app_timing(project_id, t)
+        self.timing.invalidate()  # Próxima abertura já usa estes tempos
 
-            result = subprocess.run(
-                ["hyprctl", "clients", "-j"],
-                capture_output=True,
-                text=True,
-                timeout=2
-            )
+    def _record_app_timing(self, project_id: Optional[int], t: Dict[str, Any], run_id: Optional[str] = None):
+        """
+        Registra open_app (e window/hotkey, se medidos aqui) de um app
 
-            if result.returncode == 0:
-                clients = json.loads(result.stdout)
-
-                # Coletar todos os endereços primeiro (evita problemas com estado desatualizado)
-                windows_to_move = []
-
-                for client in clients:
-                    ws = client.get("workspace", {})
-                    ws_id = ws.get("id")
-
-                    # Se janela está no workspace 1, 2 ou 3
-                    if ws_id in [1, 2, 3]:
-                        address = client.get("address", "")
-                        title = client.get("title", "")
-                        pid = client.get("pid", -1)
-
-                        # NÃO mover se for o processo do Arquiteto (usa PID ao invés de título)
-                        if pid != arquiteto_pid:
-                            if address:
-                                windows_to_move.append({
-                                    "address": address,
-                                    "title": title,
-                                    "ws_id": ws_id,
-                                    "pid": pid
-                                })
-
-                print(f"[DEBUG] PID Arquiteto: {arquiteto_pid}")
-                print(f"Encontradas {len(windows_to_move)} janela(s) para mover para WS5")
-
-                # Debug: mostrar janelas encontradas
-                for w in windows_to_move:
-                    print(f"  - WS{w['ws_id']}: {w['title']} (PID: {w['pid']})")
-
-                # Agora mover todas as janelas coletadas
-                moved_count = 0
-                for window in windows_to_move:
-                    try:
-                        subprocess.run(
-                            ["hyprctl", "dispatch", "movetoworkspacesilent", f"5,address:{window['address']}"],
-                            capture_output=True,
-                            timeout=1
-                        )
-                        moved_count += 1
-                        print(f"Janela movida WS{window['ws_id']}→WS5: {window['title']}")
-                        time.sleep(0.05)
-                    except Exception as e:
-                        print(f"Erro ao mover janela '{window['title']}': {e}")
-
-                if moved_count > 0:
-                    print(f"Total: {moved_count} janela(s) movida(s) para WS5")
-                return True
-        except Exception as e:
-            print(f"Erro ao mover janelas para WS5: {e}")
+        Apps do warm pool vão com outcome "pool" (não entram nos percentis de abertura).
+        """
+        if t.get("total_ms") is None:
+            return
+        if t.get("pooled"):
+            outcome = "pool"
+        else:
+            outcome = "ok" if t.get("ok") and not t.get("window_failed") else "failed"
+        common = {"project_id": project_id, "app": t["app"], "workspace_id": t["workspace_id"], "outcome": outcome,
+                  "run_id": run_id}
+        self.telemetry.record("open_app", t["total_ms"], **common)
+        if t.get("window_ms") is not None:
+            self.telemetry.record("window", t["window_ms"], **common)
+        if t.get("hotkey_ms") is not None:
+            self.telemetry.record("hotkey", t["hotkey_ms"], **common)
+
+    def open_project_parallel(self, project: Dict[str, Any], apps: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """
+        Abre todos os apps do projeto ao mesmo tempo
 
-        return False
+        1. Arma a espera de cada janela e dispara todos os apps via exec com regra de workspace
+           (apps com instância no warm pool são reivindicados em vez de abertos)
+        2. Espera todas as janelas em paralelo (o tempo total é o do app mais lento)
+        3. Envia os hotkeys (em sequência: cada um precisa de foco), cada um assim
+           que o app fica pronto (ver _send_hotkey_when_ready)
 
-    def move_arquiteto_to_workspace_9(self, arquiteto_window_title: str = "Arquiteto"):
-        """Move a janela do Arquiteto para workspace 9 usando PID do processo"""
-        try:
-            import os
-            import json
+        Returns:
+            [{"app", "workspace_id", "ok", "launch_ms", "window_ms", "hotkey_ms", "total_ms"}, ...]
+        """
+        launches = []
+        claimed: Set[str] = set()  # Janelas que não podem ser "a nova janela" de nenhum app
+
+        # 1. Disparar tudo (apps com instância no pool ficam para depois: o claim usa foco)
+        specs = apps if apps is not None else self.get_project_apps(project)
+        pooled = [spec for spec in specs if not spec.get("args") and self.warm_pool.has_idle(spec["app"])]
+        for spec in specs:
+            if spec not in pooled:
+                launches.append(self._exec_spec(spec, claimed))
+
+        # 1b. Reivindicar instâncias do pool enquanto os outros apps carregam
+        seen_at: Dict[int, float] = {}  # {id(timing): time.monotonic() em que a janela apareceu}
+        for spec in pooled:
+            started = time.perf_counter()
+            claim_start = time.monotonic()
+            window = self.warm_pool.claim(spec["app"], spec["workspace_id"], spec["folder_path"])
+            if window is None:
+                launches.append(self._exec_spec(spec, claimed))
+                continue
+            claimed.add(window.get("address"))
+            self._adopt_window(spec["project_id"], spec["app"], window)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            timing = {
+                "app": spec["app"],
+                "workspace_id": spec["workspace_id"],
+                "ok": True,
+                "launch_ms": elapsed_ms,
+                "window_ms": elapsed_ms,
+                "hotkey_ms": None,
+                "total_ms": elapsed_ms,
+                "pooled": True,
+            }
+            seen_at[id(timing)] = claim_start
+            launches.append((spec, None, started, timing, window))
+
+        if not launches:
+            return []
+
+        # 2. Esperar todas as janelas ao mesmo tempo
+        def wait_window(launch):
+            spec, waiter, started, timing, window = launch
+            if waiter is None:
+                return window
+            timeout = self.timing.window_timeout(spec["app"])
+            window = waiter.wait(timeout)
+            if window:
+                seen_at[id(timing)] = time.monotonic()
+                claimed.add(window.get("address"))
+                self._adopt_window(spec["project_id"], spec["app"], window)
+                timing["window_ms"] = (time.perf_counter() - started) * 1000
+                timing["total_ms"] = timing["window_ms"]  # Sem hotkey, open_app termina aqui
+            else:
+                timing["ok"] = False
+                timing["total_ms"] = (time.perf_counter() - started) * 1000
+                print(f"AVISO: Janela de {spec['app']} não apareceu em {timeout:.1f}s")
+            return window
+
+        with ThreadPoolExecutor(max_workers=len(launches)) as pool:
+            windows = list(pool.map(wait_window, launches))
+
+        # 3. Hotkeys (sequencial: cada atalho precisa da janela focada)
+        for (spec, waiter, started, timing, _), window in zip(launches, windows):
+            hotkey = spec["hotkey"]
+            if window and hotkey and hotkey.strip():
+                print(f"Enviando hotkey '{hotkey}' para {spec['app']}...")
+                hotkey_start = time.perf_counter()
+                self._send_hotkey_when_ready(
+                    spec["app"], window, hotkey, seen_at[id(timing)], spec["project_id"], spec["workspace_id"],
+                    record=not timing.get("pooled"),
+                )
+                timing["hotkey_ms"] = (time.perf_counter() - hotkey_start) * 1000
+                # Janela + hotkey, sem o tempo na fila atrás dos hotkeys dos outros apps
+                timing["total_ms"] = timing["window_ms"] + timing["hotkey_ms"]
+
+        return [timing for _, _, _, timing, _ in launches]
+
+    def _exec_spec(self, spec: Dict[str, Any], claimed: Set[str]):
+        """Arma a espera da janela e dispara o app (ver open_project_parallel)"""
+        expected_class = APP_WINDOW_CLASSES.get(spec["app"].lower())
+        waiter = None
+        if expected_class:
+            claimed.update(c.get("address") for c in self.workspace_manager.get_windows_by_class(expected_class))
+            waiter = self.workspace_manager.expect_window(
+                expected_class, workspace_id=spec["workspace_id"], exclude=claimed
+            )
 
-            # PID do processo atual (Arquiteto)
-            arquiteto_pid = os.getpid()
+        print(f"Disparando {spec['app']} no workspace {spec['workspace_id']}")
+        started = time.perf_counter()
+        ok = self.exec_app_in_workspace(
+            spec["app"], spec["workspace_id"], spec["folder_path"], spec["zen_container"], spec.get("args")
+        )
+        timing = {
+            "app": spec["app"],
+            "workspace_id": spec["workspace_id"],
+            "ok": ok,
+            "launch_ms": (time.perf_counter() - started) * 1000,
+            "window_ms": None,
+            "hotkey_ms": None,
+            "total_ms": None,
+        }
 
-            result = subprocess.run(
-                ["hyprctl", "clients", "-j"],
-                capture_output=True,
-                text=True,
-                timeout=1
+        if not ok:
+            timing["total_ms"] = timing["launch_ms"]  # Falha no disparo: registrada como "failed"
+            if waiter:
+                waiter.cancel()
+                waiter = None
+        return spec, waiter, started, timing, None
+
+    def _print_launch_timings(self, timings: List[Dict[str, Any]], wall_ms: float):
+        """Imprime o tempo de cada app e o tempo total (wall-clock)"""
+        def fmt(value):
+            return f"{value:7.0f}ms" if value is not None else "      -  "
+
+        for t in timings:
+            status = "OK" if t.get("ok") else "FALHOU"
+            if t.get("pooled"):
+                status += ", pool"
+            print(
+                f"  WS{t['workspace_id']} {t['app']:<12} janela:{fmt(t.get('window_ms'))} "
+                f"hotkey:{fmt(t.get('hotkey_ms'))} total:{fmt(t.get('total_ms'))} [{status}]"
             )
 
-            if result.returncode == 0:
-                clients = json.loads(result.stdout)
-
-                for client in clients:
-                    pid = client.get("pid", -1)
-
-                    # Detecta pela PID (mais confiável que título)
-                    if pid == arquiteto_pid:
-                        address = client.get("address", "")
-                        current_ws = client.get("workspace", {}).get("id")
-                        title = client.get("title", "")
-
-                        # Se já está em workspace 9, skip
-                        if current_ws == 9:
-                            print(f"Arquiteto já está em workspace 9")
-                            return True
-
-                        if address:
-                            subprocess.run(
-                                ["hyprctl", "dispatch", "movetoworkspacesilent", f"9,address:{address}"],
-                                capture_output=True,
-                                timeout=1
-                            )
-                            print(f"Arquiteto movido para workspace 9 (era WS{current_ws})")
-                            return True
-        except Exception as e:
-            print(f"Erro ao mover Arquiteto para workspace 9: {e}")
+        serial_ms = sum(t.get("total_ms") or 0 for t in timings)
+        print(f"  Tempo total: {wall_ms:.0f}ms (soma dos apps: {serial_ms:.0f}ms)")
+
+    # ===== Projetos estacionados (special workspaces) =====
+
+    def project_workspace_ids(self, project: Optional[Dict[str, Any]]) -> List[int]:
+        """Workspaces ocupados pelo projeto quando ativo (1, 2, 3 + os do layout)"""
+        workspace_ids = set(PROJECT_WORKSPACES)
+        if project:
+            workspace_ids.update(spec["workspace_id"] for spec in self.get_project_apps(project))
+        return sorted(workspace_ids)
 
-        print("AVISO: Não consegui encontrar a janela do Arquiteto!")
-        return False
+    def project_special_workspace(self, project_id: int) -> str:
+        """Special workspace onde o projeto fica estacionado (ex: "special:arq_3")"""
+        return f"special:arq_{project_id}"
 
     def switch_project(self, new_project_id: int):
-        """Troca de projeto: preserva janelas antigas e organiza workspaces"""
+        """
+        Troca de projeto levando os workspaces ao layout do novo projeto
+
+        O LayoutReconciler compara o layout desejado com as janelas vivas:
+        - janelas do projeto anterior vão para o special workspace dele (special:arq_<id>)
+        - janelas estacionadas do novo projeto voltam para os seus workspaces
+        - só apps sem janela são abertos; janelas já no lugar não são tocadas
+        Moves, closes e foco vão em um único batch. Trocar para o projeto já
+        ativo e intacto é praticamente um no-op.
+
+        Trocas são serializadas (podem vir de threads diferentes, ex: Ctrl+P):
+        uma troca que ainda espera a anterior terminar é descartada se outra
+        mais recente chegar (só a última interessa).
+        """
+        with self._switch_lock:
+            self._switch_ticket += 1
+            ticket = self._switch_ticket
+
+        with self._switch_running:
+            if ticket != self._switch_ticket:
+                print(f"Troca para projeto {new_project_id} descartada (há uma troca mais recente)")
+                return False
+            return self._switch_project(new_project_id)
+
+    def _switch_project(self, new_project_id: int):
+        """Troca de projeto (chamar com _switch_running)"""
         # 1. Pegar novo projeto
-        new_project = self.db.get_project_by_id(new_project_id)
+        new_project = self.projects.get(new_project_id)
         if not new_project:
             print(f"Erro: Projeto {new_project_id} nao encontrado")
             return False
 
         print(f"Trocando para projeto: {new_project['name']}")
+        switch_start = time.perf_counter()
 
-        # 2. Mover TODAS as janelas dos WS 1, 2, 3 para WS5 (preserva estado)
-        print("Organizando workspaces: WS1,2,3 → WS5...")
-        self.move_all_windows_to_ws5()
-        time.sleep(0.3)
-
-        # 3. Mover Arquiteto para workspace 9
-        print("Movendo Arquiteto para WS9...")
-        self.move_arquiteto_to_workspace_9()
-        time.sleep(0.3)
-
-        # 4. Abrir novo projeto nos workspaces limpos (1, 2, 3)
-        print(f"Abrindo projeto '{new_project['name']}' em WS1,2,3...")
-        self.open_project(new_project)
-
-        # 5. Definir novo projeto como ativo
-        self.db.set_active_project(new_project_id)
-
-        # 6. Focar workspace 1 (onde o projeto foi aberto)
-        time.sleep(0.5)
-        subprocess.run(
-            ["hyprctl", "dispatch", "workspace", "1"],
-            capture_output=True,
-            timeout=1
-        )
+        with self.telemetry.span("switch_project", project_id=new_project_id) as event:
+            # 2. Reconciliar layout (estacionar, restaurar, abrir o que falta, focar WS1)
+            counts = self.reconciler.reconcile(new_project, self.projects.get_active())
+            if counts["failed"]:
+                print(f"AVISO: {counts['failed']} ação(ões) falharam ao organizar workspaces")
+                event["outcome"] = "failed"
 
-        print(f"Projeto '{new_project['name']}' ativo!")
+            # 3. Definir novo projeto como ativo
+            self.projects.set_active(new_project_id)
+
+        print(
+            f"Projeto '{new_project['name']}' ativo! ({(time.perf_counter() - switch_start) * 1000:.0f}ms, "
+            f"{counts['move']} move(s), {counts['launch']} app(s) aberto(s), {counts['close']} fechado(s))"
+        )
         return True
 
     def emergency_close_all(self):
@@ -625,14 +987,16 @@ class ProjectManager:
         # Lista de processos comuns
         processes = ["zed", "zen-browser", "cursor", "kitty", "alacritty", "code"]
 
+        # Árvores de todos os projetos (pega também processos fora da lista de nomes)
+        self.supervisor.signal_all(signal.SIGKILL)
+        self.warm_pool.drain()
         self.kill_processes(processes)
 
-        # Limpar workspaces 1, 2, 3
-        for ws_id in [1, 2, 3]:
-            self.close_all_windows_in_workspace(ws_id)
+        # Limpar workspaces do projeto ativo
+        self.close_all_windows_in_workspaces(self.project_workspace_ids(self.projects.get_active()))
 
         # Desativar todos os projetos
-        self.db.deactivate_all_projects()
+        self.projects.deactivate_all()
 
         print("Tudo fechado! RAM liberada.")
 
@@ -645,13 +1009,13 @@ if __name__ == "__main__":
     pm = ProjectManager(db)
 
     # Criar projeto de teste
-    project_id = db.create_project(
+    project_id = pm.projects.create(
         name="Teste Switch",
         folder_path="/home/ian/Documents",
         workspace_1_app="zed",
         workspace_2_app="zen-browser",
         workspace_3_app="kitty"
-    )
+    ).result()
 
     print(f"Projeto criado: {project_id}")
 
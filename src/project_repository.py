@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Project Repository - Cache em memória dos projetos na frente do Database
+Leituras são consultas a dicionário; escritas mudam o cache na hora e vão para o SQLite pelo DatabaseWriter
+"""
+
+import threading
+from concurrent.futures import Future
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from database import Database
+from database_writer import DatabaseWriter
+
+
+# Callback de mudança: callback(evento, projeto)
+# Eventos: "created", "updated", "deleted", "activated", "deactivated"
+ChangeCallback = Callable[[str, Dict[str, Any]], None]
+
+
+class ProjectRepository:
+    """
+    Projetos já decodificados (JSON de custom_commands/urls) mantidos em memória
+
+    O cache é carregado uma vez do banco e cada mudança troca o snapshot inteiro
+    (copy-on-write), então as leituras (ex: thread de render da UI) não usam
+    lock nem tocam no banco.
+
+    Escritas aplicam o efeito no cache na hora (otimista) e enfileiram a
+    gravação no DatabaseWriter, devolvendo um Future: um callback da UI nunca
+    espera o commit. Quando a gravação termina, o projeto é relido do banco
+    (versão definitiva); se ela falhar, o cache volta ao que está no banco.
+    Sem writer iniciado, a gravação acontece na hora (o Future já vem resolvido).
+
+    Os dicts devolvidos são compartilhados com o cache: tratar como somente leitura
+    e alterar via update().
+
+    Callbacks de subscribe() rodam na thread que fez a escrita (mudança otimista)
+    ou na thread do DatabaseWriter (resultado da gravação).
+
+    Uso:
+        projects = ProjectRepository(db, writer)
+        projects.subscribe(lambda event, project: print(event, project["name"]))
+        projects.update(project_id, zen_container="Work")
+        projects.get(project_id)["zen_container"]  # "Work", sem consulta nem espera
+        project_id = projects.create("Novo", "/tmp/novo").result()  # Espera o ID
+    """
+
+    # Campos de update() aplicados no cache antes da gravação
+    OPTIMISTIC_FIELDS = ("name", "folder_path", "zen_container", "custom_commands", "urls")
+
+    def __init__(self, db: Database, writer: Optional[DatabaseWriter] = None):
+        self.db = db
+        self.writer = writer if writer else DatabaseWriter(db)  # Não iniciado: grava na hora
+        self._lock = threading.RLock()  # Serializa escritas (leituras não usam)
+        self._callbacks: List[ChangeCallback] = []
+        self._pending: Dict[int, int] = {}  # {project_id: escritas na fila}
+
+        self._by_id: Dict[int, Dict[str, Any]] = {}
+        self._ordered: List[Dict[str, Any]] = []
+        self._active_id: Optional[int] = None
+        self.reload()
+
+    def reload(self):
+        """Recarrega tudo do banco (ex: banco alterado por outro processo)"""
+        with self._lock:
+            self._publish_snapshot(self.db.get_all_projects())
+
+    # ===== Leitura (sem banco) =====
+
+    def get_all(self) -> List[Dict[str, Any]]:
+        """Todos os projetos (mais recentes primeiro, como get_all_projects)"""
+        return list(self._ordered)
+
+    def get(self, project_id: int) -> Optional[Dict[str, Any]]:
+        """Projeto pelo ID"""
+        return self._by_id.get(project_id)
+
+    def get_active(self) -> Optional[Dict[str, Any]]:
+        """Projeto ativo atual"""
+        active_id = self._active_id
+        return self._by_id.get(active_id) if active_id is not None else None
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    # ===== Escrita (cache na hora, banco pelo DatabaseWriter) =====
+
+    def create(self, name: str, folder_path: str, **kwargs) -> Future:
+        """
+        Cria o projeto (mesmos argumentos de create_project)
+
+        Returns:
+            Future com o ID (ou None); entra no cache quando o banco devolve o ID
+        """
+        def done(project_id: Optional[int], error: Optional[Exception], last: bool):
+            project = self._refresh(project_id) if project_id is not None else None
+            if project:
+                self._notify("created", project)
+
+        return self._write(None, done, self.db.create_project, name, folder_path, **kwargs)
+
+    def update(self, project_id: int, **kwargs) -> Future:
+        """
+        Atualiza o projeto (mesmos argumentos de update_project)
+
+        Campos simples (nome, pasta, container, URLs, comandos) mudam no cache na
+        hora; o layout (workspaces) aparece quando a gravação termina.
+        """
+        with self._lock:
+            project = self._by_id.get(project_id)
+            changes = {key: value for key, value in kwargs.items() if key in self.OPTIMISTIC_FIELDS}
+            if project and changes:
+                project = dict(project, **changes)
+                self._replace(project)
+            self._begin_write(project_id)
+        if project and changes:
+            self._notify("updated", project)
+
+        def done(ok: bool, error: Optional[Exception], last: bool):
+            if last or not ok:
+                self._resync(project_id, "updated")
+
+        return self._write(project_id, done, self.db.update_project, project_id, **kwargs)
+
+    def delete(self, project_id: int) -> Future:
+        """Remove o projeto do cache na hora e do banco em background"""
+        with self._lock:
+            project = self._by_id.get(project_id)
+            if project:
+                self._publish_snapshot(p for p in self._ordered if p["id"] != project_id)
+            self._begin_write(project_id)
+        if project:
+            self._notify("deleted", project)
+
+        def done(ok: bool, error: Optional[Exception], last: bool):
+            if not ok:
+                self._resync(project_id, "created")  # Não foi apagado: volta para o cache
+
+        return self._write(project_id, done, self.db.delete_project, project_id)
+
+    def set_active(self, project_id: int) -> Future:
+        """Define o projeto ativo (desativa o anterior)"""
+        with self._lock:
+            previous = self.get_active()
+            project = self._by_id.get(project_id)
+            if project:
+                # Mesmo efeito de set_active_project, sem esperar o banco
+                projects = {p["id"]: p for p in self._ordered}
+                if previous and previous["id"] != project_id:
+                    projects[previous["id"]] = dict(previous, is_active=0)
+                projects[project_id] = dict(
+                    project,
+                    is_active=1,
+                    last_opened=datetime.now().isoformat(),
+                    launch_count=(project.get("launch_count") or 0) + 1,
+                )
+                self._publish_snapshot(projects.values())
+                project = self._by_id.get(project_id)
+            self._begin_write(project_id)
+
+        if project:
+            if previous and previous["id"] != project_id:
+                self._notify("deactivated", self._by_id.get(previous["id"], previous))
+            self._notify("activated", project)
+
+        def done(ok: bool, error: Optional[Exception], last: bool):
+            if not ok:
+                self.reload()
+            elif last:
+                self._resync(project_id)
+
+        return self._write(project_id, done, self.db.set_active_project, project_id)
+
+    def deactivate_all(self) -> Future:
+        """Desativa todos os projetos"""
+        with self._lock:
+            previous = self.get_active()
+            self._publish_snapshot(dict(p, is_active=0) if p["is_active"] else p for p in self._ordered)
+        if previous:
+            self._notify("deactivated", self._by_id.get(previous["id"], previous))
+
+        def done(ok: bool, error: Optional[Exception], last: bool):
+            if not ok:
+                self.reload()
+
+        return self._write(None, done, self.db.deactivate_all_projects)
+
+    # ===== Notificações =====
+
+    def subscribe(self, callback: ChangeCallback):
+        """Registra callback chamado a cada mudança de projeto"""
+        with self._lock:
+            self._callbacks.append(callback)
+
+    def unsubscribe(self, callback: ChangeCallback):
+        """Remove callback registrado"""
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    # ===== Internos =====
+
+    def _write(self, project_id: Optional[int], on_done: Callable[[Any, Optional[Exception], bool], None],
+               func: Callable[..., Any], *args, **kwargs) -> Future:
+        """
+        Enfileira a escrita no DatabaseWriter
+
+        on_done(retorno, erro, última) roda na thread de escrita depois do commit;
+        "última" indica que não há outra escrita pendente do mesmo projeto (só
+        então o cache é relido do banco, para não desfazer uma mudança ainda na
+        fila). O Future devolvido resolve depois de on_done: quem esperar por ele
+        já encontra o cache atualizado.
+
+        Com project_id, _begin_write(project_id) já deve ter sido chamado junto
+        com a mudança otimista (mesmo lock). Não chamar com o lock: submit()
+        pode bloquear com a fila cheia enquanto a thread de escrita espera o lock.
+        """
+        result: Future = Future()
+
+        def done(inner: Future):
+            error = inner.exception()
+            value = None if error else inner.result()
+            last = True
+            if project_id is not None:
+                with self._lock:
+                    remaining = self._pending.get(project_id, 1) - 1
+                    if remaining:
+                        self._pending[project_id] = remaining
+                    else:
+                        self._pending.pop(project_id, None)
+                    last = remaining == 0
+            try:
+                on_done(value, error, last)
+            except Exception as e:
+                print(f"Erro ao atualizar cache de projetos: {e}")
+            if error:
+                result.set_exception(error)
+            else:
+                result.set_result(value)
+
+        self.writer.submit(func, *args, **kwargs).add_done_callback(done)
+        return result
+
+    def _begin_write(self, project_id: int):
+        """Conta uma escrita pendente do projeto (chamar com lock)"""
+        self._pending[project_id] = self._pending.get(project_id, 0) + 1
+
+    def _refresh(self, project_id: int) -> Optional[Dict[str, Any]]:
+        """Relê um projeto do banco e troca o snapshot"""
+        project = self.db.get_project_by_id(project_id)
+        with self._lock:
+            others = [p for p in self._ordered if p["id"] != project_id]
+            self._publish_snapshot(others + [project] if project else others)
+        return project
+
+    def _resync(self, project_id: int, event: Optional[str] = None):
+        """Troca a versão otimista do cache pela do banco (notifica event se mudou)"""
+        project = self.db.get_project_by_id(project_id)
+        with self._lock:
+            if self._pending.get(project_id):
+                return  # Outra escrita na fila: ela relê quando terminar
+            cached = self._by_id.get(project_id)
+            if project == cached:
+                return
+            others = [p for p in self._ordered if p["id"] != project_id]
+            self._publish_snapshot(others + [project] if project else others)
+        if event and project:
+            self._notify(event, project)
+
+    def _replace(self, project: Dict[str, Any]):
+        """Troca um projeto no snapshot (chamar com lock)"""
+        old = self._by_id.get(project["id"])
+        if old is None or any(old.get(key) != project.get(key) for key in ("name", "last_opened", "is_active")):
+            self._publish_snapshot([p for p in self._ordered if p["id"] != project["id"]] + [project])
+            return
+        # Ordem e ativo não mudam: trocar só a entrada, sem reordenar
+        by_id = dict(self._by_id)
+        by_id[project["id"]] = project
+        self._ordered = [project if p is old else p for p in self._ordered]
+        self._by_id = by_id
+
+    def _publish_snapshot(self, projects):
+        """Troca índice, ordem e ativo de uma vez (leitores veem o antigo ou o novo)"""
+        ordered = sorted(projects, key=lambda p: p.get("name") or "")
+        ordered.sort(key=lambda p: p.get("last_opened") or "", reverse=True)  # NULLs por último
+        self._by_id = {p["id"]: p for p in ordered}
+        self._ordered = ordered
+        self._active_id = next((p["id"] for p in ordered if p.get("is_active")), None)
+
+    def _notify(self, event: str, project: Dict[str, Any]):
+        with self._lock:
+            callbacks = list(self._callbacks)
+        for callback in callbacks:
+            try:
+                callback(event, project)
+            except Exception as e:
+                print(f"Erro em callback de projeto ({event}): {e}")
+
+
+# Teste basico
+if __name__ == "__main__":
+    import os
+    import tempfile
+    import time
+
+    db = Database(os.path.join(tempfile.mkdtemp(), "repository_test.db"))
+    for i in range(200):
+        db.create_project(f"Projeto {i}", f"/tmp/p{i}", workspace_1_app="zed", urls=[f"http://localhost:{3000 + i}"])
+
+    writer = DatabaseWriter(db)
+    writer.start()
+    projects = ProjectRepository(db, writer)
+    log = lambda event, project: print(f"  [{event}] {project['name']}")
+    projects.subscribe(log)
+
+    project_id = projects.create("Teste", "/tmp/teste", workspace_1_app="zed").result()
+    projects.set_active(project_id)
+    projects.update(project_id, zen_container="Work")
+    print(f"Ativo: {projects.get_active()['name']} ({projects.get_active()['zen_container']})")
+
+    # Leituras: cache x banco
+    iterations = 2000
+    for name, func in [("db.get_all_projects", db.get_all_projects), ("projects.get_all", projects.get_all)]:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        print(f"{name:<20} {(time.perf_counter() - start) / iterations * 1e6:9.1f}µs por chamada")
+    for name, func in [("db.get_project_by_id", db.get_project_by_id), ("projects.get", projects.get)]:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func(project_id)
+        print(f"{name:<20} {(time.perf_counter() - start) / iterations * 1e6:9.1f}µs por chamada")
+
+    # Escritas: esperar o commit x enfileirar (o cache muda na hora)
+    projects.unsubscribe(log)
+    for name, func in [("db.update_project", db.update_project), ("projects.update", projects.update)]:
+        start = time.perf_counter()
+        for i in range(iterations):
+            func(project_id, zen_container=f"Container {i}")
+        print(f"{name:<20} {(time.perf_counter() - start) / iterations * 1e6:9.1f}µs por chamada")
+    writer.flush()
+    print(f"  {writer.writes} escritas em {writer.batches} transação(ões)")
+
+    # Outra thread segurando o lock de escrita (ex: lote da telemetria)
+    def hold_write_lock(seconds: float):
+        with db.transaction():
+            time.sleep(seconds)
+
+    for name, func in [("db.update_project", db.update_project), ("projects.update", projects.update)]:
+        holder = threading.Thread(target=hold_write_lock, args=(0.2,))
+        holder.start()
+        time.sleep(0.02)
+        start = time.perf_counter()
+        func(project_id, zen_container="Travado")
+        print(f"{name:<20} {(time.perf_counter() - start) * 1000:9.1f}ms com o banco travado por outra thread")
+        holder.join()
+    writer.flush()
+
+    assert projects.get(project_id) == db.get_project_by_id(project_id)
+    assert [p["id"] for p in projects.get_all()] == [p["id"] for p in db.get_all_projects()]
+    projects.delete(project_id).result()
+    writer.stop()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Project Search - Busca de projetos por texto + uso (MRU/frequência)
+Usado pelo input do node "Projeto Iniciado" e pelo quick-switcher (Ctrl+P)
+"""
+
+import heapq
+import math
+import re
+import unicodedata
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from database import Database
+from project_repository import ProjectRepository
+
+
+class ProjectSearch:
+    """
+    Ranking de projetos: relevância textual x uso recente/frequente
+
+    1. Texto: índice FTS5 do banco (prefixo por palavra, nome pesa mais)
+    2. Sem resultado no FTS: busca fuzzy em memória (letras do termo em ordem
+       no nome, ex: "mspg" → "Mecanica Spagnol")
+    3. Score = relevância × (1 + recência + frequência), com recência
+       decaindo pela metade a cada RECENCY_HALF_LIFE_DAYS
+
+    Consulta vazia devolve os projetos mais usados/recentes (MRU).
+    Metadados (launch_count, last_opened) vêm do cache do ProjectRepository;
+    nomes normalizados e datas são pré-calculados e refeitos só quando um
+    projeto muda (subscribe do repositório).
+
+    Uso:
+        search = ProjectSearch(db, ProjectRepository(db))
+        for project in search.search("uber", limit=5):
+            print(project["name"])
+    """
+
+    RECENCY_WEIGHT = 0.5
+    RECENCY_HALF_LIFE_DAYS = 7.0
+    FREQUENCY_WEIGHT = 0.15  # Por log(1 + launch_count)
+    FUZZY_MAX_RELEVANCE = 0.5  # Resultados fuzzy ficam abaixo de qualquer resultado do FTS
+
+    def __init__(self, db: Database, projects: ProjectRepository):
+        self.db = db
+        self.projects = projects
+        self.use_index = db.has_search_index()
+
+        # [(projeto, nome normalizado, texto normalizado, last_opened em timestamp, boost de frequência)]
+        self._entries: Optional[List[tuple]] = None
+        self._entries_by_id: Dict[int, tuple] = {}
+        projects.subscribe(self._invalidate)
+
+    def search(self, query: str, limit: int = 8) -> List[Dict[str, Any]]:
+        """
+        Top-k projetos para a consulta
+
+        Returns:
+            Projetos (dicts do repositório) do melhor para o pior
+        """
+        return [project for project, _ in self.rank(query, limit)]
+
+    def rank(self, query: str, limit: int = 8) -> List[tuple]:
+        """Como search(), mas com o score: [(projeto, score), ...]"""
+        query = query.strip()
+        now = datetime.now().timestamp()
+        entries = self._get_entries()
+
+        if not query:
+            scored = ((entry[0], self._usage_boost(entry, now)) for entry in entries)
+            return heapq.nlargest(limit, scored, key=lambda item: item[1])
+
+        relevance = self._text_relevance(query, limit, entries)
+        if not relevance:
+            relevance = self._fuzzy_relevance(query, entries)
+
+        scored = []
+        for project_id, value in relevance.items():
+            entry = self._entries_by_id.get(project_id)
+            if entry:
+                scored.append((entry[0], value * self._usage_boost(entry, now)))
+        return heapq.nlargest(limit, scored, key=lambda item: item[1])
+
+    # ===== Relevância =====
+
+    def _text_relevance(self, query: str, limit: int, entries: List[tuple]) -> Dict[int, float]:
+        """{project_id: relevância 0..1} (1 = melhor resultado do texto)"""
+        if not self.use_index:
+            return self._substring_relevance(query, entries)
+
+        # Mais candidatos que o limite: o uso pode reordenar
+        hits = self.db.search_projects(query, limit * 4)
+        if not hits:
+            return {}
+        best = -hits[0]["rank"] or 1.0
+        return {hit["id"]: max(-hit["rank"] / best, 0.01) for hit in hits}
+
+    def _substring_relevance(self, query: str, entries: List[tuple]) -> Dict[int, float]:
+        """Fallback sem FTS5: todas as palavras contidas em nome/pasta/URLs"""
+        terms = _normalize(query).split()
+        relevance = {}
+        for project, name, text, _, _ in entries:
+            if all(term in text for term in terms):
+                relevance[project["id"]] = 1.0 if all(term in name for term in terms) else 0.6
+        return relevance
+
+    def _fuzzy_relevance(self, query: str, entries: List[tuple]) -> Dict[int, float]:
+        """Letras da consulta em ordem no nome; mais compacto = mais relevante"""
+        needle = _normalize(query).replace(" ", "")
+        if not needle:
+            return {}
+        # "abc" → "a.*?b.*?c": a busca do re (em C) faz a varredura
+        pattern = re.compile(".*?".join(re.escape(char) for char in needle))
+        relevance = {}
+        for project, name, _, _, _ in entries:
+            match = pattern.search(name)
+            if match:
+                relevance[project["id"]] = self.FUZZY_MAX_RELEVANCE * len(needle) / (match.end() - match.start())
+        return relevance
+
+    def _usage_boost(self, entry: tuple, now: float) -> float:
+        """1 + recência + frequência"""
+        _, _, _, last_opened, boost = entry
+        if last_opened is not None:
+            age_days = max(now - last_opened, 0.0) / 86400
+            boost += self.RECENCY_WEIGHT * 0.5 ** (age_days / self.RECENCY_HALF_LIFE_DAYS)
+        return boost
+
+    # ===== Cache =====
+
+    def _get_entries(self) -> List[tuple]:
+        entries = self._entries
+        if entries is None:
+            entries = [self._entry(project) for project in self.projects.get_all()]
+            self._entries_by_id = {entry[0]["id"]: entry for entry in entries}
+            self._entries = entries
+        return entries
+
+    def _entry(self, project: Dict[str, Any]) -> tuple:
+        name = _normalize(project.get("name") or "")
+        text = " ".join([name, _normalize(project.get("folder_path") or ""), _normalize(" ".join(project.get("urls") or []))])
+        last_opened = None
+        if project.get("last_opened"):
+            try:
+                last_opened = datetime.fromisoformat(project["last_opened"]).timestamp()
+            except ValueError:
+                pass
+        frequency = 1.0 + self.FREQUENCY_WEIGHT * math.log1p(project.get("launch_count") or 0)
+        return project, name, text, last_opened, frequency
+
+    def _invalidate(self, event: str, project: Dict[str, Any]):
+        self._entries = None
+
+
+def _normalize(text: str) -> str:
+    """Minúsculas sem acentos ("Mecânica" → "mecanica")"""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+# Teste basico
+if __name__ == "__main__":
+    import os
+    import random
+    import tempfile
+    import time
+
+    db = Database(os.path.join(tempfile.mkdtemp(), "search_test.db"))
+    clients = ["uberti", "mecanica", "spagnol", "amage", "padaria", "clinica", "escola", "academia",
+               "oficina", "imobiliaria", "farmacia", "hotel", "pousada", "restaurante", "advocacia"]
+    kinds = ["portal", "loja", "api", "dashboard", "site", "app", "crm", "erp", "blog", "landing"]
+    random.seed(1)
+    for i in range(500):
+        name = f"{random.choice(clients).title()} {random.choice(kinds)} {i}"
+        db.create_project(name, f"/home/ian/dev/{name.lower().replace(' ', '_')}", urls=[f"https://{i}.vercel.app"])
+
+    projects = ProjectRepository(db)
+    search = ProjectSearch(db, projects)
+    for project in projects.get_all()[:20:4]:
+        for _ in range(5):
+            projects.set_active(project["id"])
+
+    for query in ["", "uber", "mec dash", "dshbrd", "vercel 42"]:
+        results = search.rank(query, limit=3)
+        print(f"'{query}': " + ", ".join(f"{p['name']} ({score:.2f})" for p, score in results))
+
+    iterations = 1000
+    for query in ["", "u", "uber", "mec dash", "dshbrd"]:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            search.search(query, limit=8)
+        print(f"search('{query}'): {(time.perf_counter() - start) / iterations * 1e6:.0f}µs")
@@ -395,3 +395,100 @@ class WorkflowDialogs:
                 width=-1,
                 callback=lambda: dpg.delete_item("info_dialog"),
             )
+
+
+class ProjectDialogs:
+    """
+    Dialogs de projetos
+
+    - Quick-switcher (Ctrl+P): busca enquanto digita e troca de projeto
+    """
+
+    @staticmethod
+    def show_quick_switcher(
+        search: Callable[[str], List[Dict]],
+        on_select: Callable[[int], None],
+        limit: int = 10,
+    ):
+        """
+        Mostra o quick-switcher de projetos
+
+        Args:
+            search: Callback(consulta) → projetos ordenados (ex: ProjectSearch.search)
+            on_select: Callback(project_id) chamado com o projeto escolhido
+            limit: Máximo de projetos na lista
+        """
+        # Deletar dialog anterior se existir
+        ProjectDialogs._close_quick_switcher()
+
+        # Label exibido → project_id (atualizado a cada busca)
+        label_to_id: Dict[str, int] = {}
+
+        def _refresh(query: str):
+            label_to_id.clear()
+            for project in search(query):
+                label_to_id[f"{project['name']}  —  {project.get('folder_path', '')}"] = project["id"]
+            labels = list(label_to_id)
+            dpg.configure_item("quick_switcher_list", items=labels)
+            if labels:
+                dpg.set_value("quick_switcher_list", labels[0])
+
+        def _select(label: Optional[str] = None):
+            label = label or dpg.get_value("quick_switcher_list")
+            project_id = label_to_id.get(label)
+            if project_id is None:
+                return
+            ProjectDialogs._close_quick_switcher()
+            on_select(project_id)
+
+        with dpg.window(
+            label="Trocar de Projeto",
+            tag="quick_switcher_dialog",
+            modal=True,
+            show=True,
+            no_resize=True,
+            no_move=False,
+            width=500,
+            height=300,
+            pos=[350, 150],
+        ):
+            # Input de busca (Enter escolhe o primeiro da lista)
+            dpg.add_input_text(
+                tag="quick_switcher_input",
+                hint="Nome, pasta ou URL do projeto...",
+                width=-1,
+                callback=lambda sender, app_data: _refresh(app_data),
+            )
+            dpg.add_spacer(height=5)
+
+            dpg.add_listbox(
+                items=[],
+                tag="quick_switcher_list",
+                num_items=limit,
+                width=-1,
+                callback=lambda sender, app_data: _select(app_data),
+            )
+
+            dpg.add_spacer(height=5)
+            dpg.add_button(
+                label="Cancelar",
+                width=-1,
+                callback=ProjectDialogs._close_quick_switcher,
+            )
+
+        # Enter abre o projeto selecionado (o primeiro, se só digitou); Esc fecha
+        with dpg.handler_registry(tag="quick_switcher_keys"):
+            dpg.add_key_press_handler(dpg.mvKey_Return, callback=lambda: _select())
+            dpg.add_key_press_handler(dpg.mvKey_Escape, callback=ProjectDialogs._close_quick_switcher)
+
+        # Lista inicial: projetos recentes/frequentes
+        _refresh("")
+        dpg.focus_item("quick_switcher_input")
+
+    @staticmethod
+    def _close_quick_switcher():
+        """Fecha o quick-switcher e remove os atalhos de teclado dele"""
+        if dpg.does_item_exist("quick_switcher_keys"):
+            dpg.delete_item("quick_switcher_keys")
+        if dpg.does_item_exist("quick_switcher_dialog"):
+            dpg.delete_item("quick_switcher_dialog")
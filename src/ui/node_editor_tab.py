@@ -8,6 +8,7 @@ from nodes.node_factory import NodeFactory
 from nodes.node_state_tracker import NodeStateTracker
 from nodes.workflow_serializer import WorkflowSerializer
 from backend.workflow_manager import WorkflowManager
+from backend.edit_journal import EditJournal
 from .toolbar import Toolbar
 from .sidebar import Sidebar
 from .dialogs import WorkflowDialogs
@@ -21,12 +22,24 @@ from constants import (
 class NodeEditorTab:
     """Gerencia a aba Map com node editor"""
 
+    # (session_id, workflow) recuperado do journal de uma sessão que caiu,
+    # definido pelo app. Restaurado quando a aba é criada. None = nada a recuperar
+    pending_recovery = None
+
+    # AutosaveWorker do app: saves manuais e auto-saves gravam um de cada vez,
+    # com o mesmo WorkflowManager. None = gravar direto (sem auto-save)
+    autosave_worker = None
+
     def __init__(self):
         self.toolbar = None
         self.sidebar = None
         self.tracker = NodeStateTracker()  # Tracker de estado dos nodes/links
         self.serializer = WorkflowSerializer(self.tracker)  # Serializer com o mesmo tracker
-        self.workflow_manager = WorkflowManager()  # Manager de I/O de workflows
+        # Manager de I/O de workflows
+        if self.autosave_worker is not None:
+            self.workflow_manager = self.autosave_worker.workflow_manager
+        else:
+            self.workflow_manager = WorkflowManager()
 
     def show(self):
         """Mostra/cria a aba Map"""
@@ -55,6 +68,10 @@ class NodeEditorTab:
             # Footer com coordenadas
             self._create_footer()
 
+        if NodeEditorTab.pending_recovery is not None:
+            self._restore_recovered(*NodeEditorTab.pending_recovery)
+            NodeEditorTab.pending_recovery = None
+
         # Selecionar aba
         dpg.set_value("main_tab_bar", "map_tab")
         print("Aba Map criada com Node Editor")
@@ -107,6 +124,18 @@ class NodeEditorTab:
                     self.sidebar = Sidebar(self._add_node_from_sidebar)
                     self.sidebar.render()
 
+    def _restore_recovered(self, session_id: str, workflow: dict):
+        """Reconstrói o editor com as edições recuperadas (continuam como não salvas)"""
+        if not self.serializer.deserialize(workflow):
+            print("[NodeEditorTab] ERRO ao restaurar edições recuperadas")
+            return
+        self.tracker.set_current_workflow(workflow.get("name"))
+        self.tracker.mark_as_unsaved()
+        # Já estão no journal desta sessão: a antiga pode ir embora
+        journal_dir = self.tracker.journal.journal_dir if self.tracker.journal else EditJournal.default_dir()
+        EditJournal.discard_session(journal_dir, session_id)
+        print(f"[NodeEditorTab] Edições recuperadas: {len(workflow['nodes'])} nodes, {len(workflow['links'])} links")
+
     def _create_footer(self):
         """Cria footer com informações de coordenadas"""
         dpg.add_spacer(height=10)
@@ -132,6 +161,8 @@ class NodeEditorTab:
         for node_id in selected_nodes:
             pos = dpg.get_item_pos(node_id)
             label = dpg.get_item_label(node_id)
+            # Só nodes selecionados podem estar sendo arrastados
+            self.tracker.update_node_position(dpg.get_item_alias(node_id) or node_id, pos)
             coords_text.append(f"{label}: ({int(pos[0])}, {int(pos[1])})")
 
         dpg.set_value("map_coords_display", " | ".join(coords_text))
@@ -340,8 +371,11 @@ class NodeEditorTab:
             # Serializar estado atual do editor
             workflow_data = self.serializer.serialize(workflow_name)
 
-            # Salvar em arquivo
-            success = self.workflow_manager.save_workflow(workflow_data, workflow_name)
+            # Salvar em arquivo (depois de um auto-save em andamento, nunca junto)
+            if self.autosave_worker is not None:
+                success = self.autosave_worker.save_now(workflow_data, workflow_name, self.tracker.revision)
+            else:
+                success = self.workflow_manager.save_workflow(workflow_data, workflow_name)
 
             if success:
                 # Atualizar tracker
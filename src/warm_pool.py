@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+Warm App Pool - Instâncias de apps pré-abertas (escondidas) para abrir projetos sem cold start
+As instâncias ficam no special workspace "special:arq_pool" até serem reivindicadas
+"""
+
+import itertools
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+from typing import Any, Dict, List, Optional, Set
+
+from workspace_manager import WorkspaceManager
+from ram_monitor import RAMMonitor
+from constants import APP_WINDOW_CLASSES, APP_WINDOW_TIMEOUT, WARM_POOL_INSTANCE_GB
+
+
+# Comando da instância ociosa de cada app que pode ficar no pool
+# Terminais: prefixo que roda um comando (o POOL_WAIT_SCRIPT)
+POOL_COMMANDS = {
+    "zed": ["zeditor", "--new"],
+    "terminal": ["ghostty", "-e"],
+    "ghostty": ["ghostty", "-e"],
+    "kitty": ["kitty"],
+    "alacritty": ["alacritty", "-e"],
+    "claude-code": ["ghostty", "-e"],  # Terminal ocioso; "claude" é iniciado ao reivindicar
+}
+
+# Shell das instâncias de terminal: espera a pasta (e um comando opcional) no
+# FIFO da instância e só então vira o shell do usuário, já na pasta do projeto
+# (nada é digitado na janela: o claim não depende de foco)
+POOL_WAIT_SCRIPT = (
+    '{ IFS= read -r dir; IFS= read -r cmd; } < "$1"; rm -f -- "$1"; '
+    'cd -- "$dir" 2>/dev/null || cd; '
+    '[ -n "$cmd" ] && $cmd; '
+    'exec "${SHELL:-/bin/sh}"'
+)
+
+# Comando iniciado na pasta do projeto ao reivindicar (após o cd)
+CLAIM_COMMANDS = {
+    "claude-code": "claude",
+}
+
+
+class WarmAppPool:
+    """
+    Mantém N instâncias ociosas de cada app escondidas em special:arq_pool
+
+    Ao abrir um projeto, claim() pega uma instância, aponta para a pasta do
+    projeto e move para o workspace alvo. Terminais recebem a pasta pelo FIFO
+    da instância; o Zed (zeditor --reuse age sobre a janela Zed ativa) só é
+    apontado com o foco confirmado, senão volta para o pool e claim() retorna
+    None (o app é aberto normalmente). Uma thread de background repõe o
+    pool, respeitando o orçamento de RAM do RAMMonitor:
+        - não abre instâncias se o uso + WARM_POOL_INSTANCE_GB passar do alerta
+        - fecha todas as instâncias ociosas se a RAM ficar crítica
+
+    Uso:
+        pool = WarmAppPool(workspace_manager, RAMMonitor(), sizes={"zed": 1})
+        pool.start()
+        window = pool.claim("zed", 1, "/home/ian/projeto")  # None se vazio
+    """
+
+    POOL_WORKSPACE = "special:arq_pool"
+    CHECK_INTERVAL = 30.0  # Segundos entre verificações de RAM sem claims
+
+    def __init__(self, workspace_manager: WorkspaceManager, ram_monitor: Optional[RAMMonitor] = None,
+                 sizes: Optional[Dict[str, int]] = None):
+        """
+        Args:
+            sizes: Instâncias ociosas por app (ex: {"zed": 1, "terminal": 2}). Vazio = pool desativado
+        """
+        self.workspace_manager = workspace_manager
+        self.ram_monitor = ram_monitor
+        self.sizes = {
+            app.lower(): count
+            for app, count in (sizes or {}).items()
+            if count > 0 and app.lower() in POOL_COMMANDS
+        }
+
+        self._idle: Dict[str, List[Dict[str, Any]]] = {app: [] for app in self.sizes}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._running = False
+        self._fifo_dir: Optional[str] = None  # FIFOs das instâncias de terminal
+        self._fifo_ids = itertools.count()
+
+    @property
+    def enabled(self) -> bool:
+        """True se algum app tem instâncias configuradas"""
+        return bool(self.sizes)
+
+    # ===== Ciclo de vida =====
+
+    def start(self) -> bool:
+        """Inicia a reposição em background (não faz nada se o pool estiver desativado)"""
+        if not self.enabled or self._running:
+            return self._running
+
+        self._running = True
+        self._wake.set()  # Primeiro preenchimento imediato
+        self._thread = threading.Thread(target=self._run, name="warm-pool", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self, drain: bool = True):
+        """Para a reposição (e fecha as instâncias ociosas se drain=True)"""
+        self._running = False
+        self._wake.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=APP_WINDOW_TIMEOUT)
+        self._thread = None
+        if drain:
+            self.drain()
+
+    def drain(self) -> int:
+        """Fecha todas as instâncias ociosas (ex: RAM crítica)"""
+        with self._lock:
+            windows = [window for idle in self._idle.values() for window in idle]
+            for idle in self._idle.values():
+                idle.clear()
+
+        if windows:
+            self.workspace_manager.close_windows([window["address"] for window in windows])
+            for window in windows:
+                self._remove_fifo(window)
+            print(f"[Pool] {len(windows)} instância(s) ociosa(s) fechada(s)")
+        if not self._running and self._fifo_dir:
+            shutil.rmtree(self._fifo_dir, ignore_errors=True)
+            self._fifo_dir = None
+        return len(windows)
+
+    def status(self) -> Dict[str, str]:
+        """Instâncias ociosas por app ({"zed": "1/2"})"""
+        with self._lock:
+            return {app: f"{len(self._idle[app])}/{size}" for app, size in self.sizes.items()}
+
+    def pids(self) -> Set[int]:
+        """PIDs das instâncias ociosas (não são de nenhum projeto: nunca encerrar por nome)"""
+        with self._lock:
+            return {window.get("pid") for idle in self._idle.values() for window in idle}
+
+    # ===== Reivindicação =====
+
+    def has_idle(self, app_name: str) -> bool:
+        """True se há instância ociosa do app"""
+        with self._lock:
+            return bool(self._idle.get(app_name.lower()))
+
+    def claim(self, app_name: str, workspace_id: int, folder_path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Pega uma instância ociosa, aponta para folder_path e move para o workspace
+
+        Returns:
+            Client da janela, ou None se não havia instância utilizável (abrir normalmente)
+        """
+        app = app_name.lower()
+        window = self._pop_idle(app)
+        if window is None:
+            return None
+
+        address = window["address"]
+        wm = self.workspace_manager
+        if not wm.move_window_to_workspace(address, workspace_id, silent=True):
+            print(f"[Pool] Erro ao mover instância de {app_name}, descartando")
+            self._discard(window)
+            return None
+
+        if window.get("pool_fifo"):
+            # Terminal: a pasta vai pelo FIFO (sem teclas, sem depender de foco)
+            if not self._release_shell(window, folder_path, CLAIM_COMMANDS.get(app, "")):
+                print(f"[Pool] Instância de {app_name} não responde, descartando")
+                self._discard(window)
+                return None
+        elif folder_path:
+            # Zed: --reuse substitui o workspace da janela Zed ativa
+            wm.focus_window(address)
+            if not wm.wait_for_focus(address, 0.5):
+                print(f"[Pool] {app_name} não recebeu foco, devolvendo ao pool")
+                self._return_idle(app, window)
+                return None
+            if not self._reuse_zed(folder_path):
+                print(f"[Pool] AVISO: {app_name} não foi apontado para {folder_path}")
+
+        self._wake.set()  # Repor em background
+        print(f"[Pool] {app_name} reivindicado do pool → WS{workspace_id}")
+        return wm.state.get_window(address) or dict(window, workspace={"id": workspace_id, "name": str(workspace_id)})
+
+    def _pop_idle(self, app: str) -> Optional[Dict[str, Any]]:
+        """Remove uma instância ociosa que ainda exista"""
+        while True:
+            with self._lock:
+                idle = self._idle.get(app)
+                if not idle:
+                    return None
+                window = idle.pop(0)
+            if self._is_alive(window):
+                return window
+            self._remove_fifo(window)
+
+    def _return_idle(self, app: str, window: Dict[str, Any]):
+        """Devolve uma instância reivindicada ao pool (ou descarta se não der para escondê-la)"""
+        if self.workspace_manager.move_windows_to_workspace([window["address"]], self.POOL_WORKSPACE) != [True]:
+            self._discard(window)
+            return
+        with self._lock:
+            self._idle[app].insert(0, window)
+
+    def _discard(self, window: Dict[str, Any]):
+        """Fecha uma instância que não pode ser usada e agenda a reposição"""
+        self.workspace_manager.close_window(window["address"])
+        self._remove_fifo(window)
+        self._wake.set()
+
+    def _is_alive(self, window: Dict[str, Any]) -> bool:
+        address = window["address"]
+        if self.workspace_manager.start_event_listener():
+            return self.workspace_manager.state.get_window(address) is not None
+        return any(c.get("address") == address for c in self.workspace_manager.get_all_clients())
+
+    def _release_shell(self, window: Dict[str, Any], folder_path: Optional[str], command: str) -> bool:
+        """Manda pasta + comando para o shell de espera da instância (POOL_WAIT_SCRIPT)"""
+        folder_path = folder_path or ""
+        if "\n" in folder_path:
+            return False
+        try:
+            # O shell já está lendo: sem leitor (instância morta) falha na hora com ENXIO
+            fd = os.open(window["pool_fifo"], os.O_WRONLY | os.O_NONBLOCK)
+        except OSError:
+            return False
+        try:
+            os.write(fd, f"{folder_path}\n{command}\n".encode("utf-8"))
+            return True
+        except OSError:
+            return False
+        finally:
+            os.close(fd)
+
+    def _reuse_zed(self, folder_path: str) -> bool:
+        """Substitui o workspace da janela Zed ativa pelo projeto"""
+        try:
+            result = subprocess.run(["zeditor", "--reuse", folder_path], capture_output=True, timeout=5)
+            return result.returncode == 0
+        except FileNotFoundError as e:
+            print(f"[Pool] Comando não encontrado: {e.filename}")
+            return False
+        except subprocess.TimeoutExpired:
+            return False
+
+    def _make_fifo(self) -> Optional[str]:
+        """Cria o FIFO de uma nova instância de terminal"""
+        try:
+            if self._fifo_dir is None:
+                self._fifo_dir = tempfile.mkdtemp(prefix="arquiteto_pool_")
+            path = os.path.join(self._fifo_dir, f"{next(self._fifo_ids)}.fifo")
+            os.mkfifo(path, 0o600)
+            return path
+        except OSError as e:
+            print(f"[Pool] Erro ao criar FIFO: {e}")
+            return None
+
+    def _remove_fifo(self, window: Dict[str, Any]):
+        fifo = window.get("pool_fifo")
+        if fifo:
+            try:
+                os.unlink(fifo)
+            except OSError:
+                pass
+
+    # ===== Reposição =====
+
+    def _run(self):
+        while self._running:
+            self._wake.wait(self.CHECK_INTERVAL)
+            self._wake.clear()
+            if not self._running:
+                break
+            try:
+                self.refill()
+            except Exception as e:
+                print(f"[Pool] Erro ao repor instâncias: {e}")
+
+    def refill(self) -> int:
+        """
+        Abre instâncias até atingir o tamanho configurado (dentro do orçamento de RAM)
+
+        Returns:
+            Quantidade de instâncias abertas
+        """
+        if self.ram_monitor and self.ram_monitor.get_ram_info()["is_critical"]:
+            self.drain()
+            return 0
+
+        opened = 0
+        for app, size in self.sizes.items():
+            while True:
+                if self._thread is not None and not self._running:
+                    return opened  # stop() chamado durante a reposição
+                with self._lock:
+                    if len(self._idle[app]) >= size:
+                        break
+                if not self.has_ram_budget():
+                    print("[Pool] Sem orçamento de RAM para novas instâncias")
+                    return opened
+
+                window = self._launch(app)
+                if window is None:
+                    break
+                with self._lock:
+                    self._idle[app].append(window)
+                opened += 1
+        return opened
+
+    def has_ram_budget(self) -> bool:
+        """True se mais uma instância cabe abaixo do limite de alerta do RAMMonitor"""
+        if self.ram_monitor is None:
+            return True
+        info = self.ram_monitor.get_ram_info()
+        return info["used_gb"] + WARM_POOL_INSTANCE_GB < self.ram_monitor.warning_threshold
+
+    def _launch(self, app: str) -> Optional[Dict[str, Any]]:
+        """Abre uma instância escondida e espera a janela aparecer no pool"""
+        wm = self.workspace_manager
+        command = POOL_COMMANDS[app]
+        fifo = None
+        if app != "zed":
+            fifo = self._make_fifo()
+            if fifo is None:
+                return None
+            command = command + ["sh", "-c", POOL_WAIT_SCRIPT, "arquiteto-pool", fifo]
+
+        expected_class = APP_WINDOW_CLASSES.get(app)
+        existing = {c.get("address") for c in wm.get_windows_by_class(expected_class)}
+        waiter = wm.expect_window(expected_class, workspace_id=self.POOL_WORKSPACE, exclude=existing)
+
+        if not wm.exec_in_workspace(command, self.POOL_WORKSPACE):
+            waiter.cancel()
+            self._remove_fifo({"pool_fifo": fifo})
+            return None
+
+        window = waiter.wait(APP_WINDOW_TIMEOUT)
+        if window is None:
+            print(f"[Pool] Janela de {app} não apareceu em {APP_WINDOW_TIMEOUT:.0f}s")
+            self._remove_fifo({"pool_fifo": fifo})
+            return None
+        return dict(window, pool_fifo=fifo) if fifo else window
+
+
+# Teste basico
+if __name__ == "__main__":
+    import time
+    from fake_hyprland import FakeHyprlandServer
+
+    with FakeHyprlandServer() as server:
+        server.exec_windows = {"zeditor": "dev.zed.Zed", "ghostty": "com.mitchellh.ghostty"}
+        server.exec_delay = 0.5  # "Cold start" simulado
+
+        wm = WorkspaceManager(server.ipc())
+        pool = WarmAppPool(wm, RAMMonitor(), sizes={"zed": 1})
+        pool.start()
+        time.sleep(1.0)
+        print(f"Pool: {pool.status()}")
+
+        start = time.perf_counter()
+        window = pool.claim("zed", 2)
+        print(f"Claim: {(time.perf_counter() - start) * 1000:.1f}ms → {window['workspace'] if window else None}")
+
+        time.sleep(1.0)
+        print(f"Pool após reposição: {pool.status()}")
+        pool.stop()
@@ -3,27 +3,135 @@
 Workspace Manager - Gerenciamento de workspaces do Hyprland
 """
 
-import subprocess
-import json
-from typing import List, Dict, Optional, Any
+import time
+import shlex
+import threading
+from typing import List, Dict, Optional, Any, Callable, Iterable, Set
+
+from hyprland_ipc import HyprlandIPC, DispatchBatch
+from hyprland_events import HyprlandEventListener
+from hyprland_state import HyprlandState
+
+
+# Eventos que podem fazer uma janela aparecer/mudar de workspace
+WINDOW_EVENTS = ("openwindow", "movewindow", "movewindowv2", "activewindow", "activewindowv2")
+
+
+class EventWaiter:
+    """
+    Espera (com timeout) até uma checagem retornar algo diferente de None
+
+    A checagem é refeita apenas quando um dos eventos assinados já foi
+    aplicado ao HyprlandState (a checagem lê o cache, sem IPC).
+    Sem socket de eventos, cai para polling a cada poll_interval.
+    Criar o waiter ANTES de disparar a ação evita perder o evento.
+    """
+
+    def __init__(self, workspace_manager: "WorkspaceManager", check: Callable[[], Any],
+                 events: Iterable[str] = WINDOW_EVENTS, poll_interval: float = 0.1):
+        self.check = check
+        self.poll_interval = poll_interval
+        self._state = workspace_manager.state
+        self._events = set(events) | {"resync"}
+        self._changed = threading.Event()
+        self._changed.set()  # Primeira checagem é imediata
+
+        self._listening = workspace_manager.start_event_listener()
+        if self._listening:
+            self._state.subscribe(self._on_change)
+
+    def _on_change(self, event: str, data: str):
+        if event in self._events:
+            self._changed.set()
+
+    def wait(self, timeout: float = 10.0) -> Any:
+        """
+        Bloqueia até a checagem retornar um valor ou o timeout expirar
+
+        Returns:
+            Valor retornado pela checagem, ou None se estourou o timeout
+        """
+        deadline = time.monotonic() + timeout
+        try:
+            while True:
+                if self._changed.is_set() or not self._listening:
+                    self._changed.clear()
+                    result = self.check()
+                    if result is not None:
+                        return result
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+
+                if self._listening:
+                    self._changed.wait(remaining)
+                else:
+                    time.sleep(min(self.poll_interval, remaining))
+        finally:
+            self.cancel()
+
+    def cancel(self):
+        """Remove as assinaturas de eventos"""
+        if self._listening:
+            self._state.unsubscribe(self._on_change)
+            self._listening = False
 
 
 class WorkspaceManager:
-    def __init__(self):
-        pass
+    def __init__(self, ipc: Optional[HyprlandIPC] = None):
+        # Cliente do socket do Hyprland (compartilhado com o ProjectManager)
+        self.ipc = ipc if ipc else HyprlandIPC()
+        # Stream de eventos (.socket2.sock), iniciado sob demanda
+        self.events = HyprlandEventListener(self.ipc)
+        # Cache de janelas/workspaces mantido pelos eventos
+        self.state = HyprlandState(self.ipc, self.events)
+
+    def start_event_listener(self) -> bool:
+        """
+        Inicia o listener de eventos e semeia o cache (se ainda não estiver rodando)
+
+        Returns:
+            True se o cache está vivo (leituras podem dispensar IPC)
+        """
+        if self.events.is_running():
+            return self.state.seeded
+
+        if not self.events.start():
+            return False
+
+        # (Re)conectado: o cache pode ter perdido eventos, semear de novo
+        return self.state.attach()
+
+    def resync(self) -> bool:
+        """Força a ressincronização do cache com o Hyprland"""
+        return self.state.resync()
+
+    def check_consistency(self, resync: bool = True) -> bool:
+        """Verifica se o cache bate com o Hyprland (e ressincroniza se não bater)"""
+        if not self.start_event_listener():
+            return True
+        return self.state.check_consistency(resync)
+
+    def get_all_clients(self) -> List[Dict[str, Any]]:
+        """Retorna lista de todas as janelas"""
+        if self.start_event_listener():
+            return self.state.all_windows()
+
+        try:
+            return self.ipc.clients()
+        except Exception as e:
+            print(f"Erro ao obter janelas: {e}")
+
+        return []
 
     def get_all_workspaces(self) -> List[Dict[str, Any]]:
         """Retorna lista de todos os workspaces"""
+        if self.start_event_listener():
+            return self.state.all_workspaces()
+
         try:
-            result = subprocess.run(
-                ["hyprctl", "workspaces", "-j"],
-                capture_output=True,
-                text=True,
-                timeout=2
-            )
-
-            if result.returncode == 0:
-                return json.loads(result.stdout)
+            return self.ipc.workspaces()
         except Exception as e:
             print(f"Erro ao obter workspaces: {e}")
 
@@ -39,116 +147,210 @@ class WorkspaceManager:
 
     def get_active_workspace(self) -> Optional[Dict[str, Any]]:
         """Retorna o workspace ativo"""
+        if self.start_event_listener():
+            active = self.state.active_workspace()
+            if active is not None:
+                return active
+
         try:
-            result = subprocess.run(
-                ["hyprctl", "activeworkspace", "-j"],
-                capture_output=True,
-                text=True,
-                timeout=1
-            )
-
-            if result.returncode == 0:
-                return json.loads(result.stdout)
+            return self.ipc.active_workspace()
         except Exception as e:
             print(f"Erro ao obter workspace ativo: {e}")
 
         return None
 
-    def switch_to_workspace(self, workspace_id: int) -> bool:
-        """Muda para um workspace especifico"""
+    def dispatch(self, dispatcher: str, args: str = "") -> bool:
+        """Executa um dispatcher do Hyprland"""
         try:
-            result = subprocess.run(
-                ["hyprctl", "dispatch", "workspace", str(workspace_id)],
-                capture_output=True,
-                timeout=1
-            )
-            return result.returncode == 0
+            return self.ipc.dispatch(dispatcher, args)
         except Exception as e:
-            print(f"Erro ao mudar para workspace {workspace_id}: {e}")
+            print(f"Erro no dispatch '{dispatcher} {args}': {e}")
             return False
 
+    def switch_to_workspace(self, workspace_id: int) -> bool:
+        """Muda para um workspace especifico"""
+        return self.dispatch("workspace", str(workspace_id))
+
     def get_windows_in_workspace(self, workspace_id: int) -> List[Dict[str, Any]]:
         """Retorna todas as janelas em um workspace"""
+        if self.start_event_listener():
+            return self.state.windows_in_workspace(workspace_id)
+
         windows = []
-        try:
-            result = subprocess.run(
-                ["hyprctl", "clients", "-j"],
-                capture_output=True,
-                text=True,
-                timeout=2
-            )
-
-            if result.returncode == 0:
-                clients = json.loads(result.stdout)
-                for client in clients:
-                    ws = client.get("workspace", {})
-                    if ws.get("id") == workspace_id:
-                        windows.append(client)
-        except Exception as e:
-            print(f"Erro ao obter janelas do workspace {workspace_id}: {e}")
+        for client in self.get_all_clients():
+            ws = client.get("workspace", {})
+            if ws.get("id") == workspace_id:
+                windows.append(client)
 
         return windows
 
+    def get_windows_in_workspace_named(self, workspace_name: str) -> List[Dict[str, Any]]:
+        """Retorna as janelas de um workspace pelo nome (ex: "special:arq_3")"""
+        return [
+            client for client in self.get_all_clients()
+            if client.get("workspace", {}).get("name") == workspace_name
+        ]
+
     def move_window_to_workspace(self, window_address: str, workspace_id: int, silent: bool = False) -> bool:
         """Move uma janela para um workspace"""
-        try:
-            command = "movetoworkspacesilent" if silent else "movetoworkspace"
-            result = subprocess.run(
-                ["hyprctl", "dispatch", command, f"{workspace_id},address:{window_address}"],
-                capture_output=True,
-                timeout=1
-            )
-            return result.returncode == 0
-        except Exception as e:
-            print(f"Erro ao mover janela para workspace {workspace_id}: {e}")
-            return False
+        command = "movetoworkspacesilent" if silent else "movetoworkspace"
+        ok = self.dispatch(command, f"{workspace_id},address:{window_address}")
+        if ok:
+            self.state.note_moved(window_address, workspace_id)
+        return ok
 
     def close_window(self, window_address: str) -> bool:
         """Fecha uma janela especifica"""
-        try:
-            result = subprocess.run(
-                ["hyprctl", "dispatch", "closewindow", f"address:{window_address}"],
-                capture_output=True,
-                timeout=1
-            )
-            return result.returncode == 0
-        except Exception as e:
-            print(f"Erro ao fechar janela: {e}")
-            return False
+        return self.dispatch("closewindow", f"address:{window_address}")
+
+    def exec_in_workspace(self, command: List[str], workspace_id: Any, silent: bool = True) -> bool:
+        """
+        Executa um comando via "dispatch exec" com regra de workspace
+
+        A janela nasce direto no workspace alvo, sem trocar o workspace visível
+        (ex: "dispatch exec [workspace 2 silent] zeditor /home/ian/projeto")
+        """
+        rule = f"workspace {workspace_id} silent" if silent else f"workspace {workspace_id}"
+        return self.dispatch("exec", f"[{rule}] {shlex.join(command)}")
+
+    def get_windows_by_pid(self, pid: int) -> List[Dict[str, Any]]:
+        """Retorna as janelas de um processo"""
+        if self.start_event_listener():
+            return self.state.windows_by_pid(pid)
+        return [c for c in self.get_all_clients() if c.get("pid") == pid]
+
+    def get_windows_by_class(self, class_substring: str) -> List[Dict[str, Any]]:
+        """Retorna as janelas cuja class contém a substring (case-insensitive)"""
+        if self.start_event_listener():
+            return self.state.windows_by_class(class_substring)
+        needle = class_substring.lower()
+        return [c for c in self.get_all_clients() if needle in c.get("class", "").lower()]
+
+    def batch(self) -> DispatchBatch:
+        """Cria um batch de dispatches (enviados juntos em um único round trip)"""
+        return DispatchBatch(self.ipc)
+
+    def move_windows_to_workspace(self, window_addresses: List[str], workspace_id: Any, silent: bool = True) -> List[bool]:
+        """Move várias janelas para um workspace em um único batch"""
+        command = "movetoworkspacesilent" if silent else "movetoworkspace"
+        with self.batch() as batch:
+            for address in window_addresses:
+                batch.add(command, f"{workspace_id},address:{address}")
+
+        for address, ok in zip(window_addresses, batch.results):
+            if ok:
+                self.state.note_moved(address, workspace_id)
+        return batch.results
+
+    def close_windows(self, window_addresses: List[str]) -> List[bool]:
+        """Fecha várias janelas em um único batch"""
+        with self.batch() as batch:
+            for address in window_addresses:
+                batch.add("closewindow", f"address:{address}")
+        return batch.results
 
     def find_window_by_title(self, title_substring: str) -> Optional[Dict[str, Any]]:
         """Encontra uma janela pelo titulo"""
-        try:
-            result = subprocess.run(
-                ["hyprctl", "clients", "-j"],
-                capture_output=True,
-                text=True,
-                timeout=2
-            )
-
-            if result.returncode == 0:
-                clients = json.loads(result.stdout)
-                for client in clients:
-                    title = client.get("title", "")
-                    if title_substring.lower() in title.lower():
-                        return client
-        except Exception as e:
-            print(f"Erro ao buscar janela: {e}")
+        for client in self.get_all_clients():
+            title = client.get("title", "")
+            if title_substring.lower() in title.lower():
+                return client
 
         return None
 
     def focus_window(self, window_address: str) -> bool:
         """Foca em uma janela especifica"""
-        try:
-            result = subprocess.run(
-                ["hyprctl", "dispatch", "focuswindow", f"address:{window_address}"],
-                capture_output=True,
-                timeout=1
-            )
-            return result.returncode == 0
-        except Exception as e:
-            print(f"Erro ao focar janela: {e}")
-            return False
+        return self.dispatch("focuswindow", f"address:{window_address}")
+
+    def expect_window(self, window_class: Optional[str] = None, pid: Optional[int] = None,
+                      workspace_id: Optional[Any] = None, exclude: Optional[Set[str]] = None) -> EventWaiter:
+        """
+        Prepara a espera por uma janela (chamar ANTES de abrir o app)
+
+        Args:
+            window_class: Substring da class da janela (case-insensitive)
+            pid: PID do processo dono da janela
+            workspace_id: Workspace onde a janela deve estar (id, ou nome como "special:arq_pool")
+            exclude: Endereços de janelas que não contam (ex: já existiam antes)
+
+        Returns:
+            EventWaiter cujo wait(timeout) retorna o client da janela ou None
+        """
+        expected_class = window_class.lower() if window_class else None
+        excluded = exclude or set()
+        use_state = self.start_event_listener()
+        by_name = isinstance(workspace_id, str)
+
+        def matches(client: Dict[str, Any]) -> bool:
+            if client.get("address") in excluded:
+                return False
+            if expected_class and expected_class not in client.get("class", "").lower():
+                return False
+            if pid is not None and client.get("pid") != pid:
+                return False
+            if workspace_id is not None:
+                ws = client.get("workspace", {})
+                if (ws.get("name") if by_name else ws.get("id")) != workspace_id:
+                    return False
+            return True
+
+        def check() -> Optional[Dict[str, Any]]:
+            # Com o cache vivo, usar o índice mais seletivo (sem IPC)
+            if use_state and pid is not None:
+                candidates = self.state.windows_by_pid(pid)
+            elif use_state and expected_class:
+                candidates = self.state.windows_by_class(expected_class)
+            elif use_state and workspace_id is not None and not by_name:
+                candidates = self.state.windows_in_workspace(workspace_id)
+            else:
+                candidates = self.get_all_clients()
+            return next((c for c in candidates if matches(c)), None)
+
+        return EventWaiter(self, check)
+
+    def wait_for_window(self, window_class: Optional[str] = None, pid: Optional[int] = None,
+                        workspace_id: Optional[int] = None, exclude: Optional[Set[str]] = None,
+                        timeout: float = 10.0) -> Optional[Dict[str, Any]]:
+        """Espera uma janela que case com pid/class/workspace (ou None no timeout)"""
+        return self.expect_window(window_class, pid, workspace_id, exclude).wait(timeout)
+
+    def expect_title_change(self, window_address: str, title: str) -> EventWaiter:
+        """
+        Prepara a espera pela troca de título de uma janela
+
+        Args:
+            window_address: Endereço da janela
+            title: Título conhecido (a espera termina quando ficar diferente)
+
+        Returns:
+            EventWaiter cujo wait(timeout) retorna o time.monotonic() da troca ou None
+        """
+        def check() -> Optional[float]:
+            if self.start_event_listener():
+                client = self.state.get_window(window_address)
+                if client is None or client.get("title", "") == title:
+                    return None
+                return self.state.title_changed_at.get(client["address"], time.monotonic())
+            client = next((c for c in self.get_all_clients() if c.get("address") == window_address), None)
+            if client is None or client.get("title", "") == title:
+                return None
+            return time.monotonic()
+
+        return EventWaiter(self, check, events=("windowtitle", "windowtitlev2"))
+
+    def wait_for_focus(self, window_address: str, timeout: float = 1.0) -> bool:
+        """Espera a janela informada virar a janela ativa"""
+        def check() -> Optional[bool]:
+            if self.start_event_listener():
+                return True if self.state.active_address == window_address else None
+            try:
+                active = self.ipc.active_window()
+            except Exception:
+                return None
+            return True if active.get("address") == window_address else None
+
+        waiter = EventWaiter(self, check, events=("activewindow", "activewindowv2"))
+        return waiter.wait(timeout) is True
 
     def get_workspace_stats(self) -> Dict[str, Any]:
         """Retorna estatisticas dos workspaces"""
@@ -159,14 +361,14 @@ class WorkspaceManager:
             "workspaces": []
         }
 
+        # Contagem de janelas vem junto com cada workspace (sem N+1 consultas)
         for ws in workspaces:
             ws_id = ws.get("id", 0)
-            windows = self.get_windows_in_workspace(ws_id)
 
             stats["workspaces"].append({
                 "id": ws_id,
                 "name": ws.get("name", str(ws_id)),
-                "windows_count": len(windows),
+                "windows_count": ws.get("windows", 0),
                 "monitor": ws.get("monitor", "unknown")
             })
 
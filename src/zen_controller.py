@@ -43,13 +43,7 @@ class ZenController:
             return False
 
         try:
-            command = [self.zen_binary]
-
-            if new_window:
-                command.append("--new-window")
-
-            if urls:
-                command.extend(urls)
+            command = self.build_command(urls, new_window)
 
             # Abrir Zen em background
             subprocess.Popen(
@@ -63,6 +57,18 @@ class ZenController:
             print(f"Erro ao abrir Zen: {e}")
             return False
 
+    def build_command(self, urls: Optional[List[str]] = None, new_window: bool = False) -> List[str]:
+        """Retorna o comando para abrir o Zen (usado também via "dispatch exec")"""
+        command = [self.zen_binary]
+
+        if new_window:
+            command.append("--new-window")
+
+        if urls:
+            command.extend(urls)
+
+        return command
+
     def open_url_in_new_tab(self, url: str):
         """Abre URL em nova aba (Zen ja deve estar rodando)"""
         try:
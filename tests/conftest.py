@@ -0,0 +1,6 @@
+"""Configuração do pytest: os módulos do Arquiteto usam imports planos a partir de src/"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
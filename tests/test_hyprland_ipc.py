@@ -0,0 +1,203 @@
+"""
+Testes do HyprlandIPC/HyprlandState contra o FakeHyprlandServer
+Cobrem requisição, batch e eventos (ida e volta pelo socket)
+"""
+
+import time
+
+import pytest
+
+from fake_hyprland import FakeHyprlandServer
+from hyprland_events import HyprlandEventListener
+from hyprland_ipc import DispatchBatch, HyprlandIPCError
+from hyprland_state import HyprlandState
+
+
+def wait_until(condition, timeout: float = 2.0) -> bool:
+    """Espera a condição ficar verdadeira (eventos chegam em outra thread)"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+@pytest.fixture
+def server():
+    with FakeHyprlandServer() as srv:
+        yield srv
+
+
+@pytest.fixture
+def state(server):
+    ipc = server.ipc()
+    listener = HyprlandEventListener(ipc)
+    assert listener.start()
+    state = HyprlandState(ipc, listener)
+    assert state.attach()
+    yield state
+    listener.stop()
+
+
+# ===== Requisições =====
+
+def test_request_json_clients(server):
+    address = server.add_client("dev.zed.Zed", "arquiteto", workspace_id=2, pid=1234)
+    clients = server.ipc().clients()
+
+    assert [c["address"] for c in clients] == [address]
+    assert clients[0]["pid"] == 1234
+    assert clients[0]["workspace"] == {"id": 2, "name": "2"}
+
+
+def test_dispatch_updates_server(server):
+    address = server.add_client("kitty")
+    ipc = server.ipc()
+
+    assert ipc.dispatch("movetoworkspacesilent", f"5,address:{address}")
+    assert server.clients[address]["workspace"]["id"] == 5
+    assert not ipc.dispatch("closewindow", "address:0xdead")
+    assert ipc.active_workspace()["id"] == 1
+
+
+def test_request_without_server_raises(server):
+    ipc = server.ipc(timeout=0.5)
+    server.stop()
+
+    with pytest.raises(HyprlandIPCError):
+        ipc.request("j/clients")
+
+
+# ===== Batch =====
+
+def test_batch_splits_replies(server):
+    address = server.add_client("kitty")
+    replies = server.ipc().batch([
+        "dispatch workspace 3",
+        f"dispatch closewindow address:{address}",
+        "dispatch closewindow address:0xdead",
+        "j/activeworkspace",
+    ])
+
+    assert replies[:3] == ["ok", "ok", "No such window"]
+    assert '"id": 3' in replies[3]
+    assert server.request_count == 1  # Um único round trip para os 4 comandos
+    assert server.clients == {}
+
+
+def test_batch_legacy_concatenated_reply(server, monkeypatch):
+    ipc = server.ipc()
+    monkeypatch.setattr(ipc, "request", lambda command: "okokok")
+
+    assert ipc.batch(["dispatch a", "dispatch b", "dispatch c"]) == ["ok", "ok", "ok"]
+
+
+def test_dispatch_batch_results(server):
+    first = server.add_client("kitty")
+    second = server.add_client("dev.zed.Zed")
+
+    with DispatchBatch(server.ipc()) as batch:
+        batch.add("movetoworkspacesilent", f"4,address:{first}")
+        batch.add("movetoworkspacesilent", "4,address:0xdead")
+        batch.add("closewindow", f"address:{second}")
+
+    assert batch.results == [True, False, True]
+    assert len(batch) == 0
+    assert server.clients[first]["workspace"]["id"] == 4
+    assert second not in server.clients
+
+
+def test_dispatch_batch_rejects_semicolon(server):
+    batch = DispatchBatch(server.ipc())
+
+    with pytest.raises(ValueError):
+        batch.add("exec", "kitty; rm -rf ~")
+    assert len(batch) == 0
+
+
+def test_dispatch_batch_socket_error(server):
+    batch = DispatchBatch(server.ipc(timeout=0.5))
+    server.stop()
+
+    with batch:
+        batch.add("workspace", "2")
+        batch.add("workspace", "3")
+
+    assert batch.results == [False, False]
+
+
+# ===== Eventos =====
+
+def test_state_seeded_from_ipc(server):
+    address = server.add_client("kitty", workspace_id=3, pid=4242)
+    ipc = server.ipc()
+    state = HyprlandState(ipc, HyprlandEventListener(ipc))
+
+    assert state.resync()
+    assert state.get_window(address)["workspace"]["id"] == 3
+    assert [w["address"] for w in state.windows_by_pid(4242)] == [address]
+
+
+def test_state_follows_open_move_title_close(server, state):
+    address = server.add_client("dev.zed.Zed", "arquiteto", workspace_id=2, pid=777)
+    assert wait_until(lambda: state.get_window(address) is not None)
+    window = state.get_window(address)
+    assert window["class"] == "dev.zed.Zed"
+    assert window["title"] == "arquiteto"
+    assert window["workspace"]["id"] == 2
+    assert [w["address"] for w in state.windows_by_pid(777)] == [address]
+
+    assert server.ipc().dispatch("movetoworkspacesilent", f"6,address:{address}")
+    assert wait_until(lambda: state.get_window(address)["workspace"]["id"] == 6)
+    assert [w["address"] for w in state.windows_in_workspace(6)] == [address]
+    assert state.windows_in_workspace(2) == []
+
+    server.set_title(address, "arquiteto - main.py")
+    assert wait_until(lambda: state.get_window(address)["title"] == "arquiteto - main.py")
+    assert address in state.title_changed_at
+
+    server.remove_client(address)
+    assert wait_until(lambda: state.get_window(address) is None)
+    assert state.windows_by_pid(777) == []
+    assert state.check_consistency(resync=False)
+
+
+def test_state_follows_workspace_and_focus(server, state):
+    address = server.add_client("kitty", workspace_id=4)
+    assert wait_until(lambda: state.get_window(address) is not None)
+
+    assert server.ipc().dispatch("focuswindow", f"address:{address}")
+    assert wait_until(lambda: state.active_address == address)
+
+    assert server.ipc().dispatch("workspace", "7")
+    assert wait_until(lambda: state.active_workspace_id == 7)
+    assert state.active_workspace()["id"] == 7
+
+
+def test_openwindow_without_ipc(server, state):
+    requests = server.request_count
+    address = server.add_client("kitty", workspace_id=3, pid=9001)
+    assert wait_until(lambda: address in state.windows)
+
+    # O evento entra no cache sem IPC; o PID vem com a primeira leitura
+    assert server.request_count == requests
+    assert state.windows[address]["class"] == "kitty"
+    assert [w["address"] for w in state.windows_by_pid(9001)] == [address]
+    assert server.request_count == requests + 1
+    state.windows_by_pid(9001)
+    assert server.request_count == requests + 1
+
+    second = server.add_client("kitty", pid=9002)
+    assert wait_until(lambda: second in state.windows)
+    assert state.get_window(second)["pid"] == 9002
+
+
+def test_state_notifies_after_update(server, state):
+    seen = []
+    state.subscribe(lambda event, data: seen.append((event, state.get_window("0x" + data.split(",")[0]))))
+
+    address = server.add_client("kitty")
+    assert wait_until(lambda: any(event == "openwindow" for event, _ in seen))
+    window = next(window for event, window in seen if event == "openwindow")
+    assert window is not None and window["address"] == address